@@ -1,18 +1,16 @@
-from SorthaAI.SorthaAIService import SorthaAIService
-from SorthaAI.Models.ExecutionState import Status as ExecutionStatus
 import time
 import importlib
 import sys
-from Utils.Agent import createOpenAIClient
-from Utils.Serializer import addable_values_dict_to_json
-import msvcrt
 from fire import Fire
 from pathlib import Path
 import os
 import Utils.ConstantFileContent as ConstantFileContent
-from SorthaAI.WorkFlow import StateBase, WorkFlowBase
+
+# SorthaAI, langchain, langgraph and pandas are imported inside run() so that
+# help and init do not pay their import cost before Fire parses arguments.
 
 def wait_for_any_key():
+    import msvcrt
     print("Press any key to continue...")
     msvcrt.getch() # Waits for a single character input without echoing it
 
@@ -50,6 +48,12 @@ class SorthaDevKit:
             f.write(ConstantFileContent.getWorkFlowContent())
 
     def run(self, module_path: str=None):
+        from SorthaAI.SorthaAIService import SorthaAIService
+        from SorthaAI.Models.ExecutionState import Status as ExecutionStatus
+        from SorthaAI.WorkFlow import StateBase, WorkFlowBase
+        from Utils.Agent import createOpenAIClient
+        from Utils.Serializer import addable_values_dict_to_json
+
         if module_path is None:
             module_path = str(Path().resolve())
 
@@ -20,4 +20,5 @@ OUTPUT_CONFIG = {
     "output_file_path": r"C:\Users\grkumar\Documents\GitHub\AgenticAI_UseCases\AI-IntakeandAssessment\WorkflowsLocal\Outputs\filled_aif.xlsx",
     "question_column_name": "Questions",  # Name of the column containing questions in Excel
     "excel_sheet_name": None,  # None to use first sheet, or specify sheet name
+    "export_workers": 3,  # Worker processes for rendering output documents in parallel, 0 to render in-process
 }
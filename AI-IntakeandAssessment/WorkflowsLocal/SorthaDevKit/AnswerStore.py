@@ -0,0 +1,134 @@
+"""
+Answer Store for SorthaDevKit Workflows
+Persists LLM answers to AIF questions keyed by transcript content, normalized question
+text and model configuration, so repeat runs only send new or changed questions to the LLM.
+"""
+
+from typing import Dict, Iterable, Optional
+from contextlib import contextmanager
+from datetime import datetime
+import os
+import re
+import sqlite3
+
+from .CheckpointStore import fingerprint
+from .StateBase import QuestionAnswer
+
+
+DEFAULT_ANSWER_STORE_PATH = os.path.join("output", "checkpoints", "answer_store.db")
+
+
+def normalize_question(question: str) -> str:
+    """Normalize question text so whitespace and casing edits do not invalidate stored answers."""
+    return re.sub(r'\s+', ' ', question).strip().lower()
+
+
+def question_fingerprint(question: str) -> str:
+    """Create a fingerprint of the normalized question text."""
+    return fingerprint(normalize_question(question))
+
+
+class QuestionAnswerStore:
+    """SQLite-backed store of answered questions keyed by (transcript hash, question hash, model key)."""
+
+    def __init__(self, db_path: str = DEFAULT_ANSWER_STORE_PATH):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS question_answers (
+                    transcript_hash TEXT NOT NULL,
+                    question_hash TEXT NOT NULL,
+                    model_key TEXT NOT NULL,
+                    answer TEXT NOT NULL,
+                    confidence TEXT NOT NULL,
+                    source_reference TEXT NOT NULL,
+                    is_answered INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (transcript_hash, question_hash, model_key)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load_many(self, transcript_hash: str, model_key: str, questions: Iterable[str]) -> Dict[str, QuestionAnswer]:
+        """
+        Load stored answers for a set of questions.
+
+        Args:
+            transcript_hash: Fingerprint of the transcript content
+            model_key: Fingerprint of the model configuration and prompt
+            questions: Question texts to look up
+
+        Returns:
+            Dictionary mapping question hash to the stored QuestionAnswer (without category/priority)
+        """
+        question_hashes = list({question_fingerprint(q) for q in questions})
+        stored = {}
+        if not question_hashes:
+            return stored
+
+        with self._connect() as conn:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(question_hashes), 500):
+                batch = question_hashes[start:start + 500]
+                placeholders = ", ".join("?" for _ in batch)
+                rows = conn.execute(
+                    f"""
+                    SELECT question_hash, answer, confidence, source_reference, is_answered
+                    FROM question_answers
+                    WHERE transcript_hash = ? AND model_key = ? AND question_hash IN ({placeholders})
+                    """,
+                    [transcript_hash, model_key, *batch]
+                ).fetchall()
+                for question_hash, answer, confidence, source_reference, is_answered in rows:
+                    stored[question_hash] = QuestionAnswer(
+                        question="",
+                        answer=answer,
+                        confidence=confidence,
+                        source_reference=source_reference,
+                        is_answered=bool(is_answered)
+                    )
+
+        return stored
+
+    def save(self, transcript_hash: str, model_key: str, qa: QuestionAnswer):
+        """Store the answer to a single question."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO question_answers
+                (transcript_hash, question_hash, model_key, answer, confidence, source_reference, is_answered, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    transcript_hash,
+                    question_fingerprint(qa.question),
+                    model_key,
+                    qa.answer,
+                    qa.confidence,
+                    qa.source_reference,
+                    int(qa.is_answered),
+                    datetime.now().isoformat()
+                )
+            )
+
+    def clear(self, transcript_hash: Optional[str] = None):
+        """Remove stored answers for one transcript, or all stored answers."""
+        with self._connect() as conn:
+            if transcript_hash is None:
+                conn.execute("DELETE FROM question_answers")
+            else:
+                conn.execute("DELETE FROM question_answers WHERE transcript_hash = ?", (transcript_hash,))
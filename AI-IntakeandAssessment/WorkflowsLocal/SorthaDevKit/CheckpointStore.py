@@ -0,0 +1,145 @@
+"""
+Checkpoint Store for SorthaDevKit Workflows
+Persists node outputs to a local SQLite database keyed by a hash of the node inputs,
+so that expensive LLM stages can be skipped when a workflow is resumed.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from contextlib import contextmanager
+from dataclasses import is_dataclass, asdict
+from datetime import datetime
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+
+from pydantic import BaseModel
+
+
+DEFAULT_CHECKPOINT_PATH = os.path.join("output", "checkpoints", "workflow_checkpoints.db")
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Convert workflow state values into JSON-serializable structures for hashing."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(str(item) for item in value)
+    if isinstance(value, bytes):
+        return hashlib.sha256(value).hexdigest()
+    return str(value)
+
+
+def fingerprint(*parts: Any) -> str:
+    """Create a stable SHA-256 fingerprint from arbitrary workflow values."""
+    canonical = json.dumps(parts, sort_keys=True, default=_to_jsonable, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def file_fingerprint(file_path: str) -> str:
+    """Create a SHA-256 fingerprint of a file's contents (empty string if the file is missing)."""
+    if not file_path or not os.path.exists(file_path):
+        return ""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WorkflowCheckpointStore:
+    """SQLite-backed store of workflow node outputs keyed by (node name, input hash)."""
+
+    def __init__(self, db_path: str = DEFAULT_CHECKPOINT_PATH):
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS node_checkpoints (
+                    node_name TEXT NOT NULL,
+                    input_hash TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (node_name, input_hash)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def load(self, node_name: str, input_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the saved outputs of a node.
+
+        Args:
+            node_name: Name of the workflow node
+            input_hash: Fingerprint of the node inputs
+
+        Returns:
+            Dictionary of state fields written by the node, or None if no valid checkpoint exists
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM node_checkpoints WHERE node_name = ? AND input_hash = ?",
+                (node_name, input_hash)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        try:
+            return pickle.loads(row[0])
+        except Exception as e:
+            # Stale payloads (e.g. after a model class changed) are treated as a cache miss
+            print(f"⚠ Ignoring unreadable checkpoint for {node_name}: {str(e)}")
+            return None
+
+    def save(self, node_name: str, input_hash: str, outputs: Dict[str, Any]) -> bool:
+        """
+        Save the outputs of a completed node.
+
+        Args:
+            node_name: Name of the workflow node
+            input_hash: Fingerprint of the node inputs
+            outputs: Dictionary of state fields written by the node
+
+        Returns:
+            True if the checkpoint was written, False otherwise
+        """
+        try:
+            payload = pickle.dumps(outputs, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"⚠ Could not checkpoint {node_name}: {str(e)}")
+            return False
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO node_checkpoints (node_name, input_hash, payload, created_at) VALUES (?, ?, ?, ?)",
+                (node_name, input_hash, payload, datetime.now().isoformat())
+            )
+        return True
+
+    def clear(self, node_names: Optional[Iterable[str]] = None):
+        """Remove checkpoints for the given nodes, or all checkpoints if none are given."""
+        with self._connect() as conn:
+            if node_names is None:
+                conn.execute("DELETE FROM node_checkpoints")
+            else:
+                conn.executemany(
+                    "DELETE FROM node_checkpoints WHERE node_name = ?",
+                    [(name,) for name in node_names]
+                )
@@ -1,21 +1,197 @@
 import os
 import sys
-from typing import List, Dict, Any, TypedDict, Annotated
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, TypedDict, Annotated, Optional
 from datetime import datetime
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from langgraph.graph import StateGraph
-from langgraph.constants import START, END
-from langgraph.checkpoint.memory import MemorySaver
 from typing_extensions import TypedDict
 
+# langgraph, pandas/openpyxl (ExcelUtils), python-docx and openai (generators/exporters) are
+# imported where they are used, so validation and help paths and export workers start quickly.
 from SorthaDevKit.StateBase import ProcessingResult, QuestionAnswer
-from SorthaDevKit.ExcelUtils import ExcelProcessor
-from SorthaDevKit.MigrationPlanGenerator import AzureMigrationPlanGenerator
-from SorthaDevKit.MigrationPlanExporter import MigrationPlanDocumentExporter
-from SorthaDevKit.AssessmentReportGenerator import ApplicationAssessmentReportGenerator
+from SorthaDevKit.CheckpointStore import WorkflowCheckpointStore, DEFAULT_CHECKPOINT_PATH, fingerprint, file_fingerprint
+from SorthaDevKit.AnswerStore import QuestionAnswerStore, DEFAULT_ANSWER_STORE_PATH, question_fingerprint
+
+
+# Prompt used to answer a single AIF question; part of the answer store key so prompt edits invalidate stored answers
+QUESTION_PROMPT_TEMPLATE = """
+                Analyze the following transcript to answer this specific question. Please provide a direct, concise answer.
+                
+                Question: {question}
+                
+                Transcript:
+                {transcript}
+                
+                Instructions:
+                1. If the answer is clearly found in the transcript, provide a direct answer (2-3 sentences max)
+                2. If the answer is not addressed in the transcript, respond exactly with: "Not addressed in transcript"
+                3. Provide a confidence level: High (explicitly mentioned), Medium (can be inferred), Low (unclear), or Unknown (not addressed)
+                4. If you find the answer in the transcript, try to identify a rough timestamp or section reference
+                
+                Format your response as:
+                ANSWER: [your answer or "Not addressed in transcript"]
+                CONFIDENCE: [High/Medium/Low/Unknown]
+                SOURCE: [timestamp or section reference if available, or "N/A" if not addressed]
+                """
+
+
+# Export nodes run in parallel, mapped to the state key holding each node's outcome
+EXPORT_NODES = {
+    "export_qa": "qa_export",
+    "export_assessment_report": "assessment_export",
+    "export_documents": "documents_export"
+}
+
+
+# source_reference of the placeholder answer recorded when analyzing a question fails
+PROCESSING_ERROR_SOURCE = "Processing Error"
+
+
+# Expensive nodes whose outputs are checkpointed. Each entry lists the input files and
+# state fields the node reads, whether it calls the LLM, and the state fields it writes.
+CHECKPOINTED_NODES = {
+    "process_azure_migrate": {
+        "input_files": ["azure_migrate_report"],
+        "reads": [],
+        "uses_llm": False,
+        "writes": ["azure_migrate_data"]
+    },
+    "process_questions": {
+        "input_files": ["transcript", "questions_excel"],
+        "reads": [],
+        "uses_llm": True,
+        "writes": ["questions_answers"]
+    },
+    "generate_assessment_report": {
+        "input_files": [],
+        "reads": ["questions_answers", "azure_migrate_data"],
+        "uses_llm": True,
+        "writes": ["assessment_report_data"]
+    },
+    "generate_plan": {
+        "input_files": [],
+        "reads": ["questions_answers", "azure_migrate_data"],
+        "uses_llm": True,
+        "writes": ["migration_plan"]
+    }
+}
+
+
+def create_llm_client():
+    """
+    Create the Azure OpenAI chat client from Config.LLMConfig.
+    
+    Raises:
+        ValueError: If required LLM configuration is missing
+    """
+    from Config import LLMConfig
+    from langchain_openai import AzureChatOpenAI
+    
+    # Validate required configuration
+    required_keys = [
+        'AZURE_OPENAI_DEPLOYMENT_NAME',
+        'AZURE_OPENAI_API_KEY', 
+        'AZURE_OPENAI_ENDPOINT'
+    ]
+    
+    config_dict = {
+        'AZURE_OPENAI_DEPLOYMENT_NAME': LLMConfig.AZURE_OPENAI_DEPLOYMENT_NAME,
+        'AZURE_OPENAI_API_KEY': LLMConfig.AZURE_OPENAI_API_KEY,
+        'AZURE_OPENAI_ENDPOINT': LLMConfig.AZURE_OPENAI_ENDPOINT,
+        'AZURE_OPENAI_MODEL_NAME': getattr(LLMConfig, 'AZURE_OPENAI_MODEL_NAME', 'gpt-4'),
+        'AZURE_OPENAI_TEMPERATURE': getattr(LLMConfig, 'AZURE_OPENAI_TEMPERATURE', 0.0),
+        'AZURE_OPENAI_API_VERSION': getattr(LLMConfig, 'AZURE_OPENAI_API_VERSION', '2023-12-01-preview')
+    }
+    
+    missing_keys = []
+    for key in required_keys:
+        if not config_dict.get(key):
+            missing_keys.append(key)
+    
+    if missing_keys:
+        raise ValueError(f"Missing required LLM configuration: {missing_keys}")
+    
+    # Initialize LLM directly
+    return AzureChatOpenAI(
+        deployment_name=config_dict['AZURE_OPENAI_DEPLOYMENT_NAME'],
+        model_name=config_dict.get('AZURE_OPENAI_MODEL_NAME', 'gpt-4'),
+        temperature=config_dict.get('AZURE_OPENAI_TEMPERATURE', 0.0),
+        api_key=config_dict['AZURE_OPENAI_API_KEY'],
+        azure_endpoint=config_dict['AZURE_OPENAI_ENDPOINT'],
+        api_version=config_dict.get('AZURE_OPENAI_API_VERSION', '2023-12-01-preview')
+    )
+
+
+def validate_inputs(inputs: Dict[str, Any]) -> List[str]:
+    """
+    Check that all required inputs are present and their files exist.
+    
+    Args:
+        inputs: Workflow inputs keyed by input name
+        
+    Returns:
+        List of validation errors, empty if the inputs are valid
+    """
+    errors = []
+    required_inputs = ['transcript', 'questions_excel', 'azure_migrate_report']
+    
+    for input_name in required_inputs:
+        if input_name not in inputs:
+            errors.append(f"Missing required input: {input_name}")
+            continue
+        
+        input_obj = inputs[input_name]
+        if hasattr(input_obj, 'file_path'):
+            # An empty path (e.g. a misspelled key in a portfolio manifest) would silently yield default answers
+            if not input_obj.file_path:
+                errors.append(f"No file given for required input: {input_name}")
+            elif not os.path.exists(input_obj.file_path):
+                errors.append(f"Input file not found: {input_obj.file_path}")
+    
+    return errors
+
+
+def render_qa_excel(excel_output, output_path: str, original_questions_file: str) -> bool:
+    """Write the filled AIF workbook; runs in an export worker process."""
+    from SorthaDevKit.ExcelUtils import ExcelProcessor
+    
+    ExcelProcessor.create_output_excel(
+        excel_output=excel_output,
+        output_path=output_path,
+        original_questions_file=original_questions_file
+    )
+    return True
+
+
+def render_assessment_report(assessment_data, output_path: str) -> bool:
+    """Write the assessment report document; runs in an export worker process."""
+    from SorthaDevKit.AssessmentReportGenerator import ApplicationAssessmentReportGenerator
+    
+    _load_worker_config()
+    return ApplicationAssessmentReportGenerator().export_to_word(
+        assessment_data=assessment_data,
+        output_path=output_path
+    )
+
+
+def render_migration_plan(migration_plan, output_path: str) -> bool:
+    """Write the migration plan document; runs in an export worker process."""
+    from SorthaDevKit.MigrationPlanExporter import MigrationPlanDocumentExporter
+    
+    return MigrationPlanDocumentExporter().export_to_word(migration_plan, output_path)
+
+
+def _load_worker_config():
+    """Load the .env settings in spawned worker processes that did not inherit them."""
+    try:
+        from Config import LLMConfig  # noqa: F401
+    except Exception:
+        pass
 
 
 class WorkflowState(TypedDict):
@@ -28,6 +204,9 @@ class WorkflowState(TypedDict):
     questions_answers: List[QuestionAnswer]
     assessment_report_data: Any
     migration_plan: Any
+    qa_export: Dict[str, Any]
+    assessment_export: Dict[str, Any]
+    documents_export: Dict[str, Any]
     qa_export_success: bool
     assessment_export_success: bool
     plan_files: Dict[str, str]
@@ -42,17 +221,64 @@ class WorkflowState(TypedDict):
 class LangGraphMigrationPlanWorkflow:
     """LangGraph-based Azure Migration Plan generation workflow."""
     
-    def __init__(self, inputs: Dict[str, Any]):
+    def __init__(
+        self,
+        inputs: Dict[str, Any],
+        resume: bool = False,
+        checkpoint_path: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        llm_client: Any = None,
+        azure_migrate_reports: Optional[Dict[str, Any]] = None,
+        export_pool: Optional[ProcessPoolExecutor] = None
+    ):
+        """
+        Initialize the workflow.
+        
+        Args:
+            inputs: Workflow inputs (transcript, questions_excel, azure_migrate_report)
+            resume: Restore checkpointed nodes whose inputs are unchanged
+            checkpoint_path: Path of the checkpoint database (defaults to OUTPUT_CONFIG or output/checkpoints)
+            output_dir: Directory for generated documents (defaults to output/ and OUTPUT_CONFIG)
+            llm_client: Pre-configured LLM client shared across workflows, created on demand if None
+            azure_migrate_reports: Pre-parsed Azure Migrate reports keyed by file path
+            export_pool: Process pool shared across workflows for document rendering
+        """
         self.inputs = inputs
+        self.resume = resume
+        self.output_dir = output_dir
+        self.llm_client = llm_client
+        self.azure_migrate_reports = azure_migrate_reports or {}
+        self._shared_export_pool = export_pool
+        
+        from SorthaDevKit.MigrationPlanGenerator import AzureMigrationPlanGenerator
+        from SorthaDevKit.MigrationPlanExporter import MigrationPlanDocumentExporter
+        from SorthaDevKit.AssessmentReportGenerator import ApplicationAssessmentReportGenerator
+        
         self.migration_plan_generator = AzureMigrationPlanGenerator()
         self.document_exporter = MigrationPlanDocumentExporter()
         self.assessment_report_generator = ApplicationAssessmentReportGenerator()
         
+        # Node-level checkpoints so a failed export does not discard the LLM work
+        self.checkpoint_store = WorkflowCheckpointStore(
+            checkpoint_path or self._get_output_config().get("checkpoint_path", DEFAULT_CHECKPOINT_PATH)
+        )
+        
+        # Persistent answers so only new or changed AIF questions go to the LLM
+        self.answer_store = QuestionAnswerStore(
+            self._get_output_config().get("answer_store_path", DEFAULT_ANSWER_STORE_PATH)
+        )
+        
+        # Process pool for export rendering, created for the duration of run()
+        self._export_pool = None
+        
         # Create the graph
         self.graph = self._create_workflow_graph()
     
-    def _create_workflow_graph(self) -> StateGraph:
+    def _create_workflow_graph(self) -> "StateGraph":
         """Create the LangGraph workflow."""
+        from langgraph.graph import StateGraph
+        from langgraph.constants import START, END
+        
         # Define the workflow graph
         workflow = StateGraph(WorkflowState)
         
@@ -60,13 +286,14 @@ class LangGraphMigrationPlanWorkflow:
         workflow.add_node("initialize", self._initialize_node)
         workflow.add_node("validate_inputs", self._validate_inputs_node)
         workflow.add_node("setup_llm", self._setup_llm_node)
-        workflow.add_node("process_azure_migrate", self._process_azure_migrate_node)
-        workflow.add_node("process_questions", self._process_questions_node)
-        workflow.add_node("generate_assessment_report", self._generate_assessment_report_node)
-        workflow.add_node("generate_plan", self._generate_plan_node)
+        workflow.add_node("process_azure_migrate", self._with_checkpoint("process_azure_migrate", self._process_azure_migrate_node))
+        workflow.add_node("process_questions", self._with_checkpoint("process_questions", self._process_questions_node))
+        workflow.add_node("generate_assessment_report", self._with_checkpoint("generate_assessment_report", self._generate_assessment_report_node))
+        workflow.add_node("generate_plan", self._with_checkpoint("generate_plan", self._generate_plan_node))
         workflow.add_node("export_qa", self._export_qa_node)
         workflow.add_node("export_assessment_report", self._export_assessment_report_node)
         workflow.add_node("export_documents", self._export_documents_node)
+        workflow.add_node("join_exports", self._join_exports_node)
         workflow.add_node("finalize", self._finalize_node)
         
         # Define the flow
@@ -98,25 +325,91 @@ class LangGraphMigrationPlanWorkflow:
         )
         workflow.add_edge("process_questions", "generate_assessment_report")
         workflow.add_edge("generate_assessment_report", "generate_plan")
+        # The export nodes write independent artifacts, so fan out and join before finalizing
         workflow.add_conditional_edges(
             "generate_plan",
             self._should_continue_after_plan,
-            {
-                "continue": "export_qa",
-                "end": END
-            }
+            [*EXPORT_NODES, END]
         )
-        workflow.add_edge("export_qa", "export_assessment_report")
-        workflow.add_edge("export_assessment_report", "export_documents")
-        workflow.add_edge("export_documents", "finalize")
+        workflow.add_edge(list(EXPORT_NODES), "join_exports")
+        workflow.add_edge("join_exports", "finalize")
         workflow.add_edge("finalize", END)
         
         return workflow
-        workflow.add_edge("export_qa", "export_documents")
-        workflow.add_edge("export_documents", "finalize")
-        workflow.add_edge("finalize", END)
+    
+    def _with_checkpoint(self, node_name: str, node_function):
+        """Wrap a node so its outputs are checkpointed and restored on resume when its inputs are unchanged."""
+        spec = CHECKPOINTED_NODES[node_name]
         
-        return workflow
+        def checkpointed_node(state: WorkflowState) -> WorkflowState:
+            input_hash = self._node_input_hash(node_name, state)
+            
+            if self.resume:
+                saved_outputs = self.checkpoint_store.load(node_name, input_hash)
+                if saved_outputs is not None:
+                    state.update(saved_outputs)
+                    state["step_completed"][node_name] = True
+                    print(f"✓ Resumed {node_name.replace('_', ' ')} from checkpoint")
+                    return state
+            
+            errors_before = len(state["errors"])
+            state = node_function(state)
+            
+            # Only checkpoint clean completions, never fallback data produced after an error.
+            # Failed questions do not fail the node, so their placeholder answers are checked
+            # as well; otherwise a resume would keep them instead of asking again.
+            if (state["step_completed"].get(node_name) and len(state["errors"]) == errors_before
+                    and not self._has_processing_errors(state, spec)):
+                self.checkpoint_store.save(node_name, input_hash, {field: state.get(field) for field in spec["writes"]})
+            
+            return state
+        
+        return checkpointed_node
+    
+    @staticmethod
+    def _has_processing_errors(state: WorkflowState, spec: Dict[str, Any]) -> bool:
+        """Whether the questions_answers a node reads or writes contain a failed analysis."""
+        if "questions_answers" not in spec["reads"] + spec["writes"]:
+            return False
+        return any(
+            getattr(qa, 'source_reference', None) == PROCESSING_ERROR_SOURCE
+            for qa in state.get("questions_answers") or []
+        )
+    
+    def _node_input_hash(self, node_name: str, state: WorkflowState) -> str:
+        """Fingerprint everything a checkpointed node reads: input file contents, upstream state and LLM settings."""
+        spec = CHECKPOINTED_NODES[node_name]
+        
+        file_hashes = {}
+        for input_name in spec["input_files"]:
+            input_obj = state["inputs"].get(input_name)
+            file_hashes[input_name] = file_fingerprint(getattr(input_obj, 'file_path', ''))
+        
+        state_values = {field: state.get(field) for field in spec["reads"]}
+        llm_settings = self._llm_settings() if spec["uses_llm"] else None
+        
+        return fingerprint(node_name, file_hashes, state_values, llm_settings)
+    
+    def _qa_model_settings(self) -> Dict[str, Any]:
+        """Get the Azure OpenAI settings used for question answering."""
+        try:
+            from Config import LLMConfig
+            return {
+                "deployment": LLMConfig.AZURE_OPENAI_DEPLOYMENT_NAME,
+                "model": getattr(LLMConfig, 'AZURE_OPENAI_MODEL_NAME', None),
+                "temperature": getattr(LLMConfig, 'AZURE_OPENAI_TEMPERATURE', None),
+                "api_version": getattr(LLMConfig, 'AZURE_OPENAI_API_VERSION', None)
+            }
+        except Exception:
+            return {}
+    
+    def _llm_settings(self) -> Dict[str, Any]:
+        """Get the LLM settings that influence generated content."""
+        return {
+            "qa_model": self._qa_model_settings(),
+            "plan_generator": self.migration_plan_generator.config,
+            "assessment_generator": self.assessment_report_generator.config
+        }
     
     def _initialize_node(self, state: WorkflowState) -> WorkflowState:
         """Initialize the workflow."""
@@ -127,6 +420,9 @@ class LangGraphMigrationPlanWorkflow:
         state["result"] = ProcessingResult()
         state["errors"] = []
         state["step_completed"] = {}
+        state["qa_export"] = {}
+        state["assessment_export"] = {}
+        state["documents_export"] = {}
         state["qa_export_success"] = False
         state["assessment_export_success"] = False
         state["plan_files"] = {}
@@ -139,24 +435,13 @@ class LangGraphMigrationPlanWorkflow:
         """Validate all required input files."""
         print("Validating inputs...")
         
-        required_inputs = ['transcript', 'questions_excel', 'azure_migrate_report']
-        
-        for input_name in required_inputs:
-            if input_name not in state["inputs"]:
-                error = f"Missing required input: {input_name}"
+        errors = validate_inputs(state["inputs"])
+        if errors:
+            for error in errors:
                 print(error)
-                state["errors"].append(error)
-                state["result"].add_error("Input validation failed")
-                return state
-            
-            input_obj = state["inputs"][input_name]
-            if hasattr(input_obj, 'file_path') and input_obj.file_path:
-                if not os.path.exists(input_obj.file_path):
-                    error = f"Input file not found: {input_obj.file_path}"
-                    print(error)
-                    state["errors"].append(error)
-                    state["result"].add_error("Input validation failed")
-                    return state
+            state["errors"].extend(errors)
+            state["result"].add_error("Input validation failed")
+            return state
         
         print("✓ Input files validated")
         state["step_completed"]["validate_inputs"] = True
@@ -164,51 +449,16 @@ class LangGraphMigrationPlanWorkflow:
     
     def _setup_llm_node(self, state: WorkflowState) -> WorkflowState:
         """Initialize Azure OpenAI connection."""
+        if self.llm_client is not None:
+            state["llm_client"] = self.llm_client
+            print("✓ Using shared Azure OpenAI connection")
+            state["step_completed"]["setup_llm"] = True
+            return state
+        
         print("Connecting to Azure OpenAI...")
         
         try:
-            from Config import LLMConfig
-            from langchain_openai import AzureChatOpenAI
-            
-            # Validate required configuration
-            required_keys = [
-                'AZURE_OPENAI_DEPLOYMENT_NAME',
-                'AZURE_OPENAI_API_KEY', 
-                'AZURE_OPENAI_ENDPOINT'
-            ]
-            
-            config_dict = {
-                'AZURE_OPENAI_DEPLOYMENT_NAME': LLMConfig.AZURE_OPENAI_DEPLOYMENT_NAME,
-                'AZURE_OPENAI_API_KEY': LLMConfig.AZURE_OPENAI_API_KEY,
-                'AZURE_OPENAI_ENDPOINT': LLMConfig.AZURE_OPENAI_ENDPOINT,
-                'AZURE_OPENAI_MODEL_NAME': getattr(LLMConfig, 'AZURE_OPENAI_MODEL_NAME', 'gpt-4'),
-                'AZURE_OPENAI_TEMPERATURE': getattr(LLMConfig, 'AZURE_OPENAI_TEMPERATURE', 0.0),
-                'AZURE_OPENAI_API_VERSION': getattr(LLMConfig, 'AZURE_OPENAI_API_VERSION', '2023-12-01-preview')
-            }
-            
-            missing_keys = []
-            for key in required_keys:
-                if not config_dict.get(key):
-                    missing_keys.append(key)
-            
-            if missing_keys:
-                error = f"Missing required LLM configuration: {missing_keys}"
-                print(error)
-                state["errors"].append(error)
-                state["result"].add_error(error)
-                return state
-            
-            # Initialize LLM directly
-            llm_client = AzureChatOpenAI(
-                deployment_name=config_dict['AZURE_OPENAI_DEPLOYMENT_NAME'],
-                model_name=config_dict.get('AZURE_OPENAI_MODEL_NAME', 'gpt-4'),
-                temperature=config_dict.get('AZURE_OPENAI_TEMPERATURE', 0.0),
-                api_key=config_dict['AZURE_OPENAI_API_KEY'],
-                azure_endpoint=config_dict['AZURE_OPENAI_ENDPOINT'],
-                api_version=config_dict.get('AZURE_OPENAI_API_VERSION', '2023-12-01-preview')
-            )
-            
-            state["llm_client"] = llm_client
+            state["llm_client"] = create_llm_client()
             print("✓ Connected to Azure OpenAI")
             state["step_completed"]["setup_llm"] = True
                 
@@ -232,7 +482,11 @@ class LangGraphMigrationPlanWorkflow:
                 state["step_completed"]["process_azure_migrate"] = True
                 return state
             
-            azure_migrate_data = ExcelProcessor.read_azure_migrate_report(azure_migrate_input.file_path)
+            # Reuse a report already parsed for this workbook (e.g. shared across a portfolio)
+            azure_migrate_data = self.azure_migrate_reports.get(azure_migrate_input.file_path)
+            if azure_migrate_data is None:
+                from SorthaDevKit.ExcelUtils import ExcelProcessor
+                azure_migrate_data = ExcelProcessor.read_azure_migrate_report(azure_migrate_input.file_path)
             if azure_migrate_data:
                 state["azure_migrate_data"] = azure_migrate_data
                 print(f"✓ Processed {len(azure_migrate_data.servers)} servers from Azure Migrate report")
@@ -277,6 +531,7 @@ class LangGraphMigrationPlanWorkflow:
                 return state
             
             # Process questions Excel file
+            from SorthaDevKit.ExcelUtils import ExcelProcessor
             questions_data = ExcelProcessor.read_questions_from_excel(questions_input.file_path)
             
             # Combine transcript analysis with questions
@@ -290,6 +545,7 @@ class LangGraphMigrationPlanWorkflow:
         except Exception as e:
             error = f"Error processing questions and transcript: {str(e)}"
             print(error)
+            state["errors"].append(error)
             print("⚠ Falling back to minimal analysis")
             state["questions_answers"] = self._create_minimal_qa_data()
             state["step_completed"]["process_questions"] = True
@@ -412,9 +668,19 @@ class LangGraphMigrationPlanWorkflow:
         
         return state
     
-    def _export_qa_node(self, state: WorkflowState) -> WorkflowState:
+    def _run_export(self, pooled_function, local_function, *args) -> bool:
+        """Render an export document in the process pool, falling back to in-process rendering."""
+        if self._export_pool is not None:
+            try:
+                return self._export_pool.submit(pooled_function, *args).result()
+            except (BrokenProcessPool, pickle.PicklingError) as e:
+                print(f"⚠ Export worker unavailable ({str(e)}), rendering in-process")
+        return local_function(*args)
+    
+    def _export_qa_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Export Q&A report to Excel."""
         print("Exporting Q&A analysis...")
+        outcome = {"success": False, "files": {}, "errors": []}
         
         try:
             from SorthaDevKit.StateBase import ExcelOutputType
@@ -439,7 +705,10 @@ class LangGraphMigrationPlanWorkflow:
             )
             
             # Get output path
-            output_path = self._get_output_config().get("output_file_path", "output/filled_aif.xlsx")
+            if self.output_dir:
+                output_path = os.path.join(self.output_dir, "filled_aif.xlsx")
+            else:
+                output_path = self._get_output_config().get("output_file_path", "output/filled_aif.xlsx")
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
             # Get original questions file for reference
@@ -447,38 +716,30 @@ class LangGraphMigrationPlanWorkflow:
             original_questions_file = questions_input.file_path if questions_input else None
             
             # Use ExcelProcessor to create the output
-            ExcelProcessor.create_output_excel(
-                excel_output=excel_output,
-                output_path=output_path,
-                original_questions_file=original_questions_file
-            )
+            self._run_export(render_qa_excel, render_qa_excel, excel_output, output_path, original_questions_file)
             
             print(f"✓ Q&A Excel report saved: {output_path}")
-            state["qa_export_success"] = True
-            state["step_completed"]["export_qa"] = True
+            outcome["success"] = True
             
         except Exception as e:
             error = f"Error exporting Q&A report: {str(e)}"
             print(error)
-            state["errors"].append(error)
-            state["qa_export_success"] = False
-            state["step_completed"]["export_qa"] = True  # Continue even if this fails
+            outcome["errors"].append(error)
         
-        return state
+        return {"qa_export": outcome}
     
-    def _export_assessment_report_node(self, state: WorkflowState) -> WorkflowState:
+    def _export_assessment_report_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Export application assessment report to Word document."""
         print("Exporting application assessment report...")
+        outcome = {"success": False, "files": {}, "errors": []}
         
         try:
-            if "assessment_report_data" not in state or not state["assessment_report_data"]:
+            if not state.get("assessment_report_data"):
                 print("⚠ No assessment report data available, skipping export")
-                state["assessment_export_success"] = False
-                state["step_completed"]["export_assessment_report"] = True
-                return state
+                return {"assessment_export": outcome}
             
             # Determine output path
-            output_dir = "output"
+            output_dir = self.output_dir or "output"
             os.makedirs(output_dir, exist_ok=True)
             
             # Use fixed filename that overwrites previous versions
@@ -486,62 +747,71 @@ class LangGraphMigrationPlanWorkflow:
             assessment_output_path = os.path.join(output_dir, assessment_filename)
             
             # Export assessment report (template is now embedded)
-            success = self.assessment_report_generator.export_to_word(
-                assessment_data=state["assessment_report_data"],
-                output_path=assessment_output_path
+            success = self._run_export(
+                render_assessment_report,
+                self.assessment_report_generator.export_to_word,
+                state["assessment_report_data"],
+                assessment_output_path
             )
             
             if success:
                 print(f"✓ Assessment report saved: {assessment_output_path}")
-                state["assessment_export_success"] = True
+                outcome["success"] = True
                 
                 # Add to plan files for reference
-                if "plan_files" not in state:
-                    state["plan_files"] = {}
-                state["plan_files"]["assessment_report"] = assessment_output_path
+                outcome["files"]["assessment_report"] = assessment_output_path
             else:
                 error = "Failed to export assessment report"
                 print(error)
-                state["errors"].append(error)
-                state["assessment_export_success"] = False
-            
-            state["step_completed"]["export_assessment_report"] = True
+                outcome["errors"].append(error)
             
         except Exception as e:
             error = f"Error exporting assessment report: {str(e)}"
             print(error)
-            state["errors"].append(error)
-            state["assessment_export_success"] = False
-            state["step_completed"]["export_assessment_report"] = True  # Continue even if this fails
+            outcome["errors"].append(error)
         
-        return state
+        return {"assessment_export": outcome}
     
-    def _export_documents_node(self, state: WorkflowState) -> WorkflowState:
+    def _export_documents_node(self, state: WorkflowState) -> Dict[str, Any]:
         """Export migration plan documents."""
         print("Exporting migration plan documents...")
+        outcome = {"success": False, "files": {}, "errors": []}
         
         try:
-            output_files = {}
-            output_dir = "output"
+            output_dir = self.output_dir or "output"
             os.makedirs(output_dir, exist_ok=True)
             
             # Word document export
             word_path = os.path.join(output_dir, "azure_migration_plan.docx")
-            if self.document_exporter.export_to_word(state["migration_plan"], word_path):
-                output_files['word'] = word_path
+            if self._run_export(render_migration_plan, self.document_exporter.export_to_word, state["migration_plan"], word_path):
+                outcome["files"]['word'] = word_path
                 print(f"✓ Word migration plan saved: {word_path}")
             else:
                 print("⚠ Word export failed (python-docx may not be installed)")
             
-            state["plan_files"] = output_files
-            state["step_completed"]["export_documents"] = True
+            outcome["success"] = True
             
         except Exception as e:
             error = f"Error exporting migration plan document: {str(e)}"
             print(error)
-            state["errors"].append(error)
-            state["plan_files"] = {}
-            state["step_completed"]["export_documents"] = True  # Continue even if this fails
+            outcome["errors"].append(error)
+        
+        return {"documents_export": outcome}
+    
+    def _join_exports_node(self, state: WorkflowState) -> WorkflowState:
+        """Aggregate output files and errors from the parallel export nodes."""
+        plan_files = {}
+        
+        for node_name, outcome_key in EXPORT_NODES.items():
+            outcome = state.get(outcome_key) or {}
+            plan_files.update(outcome.get("files", {}))
+            state["errors"].extend(outcome.get("errors", []))
+            state["step_completed"][node_name] = True  # Continue even if an export fails
+        
+        state["qa_export_success"] = state["qa_export"].get("success", False)
+        state["assessment_export_success"] = state["assessment_export"].get("success", False)
+        state["plan_files"] = plan_files
+        state["step_completed"]["join_exports"] = True
         
         return state
     
@@ -599,10 +869,10 @@ class LangGraphMigrationPlanWorkflow:
         # Continue even if Azure Migrate processing fails - we can work with minimal data
         return "continue"
     
-    def _should_continue_after_plan(self, state: WorkflowState) -> str:
+    def _should_continue_after_plan(self, state: WorkflowState) -> List[str]:
         """Decide whether to continue after plan generation."""
         # Continue even if plan generation has issues - we can still export Q&A
-        return "continue"
+        return list(EXPORT_NODES)
     
     def _create_minimal_qa_data(self):
         """Create minimal Q&A data when inputs are not available."""
@@ -665,6 +935,16 @@ class LangGraphMigrationPlanWorkflow:
         
         print(f"✓ Using LLM for enhanced transcript analysis")
         
+        # Look up answers from previous runs for this transcript and model configuration
+        transcript_hash = fingerprint(transcript_content)
+        model_key = fingerprint(self._qa_model_settings(), QUESTION_PROMPT_TEMPLATE)
+        question_texts = [q['question'] if isinstance(q, dict) else q for q in questions_data]
+        stored_answers = self.answer_store.load_many(transcript_hash, model_key, question_texts)
+        
+        pending_questions = len([q for q in question_texts if question_fingerprint(q) not in stored_answers])
+        if stored_answers:
+            print(f"✓ Reusing {len(question_texts) - pending_questions} stored answers, {pending_questions} new or changed questions sent to LLM")
+        
         for question_data in questions_data:
             try:
                 # Extract question and metadata
@@ -672,25 +952,21 @@ class LangGraphMigrationPlanWorkflow:
                 category = question_data.get('category', 'General') if isinstance(question_data, dict) else 'General'
                 priority = question_data.get('priority', 'Medium') if isinstance(question_data, dict) else 'Medium'
                 
-                prompt = f"""
-                Analyze the following transcript to answer this specific question. Please provide a direct, concise answer.
-                
-                Question: {question}
-                
-                Transcript:
-                {transcript_content}
-                
-                Instructions:
-                1. If the answer is clearly found in the transcript, provide a direct answer (2-3 sentences max)
-                2. If the answer is not addressed in the transcript, respond exactly with: "Not addressed in transcript"
-                3. Provide a confidence level: High (explicitly mentioned), Medium (can be inferred), Low (unclear), or Unknown (not addressed)
-                4. If you find the answer in the transcript, try to identify a rough timestamp or section reference
+                # Reuse the stored answer when transcript, question and model are unchanged
+                stored_qa = stored_answers.get(question_fingerprint(question))
+                if stored_qa is not None:
+                    qa_pairs.append(QuestionAnswer(
+                        question=question,
+                        answer=stored_qa.answer,
+                        confidence=stored_qa.confidence,
+                        is_answered=stored_qa.is_answered,
+                        category=category,
+                        priority=priority,
+                        source_reference=stored_qa.source_reference
+                    ))
+                    continue
                 
-                Format your response as:
-                ANSWER: [your answer or "Not addressed in transcript"]
-                CONFIDENCE: [High/Medium/Low/Unknown]
-                SOURCE: [timestamp or section reference if available, or "N/A" if not addressed]
-                """
+                prompt = QUESTION_PROMPT_TEMPLATE.format(question=question, transcript=transcript_content)
                 
                 response = llm_client.invoke(prompt)
                 response_text = response.content if hasattr(response, 'content') else str(response)
@@ -727,7 +1003,7 @@ class LangGraphMigrationPlanWorkflow:
                         is_answered = True
                         source_ref = "Transcript Analysis"
                 
-                qa_pairs.append(QuestionAnswer(
+                qa = QuestionAnswer(
                     question=question,
                     answer=answer,
                     confidence=confidence,
@@ -735,7 +1011,9 @@ class LangGraphMigrationPlanWorkflow:
                     category=category,
                     priority=priority,
                     source_reference=source_ref
-                ))
+                )
+                qa_pairs.append(qa)
+                self._remember_answer(transcript_hash, model_key, qa)
                 
             except Exception as e:
                 print(f"Error analyzing question '{question}': {str(e)}")
@@ -746,7 +1024,7 @@ class LangGraphMigrationPlanWorkflow:
                     is_answered=False,
                     category=category if 'category' in locals() else "Error",
                     priority=priority if 'priority' in locals() else "Medium",
-                    source_reference="Processing Error"
+                    source_reference=PROCESSING_ERROR_SOURCE
                 ))
         
         # Print summary after all questions are analyzed
@@ -756,6 +1034,13 @@ class LangGraphMigrationPlanWorkflow:
         
         return qa_pairs
     
+    def _remember_answer(self, transcript_hash: str, model_key: str, qa: QuestionAnswer):
+        """Persist an LLM answer; a store failure must not fail the question."""
+        try:
+            self.answer_store.save(transcript_hash, model_key, qa)
+        except Exception as e:
+            print(f"⚠ Could not store answer for '{qa.question}': {str(e)}")
+    
     def _analyze_transcript_simple(self, transcript_content, questions_data):
         """Simple transcript analysis without LLM."""
         # Same implementation as original
@@ -835,14 +1120,14 @@ class LangGraphMigrationPlanWorkflow:
         """Print final summary of generated outputs."""
         print("\nMigration plan generation complete!")
         
-        # Count generated files
-        total_files = len(state["plan_files"])
+        # Count generated files (the assessment report is counted separately below)
+        total_files = len([file_type for file_type in state["plan_files"] if file_type != "assessment_report"])
         if state["qa_export_success"]:
             total_files += 1  # Add Q&A report
         if state.get("assessment_export_success"):
             total_files += 1  # Add Assessment report
             
-        print(f"✓ Generated {total_files} output files in the output/ directory")
+        print(f"✓ Generated {total_files} output files in the {self.output_dir or 'output'}/ directory")
         
         # Print specific file information
         if state.get("assessment_export_success"):
@@ -861,6 +1146,8 @@ class LangGraphMigrationPlanWorkflow:
         """Execute the LangGraph workflow."""
         try:
             # Compile the graph
+            from langgraph.checkpoint.memory import MemorySaver
+            
             memory = MemorySaver()
             app = self.graph.compile(checkpointer=memory)
             
@@ -871,6 +1158,9 @@ class LangGraphMigrationPlanWorkflow:
                 questions_answers=[],
                 assessment_report_data=None,
                 migration_plan=None,
+                qa_export={},
+                assessment_export={},
+                documents_export={},
                 qa_export_success=False,
                 assessment_export_success=False,
                 plan_files={},
@@ -880,9 +1170,19 @@ class LangGraphMigrationPlanWorkflow:
                 step_completed={}
             )
             
-            # Run the workflow
+            # Run the workflow; document rendering is offloaded to worker processes
             config = {"configurable": {"thread_id": "migration_workflow"}}
-            final_state = app.invoke(initial_state, config)
+            if self._shared_export_pool is not None:
+                self._export_pool = self._shared_export_pool
+            else:
+                export_workers = self._get_output_config().get("export_workers", len(EXPORT_NODES))
+                self._export_pool = ProcessPoolExecutor(max_workers=export_workers) if export_workers else None
+            try:
+                final_state = app.invoke(initial_state, config)
+            finally:
+                if self._export_pool is not None and self._export_pool is not self._shared_export_pool:
+                    self._export_pool.shutdown()
+                self._export_pool = None
             
             return final_state["result"]
             
@@ -893,6 +1193,6 @@ class LangGraphMigrationPlanWorkflow:
             return result
 
 
-def create_langgraph_workflow(inputs: Dict[str, Any]) -> LangGraphMigrationPlanWorkflow:
+def create_langgraph_workflow(inputs: Dict[str, Any], resume: bool = False) -> LangGraphMigrationPlanWorkflow:
     """Factory function to create a LangGraph workflow."""
-    return LangGraphMigrationPlanWorkflow(inputs)
+    return LangGraphMigrationPlanWorkflow(inputs, resume=resume)
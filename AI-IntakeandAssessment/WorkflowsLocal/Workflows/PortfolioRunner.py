@@ -0,0 +1,242 @@
+import os
+import sys
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from SorthaDevKit.StateBase import FileInputType, FileTypes, ProcessingResult
+from Workflows.LangGraphMigrationPlan import LangGraphMigrationPlanWorkflow, create_llm_client, validate_inputs, EXPORT_NODES
+
+
+@dataclass
+class PortfolioApplication:
+    """One application in a portfolio manifest."""
+    name: str
+    transcript: str
+    questions_excel: str
+    azure_migrate_report: str
+    output_dir: str
+
+    def to_inputs(self) -> Dict[str, FileInputType]:
+        """Build the workflow inputs for this application."""
+        return {
+            "transcript": FileInputType(file_path=self.transcript, type=FileTypes.TEXT),
+            "questions_excel": FileInputType(file_path=self.questions_excel, type=FileTypes.EXCEL),
+            "azure_migrate_report": FileInputType(file_path=self.azure_migrate_report, type=FileTypes.EXCEL)
+        }
+
+
+@dataclass
+class PortfolioAppResult:
+    """Outcome of running the migration plan workflow for one application."""
+    name: str
+    success: bool
+    output_dir: str
+    duration_seconds: float
+    questions_total: int = 0
+    questions_answered: int = 0
+    output_files: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+
+def load_portfolio_manifest(manifest_path: str) -> Dict[str, Any]:
+    """
+    Load a portfolio manifest.
+
+    The manifest is a JSON file of the form:
+        {
+            "azure_migrate_report": "Inputs/azure_migrate_assessment.xlsx",
+            "questions_excel": "Inputs/aif_unfilled.xlsx",
+            "output_dir": "output/portfolio",
+            "max_concurrency": 4,
+            "applications": [
+                {"name": "billing", "transcript": "Inputs/billing_transcript.txt"},
+                {"name": "crm", "transcript": "Inputs/crm.txt", "questions_excel": "Inputs/crm_aif.xlsx"}
+            ]
+        }
+    Top-level azure_migrate_report and questions_excel are defaults that each application may override.
+    Relative paths are resolved against the manifest's directory.
+
+    Args:
+        manifest_path: Path to the manifest JSON file
+
+    Returns:
+        Dictionary with the resolved applications, output_dir and max_concurrency
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    def resolve(path: Optional[str]) -> str:
+        if not path:
+            return ''
+        return path if os.path.isabs(path) else os.path.join(base_dir, path)
+
+    output_dir = resolve(manifest.get("output_dir", "output/portfolio"))
+    applications = []
+    seen_names = set()
+
+    for entry in manifest.get("applications", []):
+        name = entry.get("name")
+        if not name:
+            raise ValueError("Every portfolio application needs a 'name'")
+        if name in seen_names:
+            raise ValueError(f"Duplicate portfolio application name: {name}")
+        seen_names.add(name)
+
+        applications.append(PortfolioApplication(
+            name=name,
+            transcript=resolve(entry.get("transcript")),
+            questions_excel=resolve(entry.get("questions_excel", manifest.get("questions_excel"))),
+            azure_migrate_report=resolve(entry.get("azure_migrate_report", manifest.get("azure_migrate_report"))),
+            output_dir=resolve(entry.get("output_dir")) or os.path.join(output_dir, name)
+        ))
+
+    return {
+        "applications": applications,
+        "output_dir": output_dir,
+        "max_concurrency": int(manifest.get("max_concurrency", 4))
+    }
+
+
+class PortfolioRunner:
+    """Runs the migration plan workflow for many applications in one process with shared resources."""
+
+    def __init__(self, applications: List[PortfolioApplication], output_dir: str, max_concurrency: int = 4, resume: bool = False):
+        self.applications = applications
+        self.output_dir = output_dir
+        self.max_concurrency = max(1, max_concurrency)
+        self.resume = resume
+
+    def _parse_azure_migrate_reports(self) -> Dict[str, Any]:
+        """Parse each distinct Azure Migrate workbook once for the whole portfolio."""
+        from SorthaDevKit.ExcelUtils import ExcelProcessor
+        
+        reports = {}
+        for report_path in sorted({app.azure_migrate_report for app in self.applications if app.azure_migrate_report}):
+            if not os.path.exists(report_path):
+                continue
+            try:
+                reports[report_path] = ExcelProcessor.read_azure_migrate_report(report_path)
+                print(f"✓ Parsed Azure Migrate report once for the portfolio: {os.path.basename(report_path)}")
+            except Exception as e:
+                # Each application falls back to its own processing and reports the error
+                print(f"⚠ Error parsing Azure Migrate report {report_path}: {str(e)}")
+        return reports
+
+    def validate(self) -> Dict[str, List[str]]:
+        """Validate the inputs of every application without running any workflow."""
+        return {app.name: validate_inputs(app.to_inputs()) for app in self.applications}
+
+    def _run_application(self, app: PortfolioApplication, llm_client, azure_migrate_reports, export_pool) -> PortfolioAppResult:
+        """Run the workflow for a single application."""
+        started = time.perf_counter()
+        inputs = app.to_inputs()
+
+        try:
+            workflow = LangGraphMigrationPlanWorkflow(
+                inputs,
+                resume=self.resume,
+                output_dir=app.output_dir,
+                llm_client=llm_client,
+                azure_migrate_reports=azure_migrate_reports,
+                export_pool=export_pool
+            )
+            result = workflow.run()
+        except Exception as e:
+            result = ProcessingResult()
+            result.add_error(f"Workflow execution failed: {str(e)}")
+
+        app_result = PortfolioAppResult(
+            name=app.name,
+            success=result.success,
+            output_dir=app.output_dir,
+            duration_seconds=round(time.perf_counter() - started, 2),
+            errors=list(result.errors)
+        )
+
+        if result.success and result.data:
+            questions_answers = result.data.get("questions_answers") or []
+            app_result.questions_total = len(questions_answers)
+            app_result.questions_answered = len([qa for qa in questions_answers if qa.is_answered])
+            app_result.output_files = result.data.get("output_files", {})
+
+        return app_result
+
+    def run(self) -> List[PortfolioAppResult]:
+        """Run all applications with bounded concurrency and write the portfolio summary."""
+        print(f"Portfolio run: {len(self.applications)} applications, up to {self.max_concurrency} concurrently")
+        started = time.perf_counter()
+
+        # Shared across all applications: one LLM client, parsed workbooks and one export pool
+        try:
+            llm_client = create_llm_client()
+            print("✓ Connected to Azure OpenAI")
+        except Exception as e:
+            print(f"Error initializing Azure OpenAI: {str(e)}")
+            llm_client = None
+
+        azure_migrate_reports = self._parse_azure_migrate_reports()
+        export_workers = min(os.cpu_count() or 1, self.max_concurrency * len(EXPORT_NODES))
+
+        results = []
+        with ProcessPoolExecutor(max_workers=export_workers) as export_pool:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                futures = {
+                    executor.submit(self._run_application, app, llm_client, azure_migrate_reports, export_pool): app
+                    for app in self.applications
+                }
+                for future in as_completed(futures):
+                    app_result = future.result()
+                    status = "✓" if app_result.success else "✗"
+                    print(f"{status} {app_result.name} finished in {app_result.duration_seconds}s")
+                    results.append(app_result)
+
+        # Report in manifest order regardless of completion order
+        order = {app.name: index for index, app in enumerate(self.applications)}
+        results.sort(key=lambda r: order[r.name])
+
+        self._write_summary(results, time.perf_counter() - started)
+        return results
+
+    def _write_summary(self, results: List[PortfolioAppResult], duration_seconds: float):
+        """Write portfolio_summary.json and print a short overview."""
+        succeeded = [r for r in results if r.success]
+        summary = {
+            "generated": datetime.now().isoformat(),
+            "duration_seconds": round(duration_seconds, 2),
+            "total_applications": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "applications": [asdict(r) for r in results]
+        }
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary_path = os.path.join(self.output_dir, "portfolio_summary.json")
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, default=str)
+
+        print("=" * 70)
+        print(f"Portfolio complete: {len(succeeded)}/{len(results)} applications succeeded in {summary['duration_seconds']}s")
+        for r in results:
+            if not r.success:
+                print(f"  ✗ {r.name}: {'; '.join(r.errors) or 'Unknown error'}")
+        print(f"✓ Portfolio summary saved: {summary_path}")
+
+
+def create_portfolio_runner(manifest_path: str, max_concurrency: Optional[int] = None, resume: bool = False) -> PortfolioRunner:
+    """Factory function to create a portfolio runner from a manifest file."""
+    manifest = load_portfolio_manifest(manifest_path)
+    return PortfolioRunner(
+        applications=manifest["applications"],
+        output_dir=manifest["output_dir"],
+        max_concurrency=max_concurrency or manifest["max_concurrency"],
+        resume=resume
+    )
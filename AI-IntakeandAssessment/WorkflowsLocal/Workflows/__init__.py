@@ -8,4 +8,4 @@ planning with state-driven architecture, enhanced error handling,
 and improved extensibility using LangGraph.
 """
 
-__all__ = ['LangGraphMigrationPlan']
\ No newline at end of file
+__all__ = ['LangGraphMigrationPlan', 'PortfolioRunner']
\ No newline at end of file
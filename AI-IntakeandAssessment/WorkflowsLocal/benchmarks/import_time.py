@@ -0,0 +1,79 @@
+"""
+Import-time profile for the workflow entry points.
+Runs each module under `python -X importtime` in a fresh interpreter and reports
+the total import time and the slowest imports, to catch heavy dependencies
+creeping back onto the startup path.
+
+Usage:
+    python benchmarks/import_time.py [module ...] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+WORKFLOWS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "main",
+    "Workflows.LangGraphMigrationPlan",
+    "Workflows.PortfolioRunner",
+]
+
+
+def profile_import(module: str):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Dotted module name, importable from the WorkflowsLocal directory
+
+    Returns:
+        Tuple of (list of (cumulative_us, module_name), error output or None)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=WORKFLOWS_DIR,
+        capture_output=True,
+        text=True
+    )
+
+    timings = []
+    other_lines = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other_lines.append(line)
+            continue
+        fields = [part.strip() for part in line[len("import time:"):].split("|")]
+        if len(fields) != 3 or not fields[1].isdigit():
+            continue  # header line
+        timings.append((int(fields[1]), fields[2].strip()))
+
+    error = "\n".join(other_lines) if completed.returncode != 0 else None
+    return timings, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time of the workflow entry points")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to profile")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        timings, error = profile_import(module)
+        print("=" * 70)
+        if error:
+            print(f"✗ {module}: import failed")
+            print(error.strip().splitlines()[-1] if error.strip() else "")
+            continue
+
+        # The requested module is the last top-level entry and its cumulative time is the total
+        total_us = next((us for us, name in reversed(timings) if name == module), 0)
+        print(f"{module}: {total_us / 1000:.1f} ms")
+        for cumulative_us, name in sorted(timings, reverse=True)[:args.top]:
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
-
-from Workflows.LangGraphMigrationPlan import create_langgraph_workflow
-from Input import Input
+import argparse
 import sys
 import logging
 import os
@@ -19,12 +17,77 @@ logging.getLogger("azure").setLevel(logging.WARNING)
 # Set environment variable to reduce Azure SDK verbosity
 os.environ.setdefault("AZURE_LOG_LEVEL", "WARNING")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="SorthaDevKit - AI Assisted AIF filling and AMP Generation")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse checkpointed Q&A, assessment and plan results whose inputs are unchanged"
+    )
+    parser.add_argument(
+        "--portfolio",
+        metavar="MANIFEST",
+        help="Run every application listed in a portfolio manifest (JSON) instead of Input.py"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Maximum applications processed concurrently in portfolio mode (overrides the manifest)"
+    )
+    parser.add_argument(
+        "--validate-only", "--dry-run",
+        dest="validate_only",
+        action="store_true",
+        help="Only validate the inputs (or portfolio manifest) and exit without calling the LLM"
+    )
+    return parser.parse_args()
+
+def validate_only(args):
+    # Only the light validation code is imported here, not langgraph/pandas/docx/openai
+    from Workflows.LangGraphMigrationPlan import validate_inputs
+    
+    if args.portfolio:
+        from Workflows.PortfolioRunner import create_portfolio_runner
+        results = create_portfolio_runner(args.portfolio).validate()
+    else:
+        from Input import Input
+        results = {"Input.py": validate_inputs(Input)}
+    
+    for name, errors in results.items():
+        if errors:
+            print(f"✗ {name}")
+            for error in errors:
+                print(f"  - {error}")
+        else:
+            print(f"✓ {name}: inputs valid")
+    
+    return not any(results.values())
+
+def run_portfolio(args):
+    from Workflows.PortfolioRunner import create_portfolio_runner
+    
+    runner = create_portfolio_runner(args.portfolio, max_concurrency=args.max_concurrency, resume=args.resume)
+    return runner.run()
+
 def main():
+    args = parse_args()
+    
     print("SorthaDevKit - AI Assisted AIF filling and AMP Generation")
     print("=" * 40)
     
+    # The return value is the process exit code
+    if args.validate_only:
+        return 0 if validate_only(args) else 1
+    
+    if args.portfolio:
+        return 0 if all(app.success for app in run_portfolio(args)) else 1
+    
+    from Workflows.LangGraphMigrationPlan import create_langgraph_workflow
+    from Input import Input
+    
     # Create and run the LangGraph workflow
-    workflow = create_langgraph_workflow(Input)
+    workflow = create_langgraph_workflow(Input, resume=args.resume)
     result = workflow.run()
     
     if result.success:
@@ -46,7 +109,7 @@ def main():
         for error in result.errors:
             print(f"  - {error}")
     
-    return result
+    return 0 if result.success else 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Local catalog of the Azure security baselines in baselines/*.pdf.
+
+Each PDF's text is extracted once (pypdf), split into per-control sections
+(NS-1, DP-3, ...) and cached on disk keyed by the file's content hash, so later
+runs never parse the PDFs again. Baselines are selected deterministically from
+the plan's resource types and only the controls that can be expressed in
+Terraform, and that the service supports, are written out as excerpts for the agent.
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional
+
+CACHE_DIR_NAME = ".cache"
+MAX_EXCERPT_CHARS = 4000
+
+# Baseline file (without .pdf) -> Terraform resource type prefixes it covers
+BASELINE_RESOURCE_TYPES = {
+    "key_vault": ["azurerm_key_vault"],
+    "key_vault_managed_hsm": ["azurerm_key_vault_managed_hardware_security_module"],
+    "azure_dedicated_hsm": ["azurerm_dedicated_hardware_security_module"],
+    "storage": ["azurerm_storage_"],
+    "virtual_network": [
+        "azurerm_virtual_network", "azurerm_subnet", "azurerm_network_security_", "azurerm_route",
+        "azurerm_network_interface",
+    ],
+    "azure_public_ip": ["azurerm_public_ip"],
+    "azure_private_link": ["azurerm_private_endpoint", "azurerm_private_link_service", "azurerm_private_dns_"],
+    "azure_ddos_protection": ["azurerm_network_ddos_protection_plan"],
+    "virtual_machine_scale_sets": [
+        "azurerm_linux_virtual_machine_scale_set", "azurerm_windows_virtual_machine_scale_set",
+        "azurerm_orchestrated_virtual_machine_scale_set", "azurerm_virtual_machine_scale_set",
+    ],
+    "azure_resource_manager": [
+        "azurerm_resource_group", "azurerm_management_lock", "azurerm_role_", "azurerm_policy_",
+        "azurerm_subscription", "azurerm_resource_group_template_deployment",
+    ],
+    "azure_devtest_labs": ["azurerm_dev_test_"],
+    "azure_network_function_manager": ["azurerm_network_function_"],
+}
+
+# ARM resource types deployed through azapi_resource -> baseline
+ARM_TYPE_BASELINES = {
+    "Microsoft.KeyVault/vaults": "key_vault",
+    "Microsoft.KeyVault/managedHSMs": "key_vault_managed_hsm",
+    "Microsoft.Storage/storageAccounts": "storage",
+    "Microsoft.Network/virtualNetworks": "virtual_network",
+    "Microsoft.Network/virtualNetworks/subnets": "virtual_network",
+    "Microsoft.Network/virtualNetworks/virtualNetworkPeerings": "virtual_network",
+    "Microsoft.Network/networkSecurityGroups": "virtual_network",
+    "Microsoft.Network/routeTables": "virtual_network",
+    "Microsoft.Network/publicIPAddresses": "azure_public_ip",
+    "Microsoft.Network/privateEndpoints": "azure_private_link",
+    "Microsoft.Network/ddosProtectionPlans": "azure_ddos_protection",
+    "Microsoft.Compute/virtualMachineScaleSets": "virtual_machine_scale_sets",
+    "Microsoft.Resources/resourceGroups": "azure_resource_manager",
+    "Microsoft.Resources/deployments": "azure_resource_manager",
+}
+
+# Control families that map to resource configuration; asset management, posture,
+# incident response and governance controls are processes, not Terraform attributes
+IAC_CONTROL_FAMILIES = ("NS", "IM", "PA", "DP", "LT", "BR", "ES")
+
+CONTROL_HEADING = re.compile(r"^\s*((?:NS|IM|PA|DP|AM|LT|IR|PV|ES|BR|GS|DS)-\d+)\s*:\s*(.+)$", re.MULTILINE)
+FEATURE_SUPPORTED = re.compile(r"Supported\s*:?\s*(True|False)", re.IGNORECASE)
+
+
+def file_hash(path: str) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def extract_pdf_text(path: str) -> str:
+    # Imported here so selecting baselines from an existing cache does not need pypdf
+    from pypdf import PdfReader
+
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+def split_controls(text: str) -> List[Dict[str, str]]:
+    """ Splits baseline text into sections starting at each control heading (e.g. 'NS-2: Secure cloud services...'). """
+    matches = list(CONTROL_HEADING.finditer(text))
+    controls = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        controls.append({
+            "id": match.group(1),
+            "title": match.group(2).strip(),
+            "text": text[match.start():end].strip(),
+        })
+    return controls
+
+
+def is_applicable(control: Dict[str, str]) -> bool:
+    """ Keeps configuration control families, dropping controls whose every feature is unsupported. """
+    if control["id"].split("-")[0] not in IAC_CONTROL_FAMILIES:
+        return False
+    supported = [value.lower() == "true" for value in FEATURE_SUPPORTED.findall(control["text"])]
+    return not supported or any(supported)
+
+
+class BaselineCatalog:
+    """ Per-control sections of every baseline PDF, cached on disk by content hash. """
+
+    def __init__(self, baseline_dir: str):
+        self.baseline_dir = baseline_dir
+        self.cache_dir = os.path.join(baseline_dir, CACHE_DIR_NAME)
+        self._controls = {}
+
+    def baselines(self) -> List[str]:
+        return sorted(
+            name[:-4] for name in os.listdir(self.baseline_dir) if name.lower().endswith(".pdf")
+        )
+
+    def controls(self, baseline: str) -> List[Dict[str, str]]:
+        if baseline not in self._controls:
+            path = os.path.join(self.baseline_dir, baseline + ".pdf")
+            cache_path = os.path.join(self.cache_dir, f"{file_hash(path)}.json")
+            if os.path.exists(cache_path):
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    controls = json.load(f)
+            else:
+                print(f"Indexing baseline {baseline}.pdf")
+                controls = split_controls(extract_pdf_text(path))
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(controls, f)
+            self._controls[baseline] = controls
+        return self._controls[baseline]
+
+    def select(self, resources: Iterable[Dict[str, str]]) -> Dict[str, List[str]]:
+        """
+        Maps each available baseline to the resource types in the plan it covers.
+        resources are plan summary entries with "type" and, for azapi resources, "arm_type".
+        """
+        available = set(self.baselines())
+        selected = {}
+        for resource in resources:
+            baseline = baseline_for(resource.get("type") or "", resource.get("arm_type"))
+            if baseline in available:
+                resource_type = resource.get("arm_type") or resource.get("type")
+                if resource_type not in selected.setdefault(baseline, []):
+                    selected[baseline].append(resource_type)
+        return selected
+
+    def write_excerpts(self, selected: Dict[str, List[str]], output_path: str) -> str:
+        """ Writes the applicable controls of the selected baselines to one Markdown file. """
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("# Security baseline controls\n\n")
+            for baseline, resource_types in sorted(selected.items()):
+                f.write(f"## {baseline} (applies to: {', '.join(resource_types)})\n\n")
+                for control in self.controls(baseline):
+                    if is_applicable(control):
+                        f.write(control["text"][:MAX_EXCERPT_CHARS] + "\n\n")
+        return output_path
+
+
+def baseline_for(resource_type: str, arm_type: Optional[str] = None) -> Optional[str]:
+    """ The baseline covering a Terraform resource type (or the ARM type of an azapi resource). """
+    if arm_type:
+        return ARM_TYPE_BASELINES.get(arm_type)
+    # Longest prefix wins, e.g. azurerm_key_vault_managed_hardware_security_module over azurerm_key_vault
+    best = None
+    best_length = 0
+    for baseline, prefixes in BASELINE_RESOURCE_TYPES.items():
+        for prefix in prefixes:
+            if resource_type.startswith(prefix) and len(prefix) > best_length:
+                best = baseline
+                best_length = len(prefix)
+    return best
@@ -3,8 +3,7 @@ import asyncio
 import logging
 import subprocess
 import json
-import math
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from semantic_kernel.contents.annotation_content import AnnotationContent
 from semantic_kernel.agents import AzureAIAgent, AzureAIAgentSettings, AzureAIAgentThread
 from azure.ai.agents.models import CodeInterpreterTool, FilePurpose
@@ -13,203 +12,105 @@ from semantic_kernel.contents.utils.author_role import AuthorRole
 from datetime import datetime
 from dotenv import load_dotenv
 from datetime import timedelta
+from baseline_index import BaselineCatalog
+from security_prescan import PrescanResult
+from findings_store import FindingsStore
+from upload_cache import UploadManager
+from plan_chunker import DEFAULT_MAX_CHUNK_BYTES, PlanChunker, chunk_plan, summarize_plan
 load_dotenv()
 
+MAX_CONCURRENT_CHUNKS = int(os.getenv("MAX_CONCURRENT_CHUNKS", "4"))
+CHUNK_RETRIES = 2
+
 logging.basicConfig(
     format="[%(asctime)s - %(name)s:%(lineno)d - %(levelname)s] %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 logging.getLogger("kernel").setLevel(logging.DEBUG)
 
-def split_json_by_resources(json_file_path: str, output_dir: str, max_resources_per_chunk: int = 10) -> List[str]:
+def split_json_by_resources(json_file_path: str, output_dir: str, max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+                            summary_path: str = None, addresses: List[str] = None) -> List[str]:
     """
-    Split a large Terraform JSON file into smaller chunks based on resource count.
+    Split a large Terraform JSON file into chunks of whole resources, grouped by address and cut on a byte budget.
+    With summary_path the plan summary is written in the same pass; with addresses only those resources are chunked.
     Returns list of chunk file paths.
     """
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Extract resources from planned_values or resource_changes
-    resources = []
-    if 'planned_values' in data and 'root_module' in data['planned_values']:
-        resources.extend(data['planned_values']['root_module'].get('resources', []))
-        # Also check child modules
-        if 'child_modules' in data['planned_values']['root_module']:
-            for module in data['planned_values']['root_module']['child_modules']:
-                resources.extend(module.get('resources', []))
-    
-    if 'resource_changes' in data:
-        resource_changes = data['resource_changes']
-    else:
-        resource_changes = []
-    
-    if not resources and not resource_changes:
+    chunk_files = chunk_plan(json_file_path, output_dir, max_chunk_bytes=max_chunk_bytes, summary_path=summary_path,
+                             addresses=addresses)
+    if not chunk_files and addresses is None:
         # If no resources found, return original file
         return [json_file_path]
-    
-    # Calculate number of chunks needed
-    total_items = max(len(resources), len(resource_changes))
-    num_chunks = math.ceil(total_items / max_resources_per_chunk)
-    
-    chunk_files = []
-    
-    for i in range(num_chunks):
-        start_idx = i * max_resources_per_chunk
-        end_idx = min((i + 1) * max_resources_per_chunk, total_items)
-        
-        # Create chunk data structure
-        chunk_data = {
-            "format_version": data.get("format_version"),
-            "terraform_version": data.get("terraform_version"),
-            "variables": data.get("variables", {}),
-            "configuration": data.get("configuration", {}),
-            "chunk_info": {
-                "chunk_number": i + 1,
-                "total_chunks": num_chunks,
-                "resources_range": f"{start_idx}-{end_idx-1}"
-            }
-        }
-        
-        # Add subset of resources
-        if resources:
-            chunk_resources = resources[start_idx:end_idx]
-            chunk_data["planned_values"] = {
-                "root_module": {
-                    "resources": chunk_resources
-                }
-            }
-        
-        if resource_changes:
-            chunk_resource_changes = resource_changes[start_idx:end_idx]
-            chunk_data["resource_changes"] = chunk_resource_changes
-        
-        # Save chunk
-        chunk_filename = f"terraform_chunk_{i+1}_of_{num_chunks}.json"
-        chunk_path = os.path.join(output_dir, chunk_filename)
-        
-        with open(chunk_path, 'w', encoding='utf-8') as f:
-            json.dump(chunk_data, f, indent=2)
-        
-        chunk_files.append(chunk_path)
-        print(f"Created chunk {i+1}/{num_chunks}: {chunk_filename}")
-    
     return chunk_files
 
 def create_summary_json(json_file_path: str, output_path: str) -> str:
     """
     Create a summary JSON with high-level information about the Terraform plan.
+    Resources are indexed by address, so planned values and changes of the same resource count once.
     """
-    with open(json_file_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    summary = {
-        "format_version": data.get("format_version"),
-        "terraform_version": data.get("terraform_version"),
-        "variables": data.get("variables", {}),
-        "configuration": {
-            "provider_config": data.get("configuration", {}).get("provider_config", {}),
-            "root_module": {
-                "resources": []
-            }
-        },
-        "summary": {
-            "total_resources": 0,
-            "resource_types": {},
-            "provider_summary": {}
-        }
-    }
-    
-    # Count resources and types
-    all_resources = []
-    
-    if 'planned_values' in data and 'root_module' in data['planned_values']:
-        all_resources.extend(data['planned_values']['root_module'].get('resources', []))
-        if 'child_modules' in data['planned_values']['root_module']:
-            for module in data['planned_values']['root_module']['child_modules']:
-                all_resources.extend(module.get('resources', []))
-    
-    if 'resource_changes' in data:
-        for change in data['resource_changes']:
-            if change not in all_resources:
-                all_resources.append(change)
-    
-    # Create summary statistics
-    resource_types = {}
-    for resource in all_resources:
-        resource_type = resource.get('type', 'unknown')
-        if resource_type not in resource_types:
-            resource_types[resource_type] = 0
-        resource_types[resource_type] += 1
-        
-        # Add basic resource info without sensitive data
-        summary["configuration"]["root_module"]["resources"].append({
-            "type": resource.get("type"),
-            "name": resource.get("name"),
-            "provider": resource.get("provider_name"),
-            "mode": resource.get("mode", "managed")
-        })
-    
-    summary["summary"]["total_resources"] = len(all_resources)
-    summary["summary"]["resource_types"] = resource_types
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, indent=2)
-    
-    return output_path
+    return summarize_plan(json_file_path, output_path)
 
-def getAllFiles(dir: str) -> str:
-    return ",".join(os.listdir(dir))
+async def read_response_annotations(client, response) -> List[str]:
+    """
+    Download the files a response annotates (e.g. tables written by CodeInterpreter).
+    """
+    contents = []
+    for item in response.items:
+        if isinstance(item, AnnotationContent):
+            response_content = await client.agents.get_file_content(file_id=item.file_id)
+            content_bytes = bytearray()
+            async for chunk_content in response_content:
+                content_bytes.extend(chunk_content)
+            contents.append(content_bytes.decode("utf-8"))
+    return contents
 
-async def process_json_chunks(agent, client, chunk_files: List[str], analysis_prompt: str, thread=None) -> List[str]:
+async def analyze_chunk(agent, client, uploads: UploadManager, chunk_file: str, prompt: str) -> str:
     """
-    Process multiple JSON chunks and return analysis results.
+    Analyze one chunk in its own thread. The chunk is attached to the thread, so the agent is never modified.
     """
-    results = []
-    
-    for i, chunk_file in enumerate(chunk_files):
-        print(f"Processing chunk {i+1}/{len(chunk_files)}: {os.path.basename(chunk_file)}")
-        x = await client.agents.files.clear
-        # Upload chunk file
-        file = await client.agents.files.upload_and_poll(file_path=chunk_file, purpose=FilePurpose.AGENTS)
-        #client.agents.files.upload_and_poll
-        # Update code interpreter with this chunk
-        code_interpreter = CodeInterpreterTool(file_ids=[file.id])
-        
-        # Update agent
-        agent_definition = await client.agents.update_agent(
-            agent_id=agent.id,
-            tools=code_interpreter.definitions,
-            tool_resources=code_interpreter.resources,
-        )
-        
-        # Process this chunk
-        chunk_prompt = f"{analysis_prompt} (Processing chunk {i+1} of {len(chunk_files)})"
-        
+    # Kept remotely, so an unchanged chunk is not uploaded again on the next run
+    file_id = await uploads.upload(chunk_file)
+    code_interpreter = CodeInterpreterTool(file_ids=[file_id])
+    thread = AzureAIAgentThread(client=client, tool_resources=code_interpreter.resources)
+    try:
         chunk_results = []
-        async for response in agent.invoke(messages=chunk_prompt, thread=thread):
+        async for response in agent.invoke(messages=prompt, thread=thread):
             if response.role != AuthorRole.TOOL:
                 chunk_results.append(str(response))
                 thread = response.thread
-                
-                if len(response.items) > 0:
-                    for item in response.items:
-                        if isinstance(item, AnnotationContent):
-                            response_content = await client.agents.get_file_content(file_id=item.file_id)
-                            content_bytes = bytearray()
-                            async for chunk_content in response_content:
-                                content_bytes.extend(chunk_content)
-                            tab_delimited_text = content_bytes.decode("utf-8")
-                            chunk_results.append(tab_delimited_text)
-        
-        results.extend(chunk_results)
-        
-        # Clean up the chunk file from agent (optional, to manage memory)
+                chunk_results.extend(await read_response_annotations(client, response))
+        return "\n\n".join(chunk_results)
+    finally:
+        # Clean up the thread (optional, to manage storage)
         try:
-            await client.agents.delete_file(file.id)
-        except:
-            pass  # Continue if deletion fails
-    
-    return results
+            await thread.delete()
+        except Exception:
+            pass
+
+async def process_json_chunks(agent, client, uploads: UploadManager, chunk_files: List[str], analysis_prompt: str,
+                              max_concurrency: int = MAX_CONCURRENT_CHUNKS, max_retries: int = CHUNK_RETRIES) -> List[Optional[str]]:
+    """
+    Analyze the chunks concurrently, each in an isolated thread, and return one result per chunk in chunk order.
+    At most max_concurrency analyses run at once; a failed chunk is retried up to max_retries times and its
+    result is None, so it is never stored as an analysis.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(i: int, chunk_file: str) -> Optional[str]:
+        chunk_prompt = f"{analysis_prompt} (Processing chunk {i+1} of {len(chunk_files)})"
+        async with semaphore:
+            for attempt in range(1, max_retries + 2):
+                print(f"Processing chunk {i+1}/{len(chunk_files)}: {os.path.basename(chunk_file)} (attempt {attempt})")
+                try:
+                    return await analyze_chunk(agent, client, uploads, chunk_file, chunk_prompt)
+                except Exception as e:
+                    if attempt > max_retries:
+                        print(f"Analysis of {os.path.basename(chunk_file)} failed: {e}")
+                        return None
+                    print(f"Chunk {i+1} failed ({e}), retrying")
+                    await asyncio.sleep(2 ** attempt)
+
+    # gather keeps the chunk order regardless of completion order
+    return await asyncio.gather(*(run(i, chunk_file) for i, chunk_file in enumerate(chunk_files)))
 
 async def main():
     ai_agent_settings = AzureAIAgentSettings(
@@ -249,22 +150,39 @@ async def main():
         # Strategy 1: For very large files (>5MB), split into chunks
         # if file_size_mb > 5:
         print("Large file detected. Splitting into chunks...")
-        chunk_files = split_json_by_resources(terraform_file_path, chunks_dir, max_resources_per_chunk=5)
         summary_path = os.path.join(chunks_dir, "terraform_summary.json")
-        create_summary_json(terraform_file_path, summary_path)
+        findings_store = FindingsStore(os.path.join(current_dir, "outputs", f"findings_store_{os.path.basename(terraform_file_path)}"))
+        # Common misconfigurations are decided locally; only the remaining resources are chunked for the agent
+        prescan = PrescanResult()
+        with PlanChunker() as chunker:
+            # One pass over the plan feeds both the chunker and the pre-scan
+            chunker.read(terraform_file_path, prescan)
+            prescan.finish()
+            prescan_path = os.path.join(chunks_dir, "local_findings.json")
+            with open(prescan_path, "w", encoding="utf-8") as f:
+                json.dump(prescan.to_dict(), f, indent=2)
+            print(f"Local pre-scan: {len(prescan.findings)} findings, {len(prescan.unresolved)} resources need analysis")
+            chunker.summary.write(summary_path)
+            # Resources covered by a stored analysis that is still valid are not analyzed again
+            resource_hashes = chunker.resource_hashes()
+            print(f"Changes since the last analysis: {findings_store.diff(resource_hashes)}")
+            reused_analyses, reused_addresses = findings_store.reusable(resource_hashes)
+            reused = set(reused_addresses)
+            chunk_files = chunker.write_chunks(
+                chunks_dir, {address for address in prescan.unresolved if address not in reused}
+            )
+            chunk_addresses = chunker.chunk_addresses
         terraform_files = [summary_path] + chunk_files
         # else:
         #     # For smaller files, process normally
         #     terraform_files = [terraform_file_path]
         
         # Create initial agent
-        uploaded_files = []
-        #files = await client.agents.files. (purpose=FilePurpose.AGENTS)
-        for tf_file in terraform_files[:1]:  # Start with summary or original file
-            file = await client.agents.files.upload_and_poll(file_path=tf_file, purpose=FilePurpose.AGENTS)
-            uploaded_files.append(file)
+        # Files whose contents were uploaded by an earlier run are reused instead of uploaded again
+        uploads = UploadManager(client, os.path.join(current_dir, "outputs", ".upload_manifest.json"), purpose=FilePurpose.AGENTS)
+        uploaded_file_ids = await uploads.upload_all(terraform_files[:1])  # Start with summary or original file
  
-        code_interpreter = CodeInterpreterTool(file_ids = [file_info.id for file_info in uploaded_files])
+        code_interpreter = CodeInterpreterTool(file_ids = uploaded_file_ids)
 
         agent_definition = await client.agents.create_agent(
             model=ai_agent_settings.model_deployment_name,
@@ -280,8 +198,10 @@ async def main():
         agent.polling_options.run_polling_timeout = timedelta(minutes=25)
 
         thread: AzureAIAgentThread = None
-        baselines = getAllFiles('baselines')
-        print(f"Available baseline files: {baselines}")
+        # Chunk analyses (new and carried forward) run in their own threads, not in `thread`
+        analyses = []
+        baseline_catalog = BaselineCatalog(baseline_dir)
+        print(f"Available baselines: {', '.join(baseline_catalog.baselines())}")
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         markdown_path = os.path.join(current_dir, "outputs", f"security_evaluation_report_{timestamp}.md")
@@ -289,6 +209,7 @@ async def main():
         with open(markdown_path, "w", encoding="utf-8") as md_file:
             md_file.write("# Security Evaluation Report\n\n")
             md_file.write(f"_Analysis generated on {datetime.now().strftime('%Y-%m-%d at %H:%M:%S')}_\n\n")
+            md_file.write(f"## Local Pre-scan Findings\n\n{prescan.to_markdown()}\n")
             
             try:
                 # Process overview first
@@ -302,17 +223,27 @@ async def main():
                             thread = response.thread
                     
                     # Process detailed chunks
-                    if len(terraform_files) > 1:
+                    if len(terraform_files) > 1 or reused_analyses:
                         md_file.write("## Detailed Security Analysis by Resource Groups\n\n")
                         
                         detailed_prompt = "Analyze the provided JSON chunk for security vulnerabilities and misconfigurations. Focus on the specific resources in this chunk and provide detailed security recommendations."
                         
                         chunk_results = await process_json_chunks(
-                            agent, client, terraform_files[1:], detailed_prompt, thread
+                            agent, client, uploads, terraform_files[1:], detailed_prompt
                         )
+                        # Failed chunks are left out, so their resources are analyzed again on the next run
+                        analyses = reused_analyses + [
+                            {"addresses": addresses, "analysis": result}
+                            for addresses, result in zip(chunk_addresses, chunk_results) if result is not None
+                        ]
+                        failed = [addresses for addresses, result in zip(chunk_addresses, chunk_results) if result is None]
                         
-                        for i, result in enumerate(chunk_results):
-                            md_file.write(f"### Chunk {i+1} Analysis\n\n{result}\n\n")
+                        for i, analysis in enumerate(analyses):
+                            carried = " (unchanged, carried forward)" if i < len(reused_analyses) else ""
+                            md_file.write(f"### Chunk {i+1} Analysis{carried}\n\n{analysis['analysis']}\n\n")
+                        for addresses in failed:
+                            md_file.write(f"### Analysis failed\n\nNot analyzed: {', '.join(addresses)}\n\n")
+                        findings_store.save(resource_hashes, analyses, terraform_file_path)
                 else:
                     # Process single file normally
                     user_inputs = [
@@ -327,57 +258,49 @@ async def main():
                                 print(f"# Agent: {response}")
                                 md_file.write(f"{response}\n\n")
                                 
-                                if len(response.items) > 0:
-                                    for item in response.items:
-                                        if isinstance(item, AnnotationContent):
-                                            response_content = await client.agents.get_file_content(file_id=item.file_id)
-                                            content_bytes = bytearray()
-                                            async for chunk in response_content:
-                                                content_bytes.extend(chunk)
-                                            tab_delimited_text = content_bytes.decode("utf-8")
-                                            print(tab_delimited_text)
+                                for tab_delimited_text in await read_response_annotations(client, response):
+                                    print(tab_delimited_text)
                                 
                                 thread = response.thread
 
-                # Get baseline recommendations
-                baseline_prompt = f"Based on the resources being used, which one of these baseline files should be used for comparison: {baselines}, provide exact names of the files as comma separated values in a single line, don't include anything other than the names in response."
-                print(f"# User: '{baseline_prompt}'")
-                
-                async for response in agent.invoke(messages=baseline_prompt, thread=thread):
-                    if response.role != AuthorRole.TOOL:
-                        print(f"# Agent: {response}")
-                        thread = response.thread
-                        baseline_files_to_compare = str(response).split(",")
-                        
-                        if len(baseline_files_to_compare) > 0:
-                            baseline_uploaded_files = []
-                            for baseline_file in baseline_files_to_compare:
-                                baseline_file_path = os.path.join(baseline_dir, baseline_file.strip())
-                                if os.path.exists(baseline_file_path):
-                                    file = await client.agents.files.upload_and_poll(file_path=baseline_file_path, purpose=FilePurpose.AGENTS)
-                                    baseline_uploaded_files.append(file)
+                # Baselines are chosen from the plan's resource types, and only their applicable controls are uploaded
+                with open(summary_path, "r", encoding="utf-8") as f:
+                    plan_resources = json.load(f)["configuration"]["root_module"]["resources"]
+                selected_baselines = baseline_catalog.select(plan_resources)
+                print(f"Selected baselines: {selected_baselines}")
 
-                            # Update code interpreter with baseline files
-                            if baseline_uploaded_files:
-                                all_file_ids = [file.id for file in uploaded_files] + [file.id for file in baseline_uploaded_files]
-                                code_interpreter = CodeInterpreterTool(file_ids=all_file_ids)
+                # Update code interpreter with the local findings, the chunk analyses and the baseline controls
+                context_files = [prescan_path]
+                if analyses:
+                    analyses_path = os.path.join(chunks_dir, "chunk_analyses.md")
+                    with open(analyses_path, "w", encoding="utf-8") as f:
+                        for i, analysis in enumerate(analyses):
+                            f.write(f"## Chunk {i+1}: {', '.join(analysis['addresses'])}\n\n{analysis['analysis']}\n\n")
+                    context_files.append(analyses_path)
+                if selected_baselines:
+                    context_files.append(baseline_catalog.write_excerpts(
+                        selected_baselines, os.path.join(chunks_dir, "baseline_controls.md")
+                    ))
+                all_file_ids = uploaded_file_ids + await uploads.upload_all(context_files)
+                print(f"Files uploaded: {uploads.uploaded}, reused from earlier runs: {uploads.reused}")
+                code_interpreter = CodeInterpreterTool(file_ids=all_file_ids)
 
-                                # Update the agent with the new code interpreter
-                                agent_definition = await client.agents.update_agent(
-                                    agent_id=agent.id,
-                                    tools=code_interpreter.definitions,
-                                    tool_resources=code_interpreter.resources,
-                                )
+                # Update the agent with the new code interpreter
+                agent_definition = await client.agents.update_agent(
+                    agent_id=agent.id,
+                    tools=code_interpreter.definitions,
+                    tool_resources=code_interpreter.resources,
+                )
 
-                        md_file.write("## Security Implementation Checklist\n\n")
-                        final_prompt = "For each resource separately compare the security measures from your analysis and baseline files and provide a table of security measures that are already present, missing, and need to be implemented. The table should have the following columns: 'Security Measure', 'Present', 'Missing', 'Needs Implementation'. Provide response in markdown format and also include terraform attributes that need to be added for the recommendations.\n\n"
-                        print(f"# User: '{final_prompt}'")
-                            
-                        async for response in agent.invoke(messages=final_prompt, thread=thread):
-                            if response.role != AuthorRole.TOOL:
-                                print(f"# Agent: {response}")
-                                md_file.write(f"{response}\n\n")
-                                thread = response.thread
+                md_file.write("## Security Implementation Checklist\n\n")
+                final_prompt = "For each resource separately compare the security measures from your analysis and the chunk analyses file (if provided), the local pre-scan findings file and the baseline controls file and provide a table of security measures that are already present, missing, and need to be implemented. The table should have the following columns: 'Security Measure', 'Present', 'Missing', 'Needs Implementation'. Provide response in markdown format and also include terraform attributes that need to be added for the recommendations.\n\n"
+                print(f"# User: '{final_prompt}'")
+
+                async for response in agent.invoke(messages=final_prompt, thread=thread):
+                    if response.role != AuthorRole.TOOL:
+                        print(f"# Agent: {response}")
+                        md_file.write(f"{response}\n\n")
+                        thread = response.thread
     
             finally:
                 # Cleanup: Delete the thread and agent
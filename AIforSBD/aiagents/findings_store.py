@@ -0,0 +1,75 @@
+"""
+Findings store for incremental re-analysis of a Terraform plan.
+
+Each run records, per resource address, a canonical hash of the resource's planned
+values and configuration block, together with the agent analyses of the chunks
+that covered it. The next run of the same plan diffs its hashes against the
+store: an analysis is carried forward only if every resource it covered is
+unchanged, analyses touching deleted or changed resources are dropped, and only
+added, changed or no longer covered resources are sent to the agent again.
+"""
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def canonical_hash(*parts: Any) -> str:
+    """ SHA-256 of the parts as canonical JSON (sorted keys, no whitespace). """
+    text = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class PlanDiff:
+    def __init__(self, added: List[str], changed: List[str], unchanged: List[str], deleted: List[str]):
+        self.added = added
+        self.changed = changed
+        self.unchanged = unchanged
+        self.deleted = deleted
+
+    def __str__(self):
+        return (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.unchanged)} unchanged, {len(self.deleted)} deleted")
+
+
+class FindingsStore:
+    """ Resource hashes and chunk analyses of the last run, in one JSON file per plan. """
+
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        self.hashes = {}
+        self.analyses = []
+        if os.path.exists(store_path):
+            with open(store_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.hashes = data.get("hashes", {})
+            self.analyses = data.get("analyses", [])
+
+    def diff(self, hashes: Dict[str, str]) -> PlanDiff:
+        added = [address for address in hashes if address not in self.hashes]
+        changed = [address for address in hashes if address in self.hashes and self.hashes[address] != hashes[address]]
+        unchanged = [address for address in hashes if self.hashes.get(address) == hashes[address]]
+        deleted = [address for address in self.hashes if address not in hashes]
+        return PlanDiff(added, changed, unchanged, deleted)
+
+    def reusable(self, hashes: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Returns the stored analyses whose resources are all unchanged, and the addresses they cover.
+        """
+        reused = []
+        covered = []
+        for analysis in self.analyses:
+            if all(address in hashes and self.hashes.get(address) == hashes[address] for address in analysis["addresses"]):
+                reused.append(analysis)
+                covered.extend(analysis["addresses"])
+        return reused, covered
+
+    def save(self, hashes: Dict[str, str], analyses: List[Dict[str, Any]], plan_path: Optional[str] = None):
+        """ Replaces the store with this run's hashes and analyses (carried forward and new). """
+        self.hashes = hashes
+        self.analyses = analyses
+        os.makedirs(os.path.dirname(self.store_path) or ".", exist_ok=True)
+        temp_path = self.store_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"plan": plan_path, "hashes": hashes, "analyses": analyses}, f, indent=1)
+        os.replace(temp_path, self.store_path)
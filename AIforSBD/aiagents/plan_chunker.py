@@ -0,0 +1,433 @@
+"""
+Streaming, address-aligned chunker for Terraform plan JSON (`terraform show -json`).
+
+The plan is read once with an incremental parser (ijson, listed in requirements.txt;
+falling back to json.load when it is not installed). Planned values and resource changes are spooled to a
+temporary SQLite file keyed by resource address, so memory stays flat on large
+plans. Each chunk then carries, for a group of addresses, the planned values, the
+changes and only the configuration fragments and root variables those resources
+reference. Chunks are cut on a byte budget, which counts those fragments too,
+instead of a fixed resource count.
+The plan summary (resources by address, actions, provider and module counts) is
+built in the same pass.
+"""
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from findings_store import canonical_hash
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - depends on the environment
+    ijson = None
+
+# Roughly 4 characters per token for JSON with the GPT tokenizers
+CHARS_PER_TOKEN = 4
+DEFAULT_MAX_CHUNK_BYTES = 256 * 1024
+
+PLANNED_RESOURCE = re.compile(r"^planned_values\.root_module(?:\.child_modules\.item)*\.resources\.item$")
+MODULE_PREFIX = re.compile(r'module\.([^.\[]+)(?:\[(?:"[^"]*"|[^\]]*)\])?\.')
+INSTANCE_KEY = re.compile(r'\[(?:"[^"]*"|[^\]]*)\]$')
+HEADER_KEYS = ("format_version", "terraform_version")
+
+
+def config_key(address: str) -> Tuple[Tuple[str, ...], str]:
+    """
+    Maps an instance address to its configuration block:
+    'module.a["x"].module.b[0].azurerm_key_vault.this[1]' -> (("a", "b"), "azurerm_key_vault.this").
+    """
+    modules = []
+    position = 0
+    while True:
+        match = MODULE_PREFIX.match(address, position)
+        if not match:
+            break
+        modules.append(match.group(1))
+        position = match.end()
+    return tuple(modules), INSTANCE_KEY.sub("", address[position:])
+
+
+def _module_address(modules: Tuple[str, ...]) -> str:
+    return ".".join(f"module.{name}" for name in modules)
+
+
+def iter_plan_sections(json_file_path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yields ("header", (key, value)), ("variables", dict), ("planned", resource),
+    ("change", resource_change) and ("configuration", dict) in file order.
+    """
+    if ijson is None:
+        with open(json_file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from _iter_loaded_sections(data)
+        return
+
+    builder = None
+    depth = 0
+    section = None
+    with open(json_file_path, "rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                if prefix in HEADER_KEYS and event in ("string", "number"):
+                    yield "header", (prefix, value)
+                    continue
+                section = _section_for(prefix)
+                if section is None or event not in ("start_map", "start_array"):
+                    continue
+                builder = ijson.ObjectBuilder()
+                depth = 0
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                yield section, builder.value
+                builder = None
+
+
+def _section_for(prefix: str) -> Optional[str]:
+    if prefix == "variables":
+        return "variables"
+    if prefix == "configuration":
+        return "configuration"
+    if prefix == "resource_changes.item":
+        return "change"
+    if prefix.startswith("planned_values.") and PLANNED_RESOURCE.match(prefix):
+        return "planned"
+    return None
+
+
+def _iter_loaded_sections(data: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    for key in HEADER_KEYS:
+        if key in data:
+            yield "header", (key, data[key])
+    if "variables" in data:
+        yield "variables", data["variables"]
+    modules = [data.get("planned_values", {}).get("root_module", {})]
+    while modules:
+        module = modules.pop(0)
+        for resource in module.get("resources", []):
+            yield "planned", resource
+        modules.extend(module.get("child_modules", []))
+    for change in data.get("resource_changes", []):
+        yield "change", change
+    if "configuration" in data:
+        yield "configuration", data["configuration"]
+
+
+class ConfigurationIndex:
+    """ Configuration blocks keyed by (module call path, resource address) with the module call expressions. """
+
+    def __init__(self, configuration: Dict[str, Any]):
+        self.provider_config = configuration.get("provider_config", {})
+        self.resources = {}
+        self.module_calls = {}
+        self._fragment_sizes = {}
+        stack = [((), configuration.get("root_module", {}))]
+        while stack:
+            modules, module = stack.pop()
+            for resource in module.get("resources", []):
+                self.resources[(modules, resource.get("address"))] = resource
+            for name, call in module.get("module_calls", {}).items():
+                path = modules + (name,)
+                self.module_calls[path] = {key: value for key, value in call.items() if key != "module"}
+                stack.append((path, call.get("module", {})))
+
+    def fragment_sizes(self, address: str) -> Dict[Tuple[str, ...], int]:
+        """ Serialized size of each configuration fragment a resource adds to a chunk, keyed for deduplication. """
+        sizes = self._fragment_sizes.get(address)
+        if sizes is None:
+            fragments = self.fragments_for([address])
+            sizes = {("resource", block["module_address"], block.get("address")): len(json.dumps(block))
+                     for block in fragments["resources"]}
+            sizes.update({("module", module_address): len(json.dumps({module_address: call}))
+                          for module_address, call in fragments["module_calls"].items()})
+            self._fragment_sizes[address] = sizes
+        return sizes
+
+    def fragments_for(self, addresses: List[str]) -> Dict[str, Any]:
+        """ The configuration a group of resources references: their blocks and the module calls above them. """
+        resources = {}
+        module_calls = {}
+        for address in addresses:
+            modules, resource_address = config_key(address)
+            block = self.resources.get((modules, resource_address))
+            if block is not None and (modules, resource_address) not in resources:
+                resources[(modules, resource_address)] = dict(block, module_address=_module_address(modules))
+            for i in range(1, len(modules) + 1):
+                if modules[:i] in self.module_calls:
+                    module_calls[_module_address(modules[:i])] = self.module_calls[modules[:i]]
+        return {"resources": list(resources.values()), "module_calls": module_calls}
+
+
+def _root_variable_references(fragments: Dict[str, Any]) -> List[str]:
+    """ Names of the root variables (var.x) referenced by root module blocks and top level module calls. """
+    names = set()
+    roots = [block for block in fragments["resources"] if not block["module_address"]]
+    roots += [call for address, call in fragments["module_calls"].items() if address.count("module.") == 1]
+    for block in roots:
+        stack = [block.get("expressions", {}), block.get("count_expression"), block.get("for_each_expression")]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                stack.extend(node.values())
+            elif isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, str) and node.startswith("var."):
+                names.add(node.split(".")[1].split("[")[0])
+    return sorted(names)
+
+
+def change_action(actions: List[str]) -> str:
+    """ Collapses a change's actions list to create, update, delete, replace, read or no-op. """
+    if "create" in actions and "delete" in actions:
+        return "replace"
+    return actions[0] if len(actions) == 1 else "-".join(actions) or "no-op"
+
+
+class PlanSummary:
+    """ High-level view of a plan, indexed by resource address and built one section at a time. """
+
+    def __init__(self):
+        self.header = {}
+        self.variables = {}
+        self.provider_config = {}
+        self.resources = {}
+
+    def add_section(self, section: str, value: Any):
+        if section == "header":
+            self.header[value[0]] = value[1]
+        elif section == "variables":
+            self.variables = value
+        elif section == "configuration":
+            self.provider_config = value.get("provider_config", {})
+        elif section in ("planned", "change"):
+            address = value.get("address")
+            entry = self.resources.get(address)
+            if entry is None:
+                entry = self.resources[address] = {
+                    "address": address,
+                    "type": value.get("type"),
+                    "name": value.get("name"),
+                    "provider": value.get("provider_name"),
+                    "mode": value.get("mode", "managed"),
+                    "module": _module_address(config_key(address)[0]),
+                }
+            if section == "change":
+                entry["action"] = change_action(value.get("change", {}).get("actions", []))
+            if "arm_type" not in entry and str(entry["type"]).startswith("azapi_"):
+                # azapi resources carry the ARM type, e.g. Microsoft.Network/virtualNetworks@2023-11-01
+                body = value.get("values") or (value.get("change") or {}).get("after") or {}
+                if body.get("type"):
+                    entry["arm_type"] = body["type"].split("@")[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        resource_types = {}
+        providers = {}
+        modules = {}
+        actions = {}
+        for entry in self.resources.values():
+            resource_types[entry["type"]] = resource_types.get(entry["type"], 0) + 1
+            providers[entry["provider"]] = providers.get(entry["provider"], 0) + 1
+            module = entry["module"] or "root"
+            modules[module] = modules.get(module, 0) + 1
+            action = entry.get("action", "no-op")
+            actions[action] = actions.get(action, 0) + 1
+        return {
+            "format_version": self.header.get("format_version"),
+            "terraform_version": self.header.get("terraform_version"),
+            "variables": self.variables,
+            "configuration": {
+                "provider_config": self.provider_config,
+                "root_module": {
+                    "resources": list(self.resources.values())
+                }
+            },
+            "summary": {
+                "total_resources": len(self.resources),
+                "resource_types": resource_types,
+                "provider_summary": providers,
+                "module_summary": modules,
+                "actions": actions,
+            }
+        }
+
+    def write(self, output_path: str) -> str:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return output_path
+
+
+def summarize_plan(json_file_path: str, output_path: str) -> str:
+    """ Writes the plan summary without chunking. """
+    summary = PlanSummary()
+    for section, value in iter_plan_sections(json_file_path):
+        summary.add_section(section, value)
+    return summary.write(output_path)
+
+
+class PlanChunker:
+    """ Spools a plan by resource address and writes budget-sized chunk files. """
+
+    def __init__(self, max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES):
+        self.max_chunk_bytes = max_chunk_bytes
+        self.header = {}
+        self.variables = {}
+        self.configuration = ConfigurationIndex({})
+        self.summary = PlanSummary()
+        self.chunk_addresses = []
+        self._tempdir = tempfile.TemporaryDirectory(prefix="plan_chunks_")
+        self._db = sqlite3.connect(os.path.join(self._tempdir.name, "spool.db"))
+        self._db.execute(
+            "CREATE TABLE resources (address TEXT PRIMARY KEY, seq INTEGER, planned TEXT, change TEXT)"
+        )
+        self._seq = 0
+
+    def close(self):
+        self._db.close()
+        self._tempdir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_section(self, section: str, value: Any):
+        self.summary.add_section(section, value)
+        if section == "header":
+            self.header[value[0]] = value[1]
+        elif section == "variables":
+            self.variables = value
+        elif section == "configuration":
+            self.configuration = ConfigurationIndex(value)
+        elif section in ("planned", "change"):
+            self._spool(section, value)
+
+    def _spool(self, column: str, resource: Dict[str, Any]):
+        self._seq += 1
+        self._db.execute(
+            f"INSERT INTO resources (address, seq, {column}) VALUES (?, ?, ?) "
+            f"ON CONFLICT(address) DO UPDATE SET {column} = excluded.{column}",
+            (resource.get("address"), self._seq, json.dumps(resource)),
+        )
+
+    def read(self, json_file_path: str, *consumers: Any):
+        """ Reads the plan in one pass; each consumer's add_section also gets every section. """
+        for section, value in iter_plan_sections(json_file_path):
+            self.add_section(section, value)
+            for consumer in consumers:
+                consumer.add_section(section, value)
+        self._db.commit()
+
+    def resource_hashes(self) -> Dict[str, str]:
+        """ Canonical hash per address of the planned values (or planned change) and the configuration block. """
+        hashes = {}
+        for address, planned_json, change_json in self._db.execute(
+            "SELECT address, planned, change FROM resources ORDER BY seq"
+        ):
+            if planned_json:
+                values = json.loads(planned_json).get("values")
+            else:
+                values = (json.loads(change_json).get("change") or {}).get("after")
+            modules, resource_address = config_key(address)
+            hashes[address] = canonical_hash(values, self.configuration.resources.get((modules, resource_address)))
+        return hashes
+
+    def _groups(self, addresses: Optional[Set[str]] = None) -> List[List[str]]:
+        """
+        Addresses in plan order, grouped so the planned values, changes and configuration fragments
+        of a group fit the budget. Fragments shared by resources of a group (count/for_each instances,
+        module calls) are counted once. With addresses only those resources are included.
+        """
+        groups = []
+        current = []
+        fragments = set()
+        size = 0
+        query = "SELECT address, LENGTH(COALESCE(planned, '')) + LENGTH(COALESCE(change, '')) FROM resources ORDER BY seq"
+        for address, record_size in self._db.execute(query):
+            if addresses is not None and address not in addresses:
+                continue
+            fragment_sizes = self.configuration.fragment_sizes(address)
+            added = record_size + sum(length for key, length in fragment_sizes.items() if key not in fragments)
+            if current and size + added > self.max_chunk_bytes:
+                groups.append(current)
+                current = []
+                fragments = set()
+                size = 0
+                added = record_size + sum(fragment_sizes.values())
+            current.append(address)
+            fragments.update(fragment_sizes)
+            size += added
+        if current:
+            groups.append(current)
+        return groups
+
+    def _chunk(self, addresses: List[str], number: int, total: int) -> Dict[str, Any]:
+        planned = []
+        changes = []
+        for address in addresses:
+            planned_json, change_json = self._db.execute(
+                "SELECT planned, change FROM resources WHERE address = ?", (address,)
+            ).fetchone()
+            if planned_json:
+                planned.append(json.loads(planned_json))
+            if change_json:
+                changes.append(json.loads(change_json))
+
+        fragments = self.configuration.fragments_for(addresses)
+        return {
+            "format_version": self.header.get("format_version"),
+            "terraform_version": self.header.get("terraform_version"),
+            "variables": {
+                name: self.variables[name] for name in _root_variable_references(fragments) if name in self.variables
+            },
+            "configuration": {
+                "provider_config": self.configuration.provider_config,
+                "resources": fragments["resources"],
+                "module_calls": fragments["module_calls"],
+            },
+            "chunk_info": {
+                "chunk_number": number,
+                "total_chunks": total,
+                "addresses": addresses,
+            },
+            "planned_values": {"resources": planned},
+            "resource_changes": changes,
+        }
+
+    def write_chunks(self, output_dir: str, addresses: Optional[Set[str]] = None) -> List[str]:
+        groups = self._groups(addresses)
+        self.chunk_addresses = groups
+        chunk_files = []
+        for i, addresses in enumerate(groups):
+            chunk_filename = f"terraform_chunk_{i+1}_of_{len(groups)}.json"
+            chunk_path = os.path.join(output_dir, chunk_filename)
+            with open(chunk_path, "w", encoding="utf-8") as f:
+                json.dump(self._chunk(addresses, i + 1, len(groups)), f, indent=1)
+            chunk_files.append(chunk_path)
+            print(f"Created chunk {i+1}/{len(groups)}: {chunk_filename} ({len(addresses)} resources)")
+        return chunk_files
+
+
+def chunk_plan(json_file_path: str, output_dir: str, max_chunk_bytes: Optional[int] = None,
+               max_chunk_tokens: Optional[int] = None, summary_path: Optional[str] = None,
+               addresses: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Splits a Terraform plan into address-aligned chunk files and returns their paths.
+    The budget is max_chunk_bytes, or max_chunk_tokens converted at CHARS_PER_TOKEN.
+    With summary_path the plan summary from the same pass is written there too.
+    With addresses only those resources are chunked.
+    """
+    if max_chunk_bytes is None:
+        max_chunk_bytes = max_chunk_tokens * CHARS_PER_TOKEN if max_chunk_tokens else DEFAULT_MAX_CHUNK_BYTES
+    with PlanChunker(max_chunk_bytes) as chunker:
+        chunker.read(json_file_path)
+        if summary_path:
+            chunker.summary.write(summary_path)
+        return chunker.write_chunks(output_dir, None if addresses is None else set(addresses))
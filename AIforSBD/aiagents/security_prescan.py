@@ -0,0 +1,320 @@
+"""
+Deterministic local security pre-scan of a Terraform plan.
+
+Each planned resource change is checked against a declarative rule set for its
+type (public network access, TLS versions, soft delete and purge protection,
+open NSG rules, private endpoints, ...). A check passes, fails, or is unknown
+when the value is only known after apply. Failed checks become findings with
+the Terraform attribute to set. Only resources with unknown checks, or whose
+type has no rules, are left for the agent. The scan consumes plan sections one
+at a time, so it can share the chunker's single streaming pass over the plan.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from plan_chunker import iter_plan_sections
+
+OPEN_SOURCES = ["*", "0.0.0.0/0", "0.0.0.0", "Internet", "Any", "any"]
+
+NSG_OPEN_INBOUND = {
+    "id": "NSG-OPEN-INBOUND", "severity": "high", "title": "No inbound allow rule from any source",
+    "when": {"direction": "Inbound", "access": "Allow"},
+    "attribute": ["source_address_prefix", "source_address_prefixes"], "not_in": OPEN_SOURCES,
+    "fix": "source_address_prefix = \"<specific CIDR or service tag>\"",
+}
+
+# Rules per resource type; azapi resources are keyed as "azapi_resource:<ARM type>".
+# A rule checks "attribute" (dotted path, blocks take their first element, a list
+# gives alternatives) with one of equals / in / not_in / min / present. "when"
+# limits it to matching resources, "each" applies it to every element of a list.
+SECURITY_RULES = {
+    "azurerm_key_vault": [
+        {"id": "KV-PUBLIC-ACCESS", "severity": "high", "title": "Public network access disabled",
+         "attribute": "public_network_access_enabled", "equals": False,
+         "fix": "public_network_access_enabled = false"},
+        {"id": "KV-PURGE-PROTECTION", "severity": "medium", "title": "Purge protection enabled",
+         "attribute": "purge_protection_enabled", "equals": True,
+         "fix": "purge_protection_enabled = true"},
+        {"id": "KV-SOFT-DELETE", "severity": "medium", "title": "Soft delete retention of at least 7 days",
+         "attribute": "soft_delete_retention_days", "min": 7,
+         "fix": "soft_delete_retention_days = 90"},
+        {"id": "KV-RBAC", "severity": "medium", "title": "RBAC authorization enabled",
+         "attribute": "enable_rbac_authorization", "equals": True,
+         "fix": "enable_rbac_authorization = true"},
+        {"id": "KV-FIREWALL", "severity": "high", "title": "Network ACL default action is Deny",
+         "attribute": "network_acls.default_action", "equals": "Deny",
+         "fix": "network_acls { default_action = \"Deny\" bypass = \"AzureServices\" }"},
+    ],
+    "azurerm_storage_account": [
+        {"id": "ST-PUBLIC-ACCESS", "severity": "high", "title": "Public network access disabled",
+         "attribute": "public_network_access_enabled", "equals": False,
+         "fix": "public_network_access_enabled = false"},
+        {"id": "ST-MIN-TLS", "severity": "high", "title": "Minimum TLS version 1.2",
+         "attribute": "min_tls_version", "equals": "TLS1_2",
+         "fix": "min_tls_version = \"TLS1_2\""},
+        {"id": "ST-HTTPS-ONLY", "severity": "high", "title": "HTTPS traffic only",
+         "attribute": ["https_traffic_only_enabled", "enable_https_traffic_only"], "equals": True,
+         "fix": "https_traffic_only_enabled = true"},
+        {"id": "ST-PUBLIC-BLOBS", "severity": "high", "title": "Anonymous blob access disabled",
+         "attribute": "allow_nested_items_to_be_public", "equals": False,
+         "fix": "allow_nested_items_to_be_public = false"},
+        {"id": "ST-SHARED-KEY", "severity": "medium", "title": "Shared key authorization disabled",
+         "attribute": "shared_access_key_enabled", "equals": False,
+         "fix": "shared_access_key_enabled = false"},
+        {"id": "ST-INFRA-ENCRYPTION", "severity": "low", "title": "Infrastructure encryption enabled",
+         "attribute": "infrastructure_encryption_enabled", "equals": True,
+         "fix": "infrastructure_encryption_enabled = true"},
+        {"id": "ST-FIREWALL", "severity": "high", "title": "Network rules default action is Deny",
+         "attribute": "network_rules.default_action", "equals": "Deny",
+         "fix": "network_rules { default_action = \"Deny\" }"},
+        {"id": "ST-BLOB-SOFT-DELETE", "severity": "medium", "title": "Blob soft delete of at least 7 days",
+         "attribute": "blob_properties.delete_retention_policy.days", "min": 7,
+         "fix": "blob_properties { delete_retention_policy { days = 7 } }"},
+    ],
+    "azurerm_mssql_server": [
+        {"id": "SQL-PUBLIC-ACCESS", "severity": "high", "title": "Public network access disabled",
+         "attribute": "public_network_access_enabled", "equals": False,
+         "fix": "public_network_access_enabled = false"},
+        {"id": "SQL-MIN-TLS", "severity": "high", "title": "Minimum TLS version 1.2",
+         "attribute": "minimum_tls_version", "equals": "1.2",
+         "fix": "minimum_tls_version = \"1.2\""},
+    ],
+    "azurerm_linux_web_app": [
+        {"id": "APP-HTTPS-ONLY", "severity": "high", "title": "HTTPS only",
+         "attribute": "https_only", "equals": True, "fix": "https_only = true"},
+        {"id": "APP-MIN-TLS", "severity": "high", "title": "Minimum TLS version 1.2",
+         "attribute": "site_config.minimum_tls_version", "in": ["1.2", "1.3"],
+         "fix": "site_config { minimum_tls_version = \"1.2\" }"},
+        {"id": "APP-PUBLIC-ACCESS", "severity": "medium", "title": "Public network access disabled",
+         "attribute": "public_network_access_enabled", "equals": False,
+         "fix": "public_network_access_enabled = false"},
+    ],
+    "azurerm_network_security_rule": [NSG_OPEN_INBOUND],
+    "azurerm_network_security_group": [dict(NSG_OPEN_INBOUND, each="security_rule")],
+    "azurerm_public_ip": [
+        {"id": "PIP-STANDARD-SKU", "severity": "low", "title": "Standard SKU (secure by default)",
+         "attribute": "sku", "equals": "Standard", "fix": "sku = \"Standard\""},
+    ],
+    "azapi_resource:Microsoft.Network/virtualNetworks/subnets": [
+        {"id": "SUBNET-NSG", "severity": "high", "title": "Subnet has a network security group",
+         "attribute": "body.properties.networkSecurityGroup.id", "present": True,
+         "fix": "body.properties.networkSecurityGroup = { id = <NSG id> }"},
+        {"id": "SUBNET-DEFAULT-OUTBOUND", "severity": "medium", "title": "Default outbound access disabled",
+         "attribute": "body.properties.defaultOutboundAccess", "equals": False,
+         "fix": "body.properties.defaultOutboundAccess = false"},
+    ],
+    "azapi_resource:Microsoft.KeyVault/vaults": [
+        {"id": "KV-PUBLIC-ACCESS", "severity": "high", "title": "Public network access disabled",
+         "attribute": "body.properties.publicNetworkAccess", "equals": "Disabled",
+         "fix": "body.properties.publicNetworkAccess = \"Disabled\""},
+    ],
+    # No settings to check, and nothing for the agent to analyze either
+    "azurerm_resource_group": [],
+    "azapi_resource:Microsoft.Resources/resourceGroups": [],
+    "azapi_resource:Microsoft.Resources/deployments": [],
+    "azapi_resource:Microsoft.Storage/storageAccounts": [
+        {"id": "ST-PUBLIC-ACCESS", "severity": "high", "title": "Public network access disabled",
+         "attribute": "body.properties.publicNetworkAccess", "equals": "Disabled",
+         "fix": "body.properties.publicNetworkAccess = \"Disabled\""},
+        {"id": "ST-MIN-TLS", "severity": "high", "title": "Minimum TLS version 1.2",
+         "attribute": "body.properties.minimumTlsVersion", "equals": "TLS1_2",
+         "fix": "body.properties.minimumTlsVersion = \"TLS1_2\""},
+    ],
+}
+
+# Types that should only be reachable through a private endpoint
+PRIVATE_ENDPOINT_TYPES = (
+    "azurerm_key_vault", "azurerm_storage_account", "azurerm_mssql_server", "azurerm_cosmosdb_account",
+    "azurerm_container_registry", "azurerm_linux_web_app", "azurerm_windows_web_app",
+)
+PRIVATE_ENDPOINT_RESOURCES = ("azurerm_private_endpoint", "azapi_resource:Microsoft.Network/privateEndpoints")
+
+MISSING = object()
+UNKNOWN = object()
+
+
+def rule_key(change: Dict[str, Any]) -> str:
+    after = (change.get("change") or {}).get("after") or {}
+    if change.get("type") == "azapi_resource" and isinstance(after.get("type"), str):
+        return "azapi_resource:" + after["type"].split("@")[0]
+    return change.get("type", "")
+
+
+def resolve(values: Any, unknown: Any, path: str) -> Any:
+    """ The value at a dotted path, UNKNOWN if it is only known after apply, or MISSING. """
+    for part in path.split("."):
+        # Nested blocks are lists in the plan; the checked blocks have at most one element
+        if isinstance(values, list):
+            values = values[0] if values else None
+        if isinstance(unknown, list):
+            unknown = unknown[0] if unknown else None
+        unknown = unknown.get(part) if isinstance(unknown, dict) else None
+        if unknown is True:
+            return UNKNOWN
+        values = values.get(part) if isinstance(values, dict) else None
+        if values is None:
+            return MISSING
+    return values
+
+
+def check(rule: Dict[str, Any], values: Any, unknown: Any) -> Tuple[str, Any]:
+    """ Returns ("pass" | "fail" | "unknown", actual value) for one rule against one resource. """
+    for attribute, expected in rule.get("when", {}).items():
+        actual = resolve(values, unknown, attribute)
+        if actual is UNKNOWN:
+            return "unknown", None
+        if actual != expected:
+            return "pass", None
+
+    attributes = rule["attribute"] if isinstance(rule["attribute"], list) else [rule["attribute"]]
+    # Empty strings and lists are how the plan shows an unset alternative (source_address_prefix = "")
+    actuals = [MISSING if actual in ("", []) else actual
+               for actual in (resolve(values, unknown, attribute) for attribute in attributes)]
+    if "present" in rule:
+        if any(actual is UNKNOWN or actual is not MISSING for actual in actuals):
+            return "pass", None
+        return "fail", None
+    if any(actual is UNKNOWN for actual in actuals):
+        return "unknown", None
+
+    if "not_in" in rule:
+        # Every alternative is checked: any of them may hold the offending value
+        for actual in actuals:
+            items = actual if isinstance(actual, list) else [actual]
+            if any(item in rule["not_in"] for item in items):
+                return "fail", actual
+        return "pass", next((actual for actual in actuals if actual is not MISSING), None)
+    actual = next((actual for actual in actuals if actual is not MISSING), MISSING)
+    if actual is MISSING:
+        return "fail", None
+    if "equals" in rule:
+        return ("pass" if actual == rule["equals"] else "fail"), actual
+    if "in" in rule:
+        return ("pass" if actual in rule["in"] else "fail"), actual
+    if "min" in rule:
+        return ("pass" if isinstance(actual, (int, float)) and actual >= rule["min"] else "fail"), actual
+    return "unknown", actual
+
+
+PRIVATE_ENDPOINT_RULE = {
+    "id": "PRIVATE-ENDPOINT", "severity": "high", "title": "Reachable through a private endpoint",
+    "fix": "resource \"azurerm_private_endpoint\" { private_service_connection { private_connection_resource_id = <id> } }",
+}
+
+
+class PrescanResult:
+    """ Collects the checks of a plan as its sections are added; finish() once the whole plan has been read. """
+
+    def __init__(self, rules: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.rules = SECURITY_RULES if rules is None else rules
+        self.findings = []
+        self.passed = 0
+        self.unresolved = []
+        self.checked = 0
+        self._needs_private_endpoint = []
+        self.has_private_endpoints = False
+
+    def add_finding(self, change: Dict[str, Any], rule: Dict[str, Any], status: str, actual: Any = None):
+        self.findings.append({
+            "address": change.get("address"),
+            "type": change.get("type"),
+            "rule": rule["id"],
+            "severity": rule["severity"],
+            "title": rule["title"],
+            "status": status,
+            "actual": actual,
+            "fix": rule["fix"],
+        })
+
+    def add_section(self, section: str, change: Any):
+        """ Checks a resource change; other plan sections are ignored. """
+        if section != "change" or change.get("mode", "managed") != "managed":
+            return
+        body = change.get("change") or {}
+        # Unchanged resources are part of the deployed state and are checked like creates and updates
+        if body.get("actions") in (["delete"], ["read"]):
+            return
+        key = rule_key(change)
+        if key in PRIVATE_ENDPOINT_RESOURCES:
+            self.has_private_endpoints = True
+        if change.get("type") in PRIVATE_ENDPOINT_TYPES:
+            self._needs_private_endpoint.append(change)
+        self.checked += 1
+
+        resource_rules = self.rules.get(key)
+        if resource_rules is None:
+            # Nothing to decide locally
+            self.unresolved.append(change.get("address"))
+            return
+        after = body.get("after") or {}
+        after_unknown = body.get("after_unknown") or {}
+        unresolved = False
+        for rule in resource_rules:
+            if "each" in rule:
+                items = after.get(rule["each"]) or []
+                item_unknown = after_unknown.get(rule["each"])
+                if item_unknown is True:
+                    statuses = [("unknown", None)]
+                else:
+                    unknowns = item_unknown if isinstance(item_unknown, list) else []
+                    statuses = [
+                        check(rule, item, unknowns[i] if i < len(unknowns) else None)
+                        for i, item in enumerate(items)
+                    ]
+            else:
+                statuses = [check(rule, after, after_unknown)]
+            for status, actual in statuses:
+                if status == "pass":
+                    self.passed += 1
+                elif status == "fail":
+                    self.add_finding(change, rule, status, actual)
+                else:
+                    unresolved = True
+        if unresolved:
+            self.unresolved.append(change.get("address"))
+
+    def finish(self) -> "PrescanResult":
+        """ Decides the private endpoint checks, which need the whole plan. """
+        # Endpoints created elsewhere cannot be seen in the plan, so a missing one is left to the agent
+        for change in self._needs_private_endpoint:
+            if self.has_private_endpoints:
+                self.passed += 1
+            else:
+                self.add_finding(change, PRIVATE_ENDPOINT_RULE, "unknown")
+                if change.get("address") not in self.unresolved:
+                    self.unresolved.append(change.get("address"))
+        self._needs_private_endpoint = []
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "resources_checked": self.checked,
+            "checks_passed": self.passed,
+            "findings": self.findings,
+            "unresolved_resources": self.unresolved,
+        }
+
+    def to_markdown(self) -> str:
+        failed = [finding for finding in self.findings if finding["status"] == "fail"]
+        lines = [
+            f"{self.checked} resources checked locally: {self.passed} checks passed, {len(failed)} failed, "
+            f"{len(self.unresolved)} resources left for detailed analysis.",
+            "",
+            "| Resource | Check | Severity | Actual | Terraform attribute to set |",
+            "|---|---|---|---|---|",
+        ]
+        for finding in failed:
+            actual = "not set" if finding["actual"] is None else json.dumps(finding["actual"])
+            lines.append(
+                f"| `{finding['address']}` | {finding['title']} ({finding['rule']}) | {finding['severity']} | "
+                f"{actual} | `{finding['fix']}` |"
+            )
+        return "\n".join(lines) + "\n"
+
+
+def scan_plan(json_file_path: str, rules: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> PrescanResult:
+    """ Checks every resource a plan keeps (created, updated or unchanged) against the rule set in one streaming pass. """
+    result = PrescanResult(rules)
+    for section, value in iter_plan_sections(json_file_path):
+        result.add_section(section, value)
+    return result.finish()
@@ -0,0 +1,55 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plan_chunker
+from plan_chunker import PlanChunker, iter_plan_sections
+from security_prescan import PrescanResult
+
+PLAN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "plan.json")
+
+
+def _by_section(sections):
+    return sorted((section, json.dumps(value, sort_keys=True)) for section, value in sections)
+
+
+def test_streaming_sections_match_a_full_load():
+    assert plan_chunker.ijson is not None, "the streaming parser is a requirement"
+    streamed = list(iter_plan_sections(PLAN))
+    with open(PLAN, "r", encoding="utf-8") as f:
+        loaded = list(plan_chunker._iter_loaded_sections(json.load(f)))
+
+    assert _by_section(streamed) == _by_section(loaded)
+    assert [section for section, _ in streamed].count("planned") == 3
+    assert [section for section, _ in streamed].count("change") == 3
+
+
+def test_one_pass_feeds_chunker_and_prescan(tmp_path):
+    prescan = PrescanResult()
+    with PlanChunker() as chunker:
+        chunker.read(PLAN, prescan)
+        prescan.finish()
+        chunk_files = chunker.write_chunks(str(tmp_path))
+
+    assert len(chunk_files) == 1
+    assert prescan.checked == 3
+    assert {finding["rule"] for finding in prescan.findings} >= {"ST-MIN-TLS", "ST-PUBLIC-ACCESS"}
+
+
+def test_chunks_fit_the_budget_including_configuration(tmp_path):
+    budget = 2340
+    with PlanChunker(budget) as chunker:
+        chunker.read(PLAN)
+        chunk_files = chunker.write_chunks(str(tmp_path))
+
+    # The storage instances share one configuration block, which is counted once
+    assert [len(addresses) for addresses in chunker.chunk_addresses] == [1, 2]
+    for path in chunk_files:
+        with open(path, "r", encoding="utf-8") as f:
+            chunk = json.load(f)
+        if len(chunk["chunk_info"]["addresses"]) > 1:
+            content = chunk["planned_values"]["resources"] + chunk["resource_changes"] + chunk["configuration"]["resources"]
+            content += [{address: call} for address, call in chunk["configuration"]["module_calls"].items()]
+            assert sum(len(json.dumps(part)) for part in content) <= budget
@@ -0,0 +1,71 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from security_prescan import NSG_OPEN_INBOUND, check, scan_plan
+
+INBOUND_RULE = {"direction": "Inbound", "access": "Allow"}
+
+
+def test_open_prefix_list_fails_when_single_prefix_is_empty():
+    rule = dict(INBOUND_RULE, source_address_prefix="", source_address_prefixes=["*"])
+
+    assert check(NSG_OPEN_INBOUND, rule, {}) == ("fail", ["*"])
+
+
+def test_specific_prefixes_pass():
+    rule = dict(INBOUND_RULE, source_address_prefix="", source_address_prefixes=["10.0.0.0/24"])
+
+    assert check(NSG_OPEN_INBOUND, rule, {}) == ("pass", ["10.0.0.0/24"])
+
+
+def test_nsg_with_open_inline_rule_is_a_finding(tmp_path):
+    plan = {
+        "format_version": "1.2",
+        "resource_changes": [{
+            "address": "azurerm_network_security_group.web",
+            "mode": "managed",
+            "type": "azurerm_network_security_group",
+            "change": {
+                "actions": ["create"],
+                "after": {"security_rule": [
+                    dict(INBOUND_RULE, source_address_prefix="10.0.0.0/24", source_address_prefixes=[]),
+                    dict(INBOUND_RULE, source_address_prefix="", source_address_prefixes=["0.0.0.0/0"]),
+                ]},
+                "after_unknown": {"security_rule": [{}, {}]},
+            },
+        }],
+    }
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(plan), encoding="utf-8")
+
+    result = scan_plan(str(path))
+
+    assert result.passed == 1
+    assert [(finding["rule"], finding["actual"]) for finding in result.findings] == [
+        ("NSG-OPEN-INBOUND", ["0.0.0.0/0"])
+    ]
+
+
+def test_unchanged_resources_are_checked(tmp_path):
+    def change(address, resource_type, actions, after):
+        return {"address": address, "mode": "managed", "type": resource_type,
+                "change": {"actions": actions, "after": after, "after_unknown": {}}}
+
+    plan = {"resource_changes": [
+        change("azurerm_mssql_server.db", "azurerm_mssql_server", ["no-op"],
+               {"public_network_access_enabled": True, "minimum_tls_version": "1.2"}),
+        change("azurerm_redis_cache.cache", "azurerm_redis_cache", ["no-op"], {"minimum_tls_version": "1.0"}),
+        change("azurerm_key_vault.old", "azurerm_key_vault", ["delete"], None),
+    ]}
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps(plan), encoding="utf-8")
+
+    result = scan_plan(str(path))
+
+    assert result.checked == 2
+    assert [finding["rule"] for finding in result.findings if finding["status"] == "fail"] == ["SQL-PUBLIC-ACCESS"]
+    assert "azurerm_redis_cache.cache" in result.unresolved
+    assert "azurerm_key_vault.old" not in result.unresolved
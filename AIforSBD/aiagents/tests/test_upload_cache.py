@@ -0,0 +1,85 @@
+import asyncio
+import itertools
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from upload_cache import UploadManager
+
+PURPOSE = "assistants"
+
+
+@dataclass
+class RemoteFile:
+    id: str
+    status: Optional[str]
+
+
+class FakeFiles:
+    def __init__(self):
+        self.files = {}
+        self.uploads = 0
+        self._ids = itertools.count(1)
+
+    async def upload_and_poll(self, file_path, purpose):
+        self.uploads += 1
+        await asyncio.sleep(0)
+        remote = RemoteFile(f"assistant-{next(self._ids)}", "processed")
+        self.files[remote.id] = remote
+        return remote
+
+    async def get(self, file_id):
+        if file_id not in self.files:
+            raise LookupError(file_id)
+        return self.files[file_id]
+
+
+class FakeClient:
+    def __init__(self):
+        self.agents = type("Agents", (), {})()
+        self.agents.files = FakeFiles()
+
+
+def _write_files(folder, count):
+    paths = []
+    for i in range(count):
+        path = folder / f"chunk_{i}.json"
+        path.write_text(f'{{"chunk": {i}}}', encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def test_equal_contents_are_uploaded_once_and_reused(tmp_path):
+    client = FakeClient()
+    paths = _write_files(tmp_path, 3)
+    duplicate = tmp_path / "copy.json"
+    duplicate.write_text('{"chunk": 0}', encoding="utf-8")
+    manifest = str(tmp_path / "outputs" / ".upload_manifest.json")
+
+    first = asyncio.run(UploadManager(client, manifest, purpose=PURPOSE).upload_all(paths + [str(duplicate)]))
+    manager = UploadManager(client, manifest, purpose=PURPOSE)
+    second = asyncio.run(manager.upload_all(paths))
+
+    assert client.agents.files.uploads == 3
+    assert first[-1] == first[0]
+    assert second == first[:-1] and manager.reused == 3
+
+
+def test_deleted_or_unprocessed_files_are_uploaded_again(tmp_path):
+    client = FakeClient()
+    paths = _write_files(tmp_path, 4)
+    manifest = str(tmp_path / ".upload_manifest.json")
+    first = asyncio.run(UploadManager(client, manifest, purpose=PURPOSE).upload_all(paths))
+
+    del client.agents.files.files[first[0]]
+    client.agents.files.files[first[1]].status = "error"
+    client.agents.files.files[first[2]].status = None
+    manager = UploadManager(client, manifest, purpose=PURPOSE)
+    second = asyncio.run(manager.upload_all(paths))
+
+    assert manager.uploaded == 3
+    assert second[3] == first[3]
+    assert all(client.agents.files.files[file_id].status == "processed" for file_id in second)
@@ -0,0 +1,96 @@
+"""
+Content-hash upload cache for Azure AI Agents files.
+
+Files are identified by the SHA-256 of their contents. A local manifest maps each
+hash to the remote file id; before reusing an id the service is asked whether the
+file still exists and is processed. Only missing files are uploaded, concurrently
+up to a limit. The client only needs `agents.files.upload_and_poll` and
+`agents.files.get`, so a local fake can stand in for tests.
+"""
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+MAX_CONCURRENT_UPLOADS = 4
+# Only fully processed files can be attached to an agent; a missing status is not proof of that
+VALID_STATUSES = ("processed",)
+
+
+def content_hash(file_path: str) -> str:
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class UploadManager:
+    """ Uploads files once per content hash and remembers their remote ids. """
+
+    def __init__(self, client, manifest_path: str, max_concurrency: int = MAX_CONCURRENT_UPLOADS,
+                 purpose: Any = None, validate: bool = True):
+        if purpose is None:
+            from azure.ai.agents.models import FilePurpose
+            purpose = FilePurpose.AGENTS
+        self.client = client
+        self.manifest_path = manifest_path
+        self.purpose = purpose
+        self.validate = validate
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self.uploaded = 0
+        self.reused = 0
+
+    async def _is_valid(self, file_id: str) -> bool:
+        try:
+            remote = await self.client.agents.files.get(file_id)
+        except Exception:
+            return False
+        return getattr(remote, "status", None) in VALID_STATUSES
+
+    async def upload(self, file_path: str) -> str:
+        """ Returns the remote id of the file, uploading it only if no valid upload of the same content exists. """
+        digest = content_hash(file_path)
+        lock = self._locks.setdefault(digest, asyncio.Lock())
+        async with lock, self._semaphore:
+            entry = self.manifest.get(digest)
+            if entry and (not self.validate or await self._is_valid(entry["file_id"])):
+                self.reused += 1
+                return entry["file_id"]
+            remote = await self.client.agents.files.upload_and_poll(file_path=file_path, purpose=self.purpose)
+            self.manifest[digest] = {
+                "file_id": remote.id,
+                "filename": os.path.basename(file_path),
+                "size": os.path.getsize(file_path),
+                "uploaded_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.uploaded += 1
+            self._save()
+            return remote.id
+
+    async def upload_all(self, file_paths: List[str]) -> List[str]:
+        """ Uploads the files concurrently and returns their ids in the same order. """
+        return list(await asyncio.gather(*(self.upload(file_path) for file_path in file_paths)))
+
+    def forget(self, file_id: str) -> Optional[str]:
+        """ Drops a file id from the manifest (e.g. after deleting the remote file). """
+        for digest, entry in list(self.manifest.items()):
+            if entry["file_id"] == file_id:
+                del self.manifest[digest]
+                self._save()
+                return digest
+        return None
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(temp_path, self.manifest_path)
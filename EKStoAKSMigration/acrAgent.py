@@ -1,5 +1,4 @@
 import shutil
-import subprocess
 
 import semantic_kernel as sk
 from semantic_kernel.agents import ChatCompletionAgent
@@ -10,7 +9,7 @@ from semantic_kernel.connectors.ai.open_ai import (
 )
 from semantic_kernel.functions import kernel_function
 
-from utilities import write_to_csv
+from acrImportScheduler import ACRImportScheduler
 
 
 class ACRPlugin:
@@ -18,7 +17,7 @@ class ACRPlugin:
         name="import_image_to_acr",
         description="Import one or more Docker images into Azure Container Registry (ACR) from any OCI-compliant registry.",
     )
-    def import_image_to_acr(self, acr_name: str, source_images: list[str]) -> str:
+    async def import_image_to_acr(self, acr_name: str, source_images: list[str]) -> str:
         # if len(source_images) != len(target_images):
         #     return "The number of source and target images must be equal."
 
@@ -26,39 +25,21 @@ class ACRPlugin:
         if not az_path:
             return "Azure CLI is not installed or not in PATH."
 
-        results = []
+        # Images are imported concurrently; already imported tags are skipped
+        scheduler = ACRImportScheduler(acr_name, az_path)
+        results = await scheduler.import_images(source_images)
 
-        # for src, tgt in zip(source_images, target_images):
-        for src in source_images:
-            tgt = src.split("/")[-1]  # Use the image name as the target image name
-            try:
-                command = [
-                    az_path,
-                    "acr",
-                    "import",
-                    "--name",
-                    acr_name,
-                    "--source",
-                    src,
-                    "--image",
-                    tgt,
-                ]
-                result = subprocess.run(command, capture_output=True, text=True)
-                if result.returncode == 0:
-                    results.append(f"Imported `{src}` as `{tgt}`")
-                    write_to_csv(".\\Data\\ACRImages.csv", [[acr_name, tgt]])
-                else:
-                    results.append(f"Failed to import `{src}`: {result.stderr.strip()}")
-            except Exception as e:
-                results.append(f"Exception for `{src}`: {str(e)}")
+        counts = {}
+        for result in results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+        return "\n".join([f"ACR import finished: {summary}"] + [result["message"] for result in results])
 
-        return "\n".join(results)
 
-
-def create_acr_agent(instructions: str, deployment_name: str, endpoint: str, api_key: str):
+def create_acr_agent(instructions: str, deployment_name: str, endpoint: str, api_key: str, service=None):
     kernel = sk.Kernel()
     kernel.add_service(
-        AzureChatCompletion(
+        service or AzureChatCompletion(
             service_id="default",
             deployment_name=deployment_name,
             endpoint=endpoint,
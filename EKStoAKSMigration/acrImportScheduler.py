@@ -0,0 +1,148 @@
+import asyncio
+import os
+
+from imageRegistry import get_image_index
+
+MAX_CONCURRENT_IMPORTS = int(os.environ.get("ACR_IMPORT_CONCURRENCY", "8"))
+MAX_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 2.0
+# Imported images are recorded in ACRImages.csv in batches of this size
+RECORD_BATCH_SIZE = 25
+
+# stderr fragments of `az acr import` failures worth retrying
+TRANSIENT_ERRORS = (
+    "timed out",
+    "timeout",
+    "toomanyrequests",
+    "429",
+    "500",
+    "502",
+    "503",
+    "504",
+    "connection reset",
+    "connection aborted",
+    "temporarily unavailable",
+    "service unavailable",
+)
+
+
+class SubprocessRunner:
+    """ Runs commands with asyncio subprocesses. Replace with a fake to test without the Azure CLI. """
+
+    async def run(self, command):
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
+def is_transient_error(stderr):
+    message = stderr.lower()
+    return any(fragment in message for fragment in TRANSIENT_ERRORS)
+
+
+class ACRImportScheduler:
+    """
+    Imports images into an ACR concurrently.
+    Source images are de-duplicated, tags already recorded in ACRImages.csv are skipped, sources that
+    map to a target another source already claimed are reported as conflicts,
+    transient failures are retried with backoff and successes are recorded in the shared image index.
+    """
+
+    def __init__(self, acr_name, az_path, runner=None, max_concurrency=MAX_CONCURRENT_IMPORTS,
+                 max_retries=MAX_RETRIES, backoff_seconds=RETRY_BACKOFF_SECONDS, image_index=None):
+        self.acr_name = acr_name
+        self.az_path = az_path
+        self.runner = runner or SubprocessRunner()
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.image_index = image_index or get_image_index()
+
+    def plan(self, source_images):
+        """
+        Returns (to_import, skipped, conflicts): a de-duplicated list of (source, target) pairs, the sources
+        already in the ACR, and (source, target, winning source) for sources whose target an earlier,
+        different source already claimed.
+        """
+        to_import = []
+        skipped = []
+        conflicts = []
+        target_sources = {}
+        for src in source_images:
+            src = src.strip()
+            if not src:
+                continue
+            tgt = src.split("/")[-1]  # Use the image name as the target image name
+            if tgt in target_sources:
+                if target_sources[tgt] != src:
+                    conflicts.append((src, tgt, target_sources[tgt]))
+                continue
+            target_sources[tgt] = src
+            if self.image_index.contains(tgt, self.acr_name):
+                skipped.append(src)
+            else:
+                to_import.append((src, tgt))
+        return to_import, skipped, conflicts
+
+    async def _import_one(self, src, tgt, semaphore):
+        command = [self.az_path, "acr", "import", "--name", self.acr_name, "--source", src, "--image", tgt]
+        attempt = 0
+        async with semaphore:
+            while True:
+                attempt += 1
+                try:
+                    returncode, _, stderr = await self.runner.run(command)
+                except Exception as e:
+                    returncode, stderr = None, str(e)
+
+                if returncode == 0:
+                    return {"source": src, "target": tgt, "status": "imported", "attempts": attempt,
+                            "message": f"Imported `{src}` as `{tgt}`"}
+                if "already exists" in stderr.lower():
+                    return {"source": src, "target": tgt, "status": "imported", "attempts": attempt,
+                            "message": f"`{tgt}` already exists in {self.acr_name}"}
+                if attempt > self.max_retries or (returncode is not None and not is_transient_error(stderr)):
+                    return {"source": src, "target": tgt, "status": "failed", "attempts": attempt,
+                            "message": f"Failed to import `{src}`: {stderr.strip()}"}
+                await asyncio.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+
+    async def stream_imports(self, source_images):
+        """ Yields one result dict per image as soon as it is skipped, imported or has failed. """
+        to_import, skipped, conflicts = self.plan(source_images)
+        for src in skipped:
+            yield {"source": src, "target": src.split("/")[-1], "status": "skipped", "attempts": 0,
+                   "message": f"Skipped `{src}`, already in {self.acr_name}"}
+        for src, tgt, winner in conflicts:
+            yield {"source": src, "target": tgt, "status": "conflict", "attempts": 0,
+                   "message": f"Not imported `{src}`: `{tgt}` is imported from `{winner}`"}
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.create_task(self._import_one(src, tgt, semaphore)) for src, tgt in to_import]
+        pending_records = []
+        try:
+            for task in asyncio.as_completed(tasks):
+                result = await task
+                if result["status"] == "imported":
+                    pending_records.append((self.acr_name, result["target"]))
+                    if len(pending_records) >= RECORD_BATCH_SIZE:
+                        self.image_index.add_images(pending_records)
+                        pending_records = []
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            if pending_records:
+                self.image_index.add_images(pending_records)
+
+    async def import_images(self, source_images, progress=print):
+        """ Imports all images, reporting each result through progress, and returns the results. """
+        results = []
+        async for result in self.stream_imports(source_images):
+            results.append(result)
+            if progress:
+                progress(f"[{len(results)}] {result['message']}")
+        return results
@@ -0,0 +1,153 @@
+"""
+Process-wide warm pool for the chainlit orchestrator.
+
+Everything a chat session needs that does not depend on the conversation is built
+once per process and shared by all sessions:
+- Key Vault secrets, cached for SECRET_TTL_SECONDS
+- instruction texts, read from disk once
+- one AzureChatCompletion service (and so one HTTP connection pool) for every kernel
+- the agents and the mcp-server-kubernetes plugin, started once instead of one npx process per session
+
+Conversation state lives in the per-session thread, so a new session only needs the shared orchestrator.
+The pool is rebuilt (reusing the MCP plugin) when the cached secrets change.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import semantic_kernel as sk
+from azure.identity import DefaultAzureCredential
+from semantic_kernel.agents import ChatCompletionAgent
+from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+
+from acrAgent import create_acr_agent
+from clkubeagent import create_kubernetes_discovery_agent
+from kubeDeployAgent import create_kubernetes_deployment_agent
+from utilities import get_kv_secret_value, load_instructions
+from yamlManifestAgent import create_yaml_manifest_agent
+
+YAML_AGENT_INSTRUCTIONS = "kubernetes_yaml_instructions.txt"
+ORCHESTRATOR_INSTRUCTIONS = "orchestrator_instructions.txt"
+ACR_INSTRUCTIONS = "acr_agent_instructions.txt"
+KUBERNETES_INSTRUCTIONS = "kubernetes_discovery_instructions.txt"
+DEPLOYMENT_AGENT_INSTRUCTIONS = "kubernetes_deployment_instructions.txt"
+
+AGENT_SECRETS = ["AZURE-OPENAI-API-KEY", "AZURE-OPENAI-ENDPOINT"]
+SECRET_TTL_SECONDS = int(os.environ.get("KEYVAULT_SECRET_TTL", "900"))
+
+
+class SecretCache:
+    """ Key Vault secrets fetched with one credential and kept for ttl seconds. """
+
+    def __init__(self, ttl=SECRET_TTL_SECONDS):
+        self.ttl = ttl
+        self._credential = None
+        self._secrets = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, secret_names):
+        with self._lock:
+            expired = time.monotonic() - self._fetched_at > self.ttl
+            missing = [name for name in secret_names if name not in self._secrets]
+            if expired or missing:
+                if self._credential is None:
+                    self._credential = DefaultAzureCredential()
+                names = secret_names if expired else missing
+                self._secrets.update(get_kv_secret_value(self._credential, names))
+                if expired:
+                    self._fetched_at = time.monotonic()
+            return {name: self._secrets[name] for name in secret_names}
+
+
+_instructions = {}
+
+
+def get_instructions(filename):
+    """ Returns the instruction text, read from disk once per process. """
+    if filename not in _instructions:
+        _instructions[filename] = load_instructions(filename)
+    return _instructions[filename]
+
+
+class AgentPool:
+    """ Builds the orchestrator and its agents once and hands the same instance to every session. """
+
+    def __init__(self, secret_cache=None):
+        self.secret_cache = secret_cache or SecretCache()
+        self._orchestrator = None
+        self._settings = None
+        self._lock = asyncio.Lock()
+
+    async def get_orchestrator(self):
+        # Key Vault calls are blocking; only made when the cache has expired
+        settings = await asyncio.to_thread(self.secret_cache.get, AGENT_SECRETS)
+        async with self._lock:
+            if self._orchestrator is None or settings != self._settings:
+                self._orchestrator = await self._build(settings)
+                self._settings = settings
+            return self._orchestrator
+
+    async def _build(self, agent_settings):
+        deployment_name = os.environ["AZURE_OPENAI_DEPLOYMENT_NAME"]
+        endpoint = agent_settings["AZURE-OPENAI-ENDPOINT"]
+        api_key = agent_settings["AZURE-OPENAI-API-KEY"]
+
+        # One service, and so one HTTP connection pool, shared by every kernel
+        service = AzureChatCompletion(
+            service_id="default",
+            deployment_name=deployment_name,
+            endpoint=endpoint,
+            api_key=api_key,
+        )
+        orchestrator_kernel = sk.Kernel()
+        orchestrator_kernel.add_service(service)
+
+        acr_agent = create_acr_agent(
+            instructions=get_instructions(ACR_INSTRUCTIONS),
+            deployment_name=deployment_name,
+            endpoint=endpoint,
+            api_key=api_key,
+            service=service,
+        )
+        yaml_agent = create_yaml_manifest_agent(
+            instructions=get_instructions(YAML_AGENT_INSTRUCTIONS),
+            deployment_name=deployment_name,
+            endpoint=endpoint,
+            api_key=api_key,
+            service=service,
+        )
+        kube_discovery_agent = await create_kubernetes_discovery_agent(
+            instructions=get_instructions(KUBERNETES_INSTRUCTIONS),
+            deployment_name=deployment_name,
+            endpoint=endpoint,
+            api_key=api_key,
+            service=service,
+        )
+        deployment_agent = create_kubernetes_deployment_agent(
+            instructions=get_instructions(DEPLOYMENT_AGENT_INSTRUCTIONS),
+            deployment_name=deployment_name,
+            endpoint=endpoint,
+            api_key=api_key,
+            service=service,
+        )
+
+        return ChatCompletionAgent(
+            instructions=get_instructions(ORCHESTRATOR_INSTRUCTIONS),
+            kernel=orchestrator_kernel,
+            name="Orchestrator",
+            description="You are a orchestrator who can fetch all information about a kubernetes cluster and also appropriately use the agents to copy images, generate manifests etc based on user input..",
+            plugins=[acr_agent, yaml_agent, kube_discovery_agent, deployment_agent],
+        )
+
+
+_pool = None
+
+
+def get_agent_pool():
+    """ Returns the process-wide agent pool. """
+    global _pool
+    if _pool is None:
+        _pool = AgentPool()
+    return _pool
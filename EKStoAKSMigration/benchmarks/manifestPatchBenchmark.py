@@ -0,0 +1,79 @@
+"""
+Times compile_manifest_patch on synthetic Deployment lists of increasing size.
+The time per object should stay roughly constant (linear scaling).
+
+Usage:
+    python benchmarks/manifestPatchBenchmark.py [--sizes 500 1000 2000 4000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifestPatch import compile_manifest_patch
+
+
+def make_deployment(i):
+    return {
+        "apiVersion": "apps/v1",
+        "kind": "Deployment",
+        "metadata": {
+            "name": f"app-{i}",
+            "namespace": "bookinfo",
+            "creationTimestamp": f"2025-06-10T14:{i % 60:02d}:06Z",
+            "annotations": {
+                "kubectl.kubernetes.io/last-applied-configuration": f'{{"name":"app-{i}"}}\n',
+                "eks.amazonaws.com/role-arn": f"arn:aws:iam::123:role/app-{i}",
+            },
+        },
+        "spec": {
+            "replicas": 1,
+            "template": {
+                "spec": {
+                    "containers": [
+                        {"name": "app", "image": f"docker.io/istio/app-{i}:1.16.4", "ports": [{"containerPort": 9080}]}
+                    ]
+                }
+            },
+        },
+        "status": {
+            "availableReplicas": 1,
+            "conditions": [{"type": "Available", "status": "True", "reason": "MinimumReplicasAvailable"}],
+        },
+    }
+
+
+def make_rules(items):
+    values_to_update = []
+    for item in items:
+        metadata = item["metadata"]
+        values_to_update.append({"key": "creationTimestamp", "old_value": metadata["creationTimestamp"], "new_value": "na", "action": "remove"})
+        values_to_update.append({"key": "status", "old_value": item["status"], "new_value": "na", "action": "remove"})
+        for key, value in metadata["annotations"].items():
+            values_to_update.append({"key": key, "old_value": value, "new_value": "na", "action": "remove"})
+        for container in item["spec"]["template"]["spec"]["containers"]:
+            image = container["image"]
+            values_to_update.append({"key": "image", "old_value": image, "new_value": "conmigcr.azurecr.io/" + image.split("/")[-1], "action": "replace"})
+    return values_to_update
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the manifest patch compiler")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000, 4000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        items = [make_deployment(i) for i in range(size)]
+        manifest = {"apiVersion": "v1", "kind": "List", "items": items}
+        values_to_update = make_rules(items)
+
+        start = time.perf_counter()
+        patch = compile_manifest_patch(manifest, values_to_update)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>6} objects  {len(patch):>6} operations  {elapsed * 1000:8.1f} ms  {elapsed / size * 1e6:6.1f} us/object")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,46 @@ from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from semantic_kernel.connectors.mcp import MCPStdioPlugin
 from semantic_kernel.functions import kernel_function
 
+from clusterDigest import build_cluster_digest
+from clusterDiscovery import get_cluster_discovery
 import utilities as util
+import asyncio
 import os
 
-# Global reference to MCP plugin to keep it alive
+# Global reference to MCP plugin to keep it alive; started once and shared by every agent
 kube_discovery_plugin = None
+_kube_discovery_plugin_lock = asyncio.Lock()
 REPORT_DIR = "./ClusterReports/"
 
 class ClusterReportPlugin:
+    # The plugin is shared by the pooled orchestrator across chat sessions, so it keeps no per-session state;
+    # digests are rebuilt from the discovery snapshot cache whenever they are needed
     def __init__(self):
-        pass
+        # Reads the same snapshot cache as the YAML and deployment agents
+        self.discovery = get_cluster_discovery()
+
+    @kernel_function(
+        name="get_cluster_digest",
+        description="Compute the cluster inventory locally (counts per kind and namespace, image registries, AWS annotations and storage classes, service types, resource totals) and return a compact digest to base the cluster summary on."
+    )
+    def get_cluster_digest(self) -> str:
+        digest = build_cluster_digest(self.discovery)
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        file_path = os.path.join(REPORT_DIR, "cluster_inventory.md")
+        util.write_to_file_md(file_path, digest.to_markdown())
+        return digest.to_text() + f"\nFull inventory tables: `{file_path}` (appended to the saved summary)."
+
+    @kernel_function(
+        name="list_cluster_resources",
+        description="List the names of Kubernetes resources of one kind, optionally in one namespace, from the cached cluster snapshot."
+    )
+    def list_cluster_resources(self, resource_type: str, namespace: str = None) -> str:
+        items = self.discovery.list_resources(resource_type, [namespace] if namespace else None)
+        names = [
+            "/".join(filter(None, [item["metadata"].get("namespace"), item["metadata"]["name"]]))
+            for item in items
+        ]
+        return f"{len(names)} {resource_type}: " + ", ".join(names)
 
     @kernel_function(
         name="generate_cluster_summary",
@@ -23,25 +53,45 @@ class ClusterReportPlugin:
         if save_file:
             os.makedirs(REPORT_DIR, exist_ok=True)
             file_path = os.path.join(REPORT_DIR, "cluster_summary.md")
+            # The inventory tables are rendered locally, the model only writes the narrative
+            digest = build_cluster_digest(self.discovery)
+            summary_markdown = summary_markdown.rstrip() + "\n\n" + digest.to_markdown()
             util.write_to_file_md(file_path, summary_markdown)
             return f"Cluster summary document generated: `{file_path}`"
         else:
             return summary_markdown
         
+async def get_kube_discovery_plugin() -> MCPStdioPlugin:
+    """
+    Returns the MCP Kubernetes plugin, starting the mcp-server-kubernetes process on first use.
+    Requests from concurrent sessions are multiplexed over the one connection.
+    """
+    global kube_discovery_plugin
+
+    async with _kube_discovery_plugin_lock:
+        if kube_discovery_plugin is None:
+            plugin = MCPStdioPlugin(
+                name="kubernetes",
+                description="Kubernetes discovery plugin",
+                command="npx",
+                args=["mcp-server-kubernetes"],
+            )
+            await plugin.__aenter__()  # Ensure plugin is initialized
+            kube_discovery_plugin = plugin
+        return kube_discovery_plugin
+
+
 async def create_kubernetes_discovery_agent(
-    instructions: str, deployment_name: str, endpoint: str, api_key: str
+    instructions: str, deployment_name: str, endpoint: str, api_key: str, service=None
 ) -> ChatCompletionAgent:
     """
     Create an agent that uses MCP to discover Kubernetes cluster resources.
     """
-
-    global kube_discovery_plugin
-
     kernel = sk.Kernel()
 
     # Add Azure OpenAI completion service
     kernel.add_service(
-        AzureChatCompletion(
+        service or AzureChatCompletion(
             service_id="default",
             deployment_name=deployment_name,
             endpoint=endpoint,
@@ -49,18 +99,8 @@ async def create_kubernetes_discovery_agent(
         )
     )
 
-    # Initialize MCP Kubernetes plugin
-    kube_discovery_plugin = MCPStdioPlugin(
-        name="kubernetes",
-        description="Kubernetes discovery plugin",
-        command="npx",
-        args=["mcp-server-kubernetes"],
-    )
-
-    await kube_discovery_plugin.__aenter__()  # Ensure plugin is initialized
-
     # Register MCP plugin with the kernel
-    kernel.add_plugin(kube_discovery_plugin, plugin_name="kubernetes_discovery_plugin")
+    kernel.add_plugin(await get_kube_discovery_plugin(), plugin_name="kubernetes_discovery_plugin")
     kernel.add_plugin(ClusterReportPlugin(), plugin_name="cluster_report_plugin")
 
     # Return configured agent
@@ -0,0 +1,186 @@
+"""
+Local aggregation of the cluster snapshot into a compact inventory digest.
+
+The discovery snapshot is scanned once per kind and reduced to the statistics a
+migration summary needs: object counts per kind and namespace, image registries,
+AWS-specific annotations and storage classes, service types and resource request
+and limit totals. The model receives the short digest text; the full tables are
+rendered locally as Markdown.
+"""
+import re
+from collections import Counter, defaultdict
+
+from clusterDiscovery import redacted
+
+DIGEST_KINDS = [
+    "namespace", "node", "pod", "deployment", "statefulset", "daemonset", "replicaset", "job", "cronjob",
+    "service", "ingress", "configmap", "secret", "persistentvolumeclaim", "persistentvolume", "storageclass",
+    "horizontalpodautoscaler",
+]
+TOP_ROWS = 10
+
+AWS_PROVISIONERS = ("kubernetes.io/aws-ebs", "ebs.csi.aws.com", "efs.csi.aws.com", "fsx.csi.aws.com")
+QUANTITY_SUFFIXES = {
+    "n": 1e-9, "u": 1e-6, "m": 1e-3, "": 1, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18,
+    "Ki": 2 ** 10, "Mi": 2 ** 20, "Gi": 2 ** 30, "Ti": 2 ** 40, "Pi": 2 ** 50, "Ei": 2 ** 60,
+}
+QUANTITY_PATTERN = re.compile(r"^([+-]?[0-9.]+(?:[eE][+-]?[0-9]+)?)([a-zA-Z]*)$")
+
+
+def parse_quantity(quantity):
+    """ Converts a Kubernetes quantity ("250m", "1.5", "512Mi") to a float; unknown formats count as 0. """
+    match = QUANTITY_PATTERN.match(str(quantity).strip())
+    if not match or match.group(2) not in QUANTITY_SUFFIXES:
+        return 0.0
+    return float(match.group(1)) * QUANTITY_SUFFIXES[match.group(2)]
+
+
+def image_registry(image):
+    """ Returns the registry host of an image reference (docker.io when none is given). """
+    first = image.split("/")[0]
+    if "/" in image and ("." in first or ":" in first or first == "localhost"):
+        return first
+    return "docker.io"
+
+
+def _is_aws_registry(registry):
+    return ".ecr." in registry or registry.endswith("amazonaws.com") or registry == "public.ecr.aws"
+
+
+class ClusterDigest:
+    """ Statistics gathered in one pass over the snapshot. """
+
+    def __init__(self, context):
+        self.context = context
+        self.kind_counts = Counter()
+        self.namespace_counts = defaultdict(Counter)
+        self.registries = Counter()
+        self.images = set()
+        self.aws_annotations = Counter()
+        self.storage_classes = []
+        self.service_types = Counter()
+        self.resources = Counter()
+        self.unavailable = []
+
+    def add(self, kind, item):
+        metadata = item.get("metadata") or {}
+        self.kind_counts[kind] += 1
+        if metadata.get("namespace"):
+            self.namespace_counts[metadata["namespace"]][kind] += 1
+        for key in (metadata.get("annotations") or {}):
+            if "aws" in key.lower():
+                self.aws_annotations[key] += 1
+
+        spec = item.get("spec") or {}
+        if kind == "pod":
+            self._add_pod(spec)
+        elif kind == "service":
+            self.service_types[spec.get("type", "ClusterIP")] += 1
+        elif kind == "storageclass":
+            provisioner = item.get("provisioner", "")
+            self.storage_classes.append({
+                "name": metadata.get("name", ""),
+                "provisioner": provisioner,
+                "aws": provisioner in AWS_PROVISIONERS or "aws" in provisioner.lower(),
+            })
+
+    def _add_pod(self, spec):
+        for container in (spec.get("containers") or []) + (spec.get("initContainers") or []):
+            image = container.get("image", "")
+            if image:
+                self.registries[image_registry(image)] += 1
+                self.images.add(image)
+        for container in spec.get("containers") or []:
+            resources = container.get("resources") or {}
+            for section in ("requests", "limits"):
+                for resource in ("cpu", "memory"):
+                    value = (resources.get(section) or {}).get(resource)
+                    if value is not None:
+                        self.resources[f"{section}.{resource}"] += parse_quantity(value)
+
+    def _resource_line(self, section):
+        cpu = self.resources.get(f"{section}.cpu", 0.0)
+        memory = self.resources.get(f"{section}.memory", 0.0) / 2 ** 30
+        return f"{cpu:.1f} CPU cores, {memory:.1f} GiB memory"
+
+    def to_text(self):
+        """ Compact digest for the model. """
+        lines = [f"Cluster: {self.context}"]
+        lines.append("Objects: " + ", ".join(f"{count} {kind}" for kind, count in self.kind_counts.most_common()))
+        busiest = sorted(self.namespace_counts.items(), key=lambda entry: -sum(entry[1].values()))[:TOP_ROWS]
+        if busiest:
+            lines.append(f"Busiest namespaces (of {len(self.namespace_counts)}): " + "; ".join(
+                f"{namespace} ({sum(counts.values())} objects, {counts.get('pod', 0)} pods)"
+                for namespace, counts in busiest
+            ))
+        if self.registries:
+            lines.append(f"Image registries ({len(self.images)} distinct images): " + ", ".join(
+                f"{registry}{' [AWS]' if _is_aws_registry(registry) else ''} ({count} containers)"
+                for registry, count in self.registries.most_common(TOP_ROWS)
+            ))
+        if self.aws_annotations:
+            lines.append("AWS-specific annotations: " + ", ".join(
+                f"{key} ({count})" for key, count in self.aws_annotations.most_common(TOP_ROWS)
+            ))
+        if self.storage_classes:
+            lines.append("Storage classes: " + ", ".join(
+                f"{sc['name']} ({sc['provisioner']}{', AWS' if sc['aws'] else ''})" for sc in self.storage_classes
+            ))
+        if self.service_types:
+            lines.append("Service types: " + ", ".join(
+                f"{count} {service_type}" for service_type, count in self.service_types.most_common()
+            ))
+        if self.resources:
+            lines.append("Pod requests: " + self._resource_line("requests"))
+            lines.append("Pod limits: " + self._resource_line("limits"))
+        if self.unavailable:
+            lines.append("Not readable: " + ", ".join(self.unavailable))
+        return "\n".join(lines)
+
+    def to_markdown(self):
+        """ Full inventory tables, rendered locally. """
+        kinds = [kind for kind in DIGEST_KINDS if kind in self.kind_counts and kind not in
+                 ("namespace", "node", "persistentvolume", "storageclass")]
+        lines = [f"# Cluster inventory: {self.context}", "", "## Objects per kind", "",
+                 "| Kind | Count |", "|---|---|"]
+        lines += [f"| {kind} | {count} |" for kind, count in self.kind_counts.most_common()]
+
+        lines += ["", "## Objects per namespace", "", "| Namespace | " + " | ".join(kinds) + " |",
+                  "|---|" + "---|" * len(kinds)]
+        for namespace in sorted(self.namespace_counts):
+            counts = self.namespace_counts[namespace]
+            lines.append(f"| {namespace} | " + " | ".join(str(counts.get(kind, 0)) for kind in kinds) + " |")
+
+        lines += ["", "## Image registries", "", "| Registry | AWS | Containers |", "|---|---|---|"]
+        lines += [f"| {registry} | {'yes' if _is_aws_registry(registry) else 'no'} | {count} |"
+                  for registry, count in self.registries.most_common()]
+
+        lines += ["", "## AWS-specific annotations", "", "| Annotation | Objects |", "|---|---|"]
+        lines += [f"| {key} | {count} |" for key, count in self.aws_annotations.most_common()]
+
+        lines += ["", "## Storage classes", "", "| Name | Provisioner | AWS |", "|---|---|---|"]
+        lines += [f"| {sc['name']} | {sc['provisioner']} | {'yes' if sc['aws'] else 'no'} |"
+                  for sc in self.storage_classes]
+
+        lines += ["", "## Service types", "", "| Type | Count |", "|---|---|"]
+        lines += [f"| {service_type} | {count} |" for service_type, count in self.service_types.most_common()]
+
+        lines += ["", "## Pod resources", "", "| | Total |", "|---|---|",
+                  f"| Requests | {self._resource_line('requests')} |",
+                  f"| Limits | {self._resource_line('limits')} |"]
+        return "\n".join(lines) + "\n"
+
+
+def build_cluster_digest(discovery, kinds=DIGEST_KINDS):
+    """ Builds the digest from the discovery snapshot, reading every kind once. """
+    digest = ClusterDigest(discovery.context)
+    for kind in kinds:
+        try:
+            items = discovery.list_resources(kind)
+        except Exception as e:
+            # e.g. RBAC denies listing secrets; the summary notes it instead of failing
+            digest.unavailable.append(f"{kind} ({str(e).splitlines()[0]})")
+            continue
+        for item in items:
+            digest.add(kind, redacted(kind, item))
+    return digest
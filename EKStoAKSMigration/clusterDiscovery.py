@@ -0,0 +1,389 @@
+"""
+Kubernetes discovery through the Python client with a local snapshot cache.
+
+Resources are listed with paginated list calls per kind (namespaces fetched in parallel)
+and kept as snapshots keyed by cluster context, kind and namespace together with the
+list resourceVersion. The YAML, deployment and report agents share one ClusterDiscovery
+per context, so repeated lookups in a session never re-list the cluster or spawn kubectl.
+Snapshots are also written to ClusterSnapshots/ so later sessions can reuse them. Secret
+values stay in memory for the manifest export but are stripped from everything written to
+disk, so Secret snapshots on disk only hold metadata and are never read back.
+"""
+import copy
+import glob
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SNAPSHOT_FOLDER = "./ClusterSnapshots/"
+SNAPSHOT_TTL_SECONDS = 300
+PAGE_SIZE = 500
+MAX_NAMESPACE_WORKERS = 8
+ALL_NAMESPACES = "*"
+# Value fields dropped from listed objects before they are written to disk
+REDACTED_FIELDS = {"secret": ("data", "stringData")}
+# kubectl apply keeps a full copy of the object (values included) in this annotation
+LAST_APPLIED_ANNOTATION = "kubectl.kubernetes.io/last-applied-configuration"
+
+# kind -> (client API class, namespaced list method, cluster-wide list method)
+# Cluster scoped kinds have no namespaced list method
+RESOURCE_KINDS = {
+    "namespace": ("CoreV1Api", None, "list_namespace"),
+    "node": ("CoreV1Api", None, "list_node"),
+    "persistentvolume": ("CoreV1Api", None, "list_persistent_volume"),
+    "pod": ("CoreV1Api", "list_namespaced_pod", "list_pod_for_all_namespaces"),
+    "service": ("CoreV1Api", "list_namespaced_service", "list_service_for_all_namespaces"),
+    "configmap": ("CoreV1Api", "list_namespaced_config_map", "list_config_map_for_all_namespaces"),
+    "secret": ("CoreV1Api", "list_namespaced_secret", "list_secret_for_all_namespaces"),
+    "serviceaccount": ("CoreV1Api", "list_namespaced_service_account", "list_service_account_for_all_namespaces"),
+    "persistentvolumeclaim": ("CoreV1Api", "list_namespaced_persistent_volume_claim",
+                              "list_persistent_volume_claim_for_all_namespaces"),
+    "resourcequota": ("CoreV1Api", "list_namespaced_resource_quota", "list_resource_quota_for_all_namespaces"),
+    "limitrange": ("CoreV1Api", "list_namespaced_limit_range", "list_limit_range_for_all_namespaces"),
+    "deployment": ("AppsV1Api", "list_namespaced_deployment", "list_deployment_for_all_namespaces"),
+    "statefulset": ("AppsV1Api", "list_namespaced_stateful_set", "list_stateful_set_for_all_namespaces"),
+    "daemonset": ("AppsV1Api", "list_namespaced_daemon_set", "list_daemon_set_for_all_namespaces"),
+    "replicaset": ("AppsV1Api", "list_namespaced_replica_set", "list_replica_set_for_all_namespaces"),
+    "job": ("BatchV1Api", "list_namespaced_job", "list_job_for_all_namespaces"),
+    "cronjob": ("BatchV1Api", "list_namespaced_cron_job", "list_cron_job_for_all_namespaces"),
+    "ingress": ("NetworkingV1Api", "list_namespaced_ingress", "list_ingress_for_all_namespaces"),
+    "horizontalpodautoscaler": ("AutoscalingV1Api", "list_namespaced_horizontal_pod_autoscaler",
+                                "list_horizontal_pod_autoscaler_for_all_namespaces"),
+    "endpoints": ("CoreV1Api", "list_namespaced_endpoints", "list_endpoints_for_all_namespaces"),
+    "networkpolicy": ("NetworkingV1Api", "list_namespaced_network_policy", "list_network_policy_for_all_namespaces"),
+    "ingressclass": ("NetworkingV1Api", None, "list_ingress_class"),
+    "poddisruptionbudget": ("PolicyV1Api", "list_namespaced_pod_disruption_budget",
+                            "list_pod_disruption_budget_for_all_namespaces"),
+    "role": ("RbacAuthorizationV1Api", "list_namespaced_role", "list_role_for_all_namespaces"),
+    "rolebinding": ("RbacAuthorizationV1Api", "list_namespaced_role_binding", "list_role_binding_for_all_namespaces"),
+    "clusterrole": ("RbacAuthorizationV1Api", None, "list_cluster_role"),
+    "clusterrolebinding": ("RbacAuthorizationV1Api", None, "list_cluster_role_binding"),
+    "storageclass": ("StorageV1Api", None, "list_storage_class"),
+    "customresourcedefinition": ("ApiextensionsV1Api", None, "list_custom_resource_definition"),
+}
+
+KIND_ALIASES = {
+    "ns": "namespace", "no": "node", "pv": "persistentvolume", "po": "pod", "svc": "service",
+    "cm": "configmap", "sa": "serviceaccount", "pvc": "persistentvolumeclaim", "quota": "resourcequota",
+    "limits": "limitrange", "deploy": "deployment", "sts": "statefulset", "ds": "daemonset",
+    "rs": "replicaset", "cj": "cronjob", "ing": "ingress", "ingresses": "ingress",
+    "hpa": "horizontalpodautoscaler", "sc": "storageclass", "storageclasses": "storageclass",
+    "crd": "customresourcedefinition", "crds": "customresourcedefinition", "ep": "endpoints",
+    "netpol": "networkpolicy", "networkpolicies": "networkpolicy", "pdb": "poddisruptionbudget",
+}
+
+
+def normalize_kind(kind):
+    """
+    Maps a kind, plural or kubectl short name (e.g. "Deployment", "deployments", "deploy") to a RESOURCE_KINDS key.
+    Other kinds (e.g. custom resources, "certificates.cert-manager.io") are returned lower-cased and are listed
+    through the dynamic client.
+    """
+    name = kind.lower().split(".")[0]
+    if name in RESOURCE_KINDS:
+        return name
+    if name in KIND_ALIASES:
+        return KIND_ALIASES[name]
+    if name.endswith("s") and name[:-1] in RESOURCE_KINDS:
+        return name[:-1]
+    if not kind.strip():
+        raise ValueError("Resource kind cannot be empty")
+    return kind.lower()
+
+
+def redacted(kind, item):
+    """ Returns a listed object without its secret values; objects of other kinds are returned as they are. """
+    if kind not in REDACTED_FIELDS:
+        return item
+    item = copy.deepcopy(item)
+    for field in REDACTED_FIELDS[kind]:
+        item.pop(field, None)
+    ((item.get("metadata") or {}).get("annotations") or {}).pop(LAST_APPLIED_ANNOTATION, None)
+    return item
+
+
+def is_namespaced(kind):
+    """ Kinds outside RESOURCE_KINDS count as namespaced; the dynamic client ignores the namespace of cluster scoped ones. """
+    kind = normalize_kind(kind)
+    return kind not in RESOURCE_KINDS or RESOURCE_KINDS[kind][1] is not None
+
+
+class KubernetesLister:
+    """ Fetches raw list pages from the cluster with the kubernetes Python client. """
+
+    def __init__(self, context=None):
+        from kubernetes import client, config
+
+        self._client = client
+        try:
+            contexts, active_context = config.list_kube_config_contexts()
+            self.context = context or active_context["name"]
+            self.api_client = config.new_client_from_config(context=self.context)
+        except config.ConfigException:
+            # Running inside a cluster
+            config.load_incluster_config()
+            self.context = context or "in-cluster"
+            self.api_client = client.ApiClient()
+        self._apis = {}
+        self._dynamic = None
+        self._dynamic_resources = {}
+
+    def _dynamic_resource(self, kind):
+        """ Finds a served resource by kind, plural, singular or short name, optionally qualified by its API group. """
+        if kind not in self._dynamic_resources:
+            from kubernetes.dynamic import DynamicClient
+
+            if self._dynamic is None:
+                self._dynamic = DynamicClient(self.api_client)
+            name, _, group = kind.partition(".")
+            for resource in self._dynamic.resources.search():
+                names = {resource.kind.lower(), resource.name, resource.singular_name, *(resource.short_names or [])}
+                if name in names and (not group or resource.group == group) and "/" not in resource.name:
+                    self._dynamic_resources[kind] = resource
+                    break
+            else:
+                raise ValueError(f"Unsupported resource kind: {kind}")
+        return self._dynamic_resources[kind]
+
+    def list_page(self, kind, namespace, limit, continue_token=None):
+        if kind not in RESOURCE_KINDS:
+            resource = self._dynamic_resource(kind)
+            kwargs = {"limit": limit}
+            if continue_token:
+                kwargs["_continue"] = continue_token
+            if namespace != ALL_NAMESPACES and resource.namespaced:
+                kwargs["namespace"] = namespace
+            return resource.get(**kwargs).to_dict()
+
+        api_class, namespaced_method, all_method = RESOURCE_KINDS[kind]
+        if api_class not in self._apis:
+            self._apis[api_class] = getattr(self._client, api_class)(self.api_client)
+        api = self._apis[api_class]
+
+        kwargs = {"limit": limit, "_preload_content": False}
+        if continue_token:
+            kwargs["_continue"] = continue_token
+        if namespace != ALL_NAMESPACES and namespaced_method:
+            response = getattr(api, namespaced_method)(namespace, **kwargs)
+        else:
+            response = getattr(api, all_method)(**kwargs)
+        return json.loads(response.data)
+
+
+class FixtureLister:
+    """
+    Serves recorded list responses instead of a live cluster.
+    Pages are read from <fixture_dir>/<kind>_<namespace>.json (namespace "all" for cluster-wide lists);
+    a file holds one list response or a JSON array of pages.
+    """
+
+    def __init__(self, fixture_dir, context="fixture"):
+        self.fixture_dir = fixture_dir
+        self.context = context
+
+    def list_page(self, kind, namespace, limit, continue_token=None):
+        name = "all" if namespace == ALL_NAMESPACES else namespace
+        filepath = os.path.join(self.fixture_dir, f"{kind}_{name}.json")
+        if not os.path.exists(filepath):
+            return {"kind": "List", "apiVersion": "v1", "metadata": {"resourceVersion": ""}, "items": []}
+        with open(filepath, "r", encoding="utf-8") as file:
+            pages = json.load(file)
+        if isinstance(pages, dict):
+            pages = [pages]
+        index = int(continue_token or 0)
+        page = dict(pages[index])
+        page["metadata"] = dict(page.get("metadata") or {})
+        page["metadata"]["continue"] = str(index + 1) if index + 1 < len(pages) else None
+        return page
+
+
+class RecordingLister:
+    """ Wraps a lister and records the pages it returns as FixtureLister fixtures. """
+
+    def __init__(self, lister, fixture_dir):
+        self.lister = lister
+        self.fixture_dir = fixture_dir
+        self.context = lister.context
+        self._pages = {}
+
+    def list_page(self, kind, namespace, limit, continue_token=None):
+        page = self.lister.list_page(kind, namespace, limit, continue_token)
+        name = "all" if namespace == ALL_NAMESPACES else namespace
+        key = f"{kind}_{name}"
+        pages = self._pages.setdefault(key, [])
+        if not continue_token:
+            pages.clear()
+        pages.append(dict(page, items=[redacted(kind, item) for item in page.get("items") or []]))
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        with open(os.path.join(self.fixture_dir, key + ".json"), "w", encoding="utf-8") as file:
+            json.dump(pages, file, indent=2)
+        return page
+
+
+class ClusterDiscovery:
+    """ Lists cluster resources through a lister and caches them as snapshots. """
+
+    def __init__(self, context=None, lister=None, snapshot_dir=SNAPSHOT_FOLDER,
+                 ttl_seconds=SNAPSHOT_TTL_SECONDS, page_size=PAGE_SIZE, max_workers=MAX_NAMESPACE_WORKERS):
+        self._requested_context = context
+        self._lister = lister
+        self.snapshot_dir = snapshot_dir
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._lister_lock = threading.Lock()
+
+    @property
+    def lister(self):
+        # Created on first use so agents can be built without a reachable cluster
+        with self._lister_lock:
+            if self._lister is None:
+                self._lister = KubernetesLister(self._requested_context)
+            return self._lister
+
+    @property
+    def context(self):
+        return self.lister.context
+
+    def _snapshot_path(self, kind, namespace):
+        context = re.sub(r"[^A-Za-z0-9_.-]", "_", self.context)
+        name = "all" if namespace == ALL_NAMESPACES else namespace
+        return os.path.join(self.snapshot_dir, context, f"{kind}_{name}.json")
+
+    def _fetch(self, kind, namespace):
+        """ Lists every page of a kind in one namespace (or all namespaces). """
+        items = []
+        resource_version = ""
+        continue_token = None
+        while True:
+            page = self.lister.list_page(kind, namespace, self.page_size, continue_token)
+            metadata = page.get("metadata") or {}
+            if not continue_token:
+                resource_version = metadata.get("resourceVersion", "")
+            # List items do not carry kind/apiVersion; fill them in as kubectl does
+            item_kind = str(page.get("kind", "")).removesuffix("List")
+            for item in page.get("items") or []:
+                item.setdefault("apiVersion", page.get("apiVersion"))
+                item.setdefault("kind", item_kind)
+                (item.get("metadata") or {}).pop("managedFields", None)
+                items.append(item)
+            continue_token = metadata.get("continue")
+            if not continue_token:
+                break
+
+        return {
+            "context": self.context,
+            "kind": kind,
+            "namespace": namespace,
+            "resourceVersion": resource_version,
+            "fetched_at": time.time(),
+            "items": items,
+        }
+
+    def _load_snapshot(self, kind, namespace):
+        key = (kind, namespace)
+        with self._lock:
+            if key in self._snapshots:
+                return self._snapshots[key]
+        filepath = self._snapshot_path(kind, namespace)
+        if kind in REDACTED_FIELDS or not os.path.exists(filepath):
+            # The file has no values for redacted kinds (or predates the redaction); list them again
+            return None
+        try:
+            with open(filepath, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._snapshots[key] = snapshot
+        return snapshot
+
+    def _store_snapshot(self, snapshot):
+        with self._lock:
+            self._snapshots[(snapshot["kind"], snapshot["namespace"])] = snapshot
+        if self.snapshot_dir:
+            filepath = self._snapshot_path(snapshot["kind"], snapshot["namespace"])
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            kind = snapshot["kind"]
+            with open(filepath, "w", encoding="utf-8") as file:
+                json.dump(dict(snapshot, items=[redacted(kind, item) for item in snapshot["items"]]), file)
+
+    def snapshot(self, kind, namespace=ALL_NAMESPACES, refresh=False):
+        """ Returns the snapshot of one kind in one namespace (or all namespaces), listing the cluster only when needed. """
+        kind = normalize_kind(kind)
+        if not is_namespaced(kind):
+            namespace = ALL_NAMESPACES
+
+        if not refresh:
+            cached = self._load_snapshot(kind, namespace)
+            # A list resourceVersion is the global etcd revision and changes with any write in the
+            # cluster, so it cannot tell whether this kind changed; snapshots simply expire after the TTL
+            if cached is not None and time.time() - cached["fetched_at"] < self.ttl_seconds:
+                return cached
+            if namespace != ALL_NAMESPACES:
+                # A fresh cluster-wide snapshot already holds this namespace
+                cluster_wide = self._load_snapshot(kind, ALL_NAMESPACES)
+                if cluster_wide is not None and time.time() - cluster_wide["fetched_at"] < self.ttl_seconds:
+                    return dict(cluster_wide, namespace=namespace, items=[
+                        item for item in cluster_wide["items"]
+                        if (item.get("metadata") or {}).get("namespace") == namespace
+                    ])
+
+        snapshot = self._fetch(kind, namespace)
+        self._store_snapshot(snapshot)
+        return snapshot
+
+    def list_resources(self, kind, namespaces=None, refresh=False):
+        """ Returns the resources of a kind in the given namespaces (fetched in parallel) or in all namespaces. """
+        if not namespaces or not is_namespaced(kind):
+            return self.snapshot(kind, ALL_NAMESPACES, refresh)["items"]
+        if len(namespaces) == 1:
+            return self.snapshot(kind, namespaces[0], refresh)["items"]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(namespaces))) as executor:
+            snapshots = executor.map(lambda ns: self.snapshot(kind, ns, refresh), namespaces)
+            return [item for snapshot in snapshots for item in snapshot["items"]]
+
+    def get_resource(self, kind, name, namespace=None, refresh=False):
+        """ Returns one resource by name (searching all namespaces if none is given), or None. """
+        namespaces = [namespace] if namespace else None
+        for item in self.list_resources(kind, namespaces, refresh):
+            if (item.get("metadata") or {}).get("name") == name:
+                return item
+        return None
+
+    def invalidate(self, kind=None, namespace=None):
+        """ Drops cached snapshots, e.g. after creating resources, so the next read lists the cluster again. """
+        kind = normalize_kind(kind) if kind else None
+
+        def matches(snapshot_kind, snapshot_namespace):
+            return ((kind is None or snapshot_kind == kind)
+                    and (namespace is None or snapshot_namespace in (namespace, ALL_NAMESPACES)))
+
+        with self._lock:
+            for key in [key for key in self._snapshots if matches(*key)]:
+                del self._snapshots[key]
+        if self.snapshot_dir and self._lister is not None:
+            directory = os.path.dirname(self._snapshot_path("", ALL_NAMESPACES))
+            for filepath in glob.glob(os.path.join(directory, "*.json")):
+                with open(filepath, "r", encoding="utf-8") as file:
+                    snapshot = json.load(file)
+                if matches(snapshot["kind"], snapshot["namespace"]):
+                    os.remove(filepath)
+
+
+_discoveries = {}
+_discoveries_lock = threading.Lock()
+
+
+def get_cluster_discovery(context=None):
+    """ Returns the ClusterDiscovery shared by all agents for a context (None = current kubeconfig context). """
+    with _discoveries_lock:
+        if context not in _discoveries:
+            _discoveries[context] = ClusterDiscovery(context)
+        return _discoveries[context]
@@ -0,0 +1,111 @@
+import csv
+import os
+import tempfile
+import threading
+
+ACR_IMAGES_FILE = os.path.join(".", "Data", "ACRImages.csv")
+FIELDNAMES = ["ACR", "Image"]
+
+# One index per CSV file, shared by the ACR and YAML agents
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+class ACRImageIndex:
+    """
+    In-memory index of image name -> ACR names backed by ACRImages.csv, one row per (ACR, image) pair.
+    The CSV is parsed once and re-read only when its modification time or size changes.
+    """
+
+    def __init__(self, filepath=ACR_IMAGES_FILE):
+        self.filepath = filepath
+        self._lock = threading.Lock()
+        # image -> ACR names in file order; the first one answers lookups
+        self._images = {}
+        self._signature = None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        images = {}
+        if signature is not None:
+            with open(self.filepath, newline="", encoding="utf-8") as file:
+                for row in csv.DictReader(file):
+                    if row.get("Image"):
+                        acrs = images.setdefault(row["Image"], [])
+                        if row["ACR"] not in acrs:
+                            acrs.append(row["ACR"])
+        self._images = images
+        self._signature = signature
+
+    def lookup(self, image):
+        """ Returns the first ACR holding the image (e.g. "examples-bookinfo-reviews-v2:1.16.4"), or None. """
+        with self._lock:
+            self._refresh()
+            acrs = self._images.get(image)
+            return acrs[0] if acrs else None
+
+    def contains(self, image, acr_name=None):
+        with self._lock:
+            self._refresh()
+            acrs = self._images.get(image) or []
+            return bool(acrs) and (acr_name is None or acr_name in acrs)
+
+    def snapshot(self):
+        """ Returns image -> first ACR for the whole index, e.g. to hand to worker processes. """
+        with self._lock:
+            self._refresh()
+            return {image: acrs[0] for image, acrs in self._images.items() if acrs}
+
+    def add_images(self, rows):
+        """
+        Records a batch of (acr_name, image) rows; an image may be held by several ACRs.
+        The CSV is rewritten to a temporary file and swapped in, so readers never see a partial write.
+        Returns the number of new (ACR, image) pairs.
+        """
+        with self._lock:
+            self._refresh()
+            changed = 0
+            for acr_name, image in rows:
+                acrs = self._images.setdefault(image, [])
+                if acr_name not in acrs:
+                    acrs.append(acr_name)
+                    changed += 1
+            if not changed:
+                return 0
+
+            directory = os.path.dirname(self.filepath) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", newline="", encoding="utf-8") as file:
+                    writer = csv.writer(file)
+                    writer.writerow(FIELDNAMES)
+                    writer.writerows([acr, image] for image, acrs in self._images.items() for acr in acrs)
+                os.replace(temp_path, self.filepath)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                # Fall back to what is on disk
+                self._signature = None
+                raise
+            self._signature = self._file_signature()
+            print(f"Recorded {changed} images in {self.filepath}")
+            return changed
+
+
+def get_image_index(filepath=ACR_IMAGES_FILE):
+    """ Returns the shared index for the given CSV file. """
+    key = os.path.abspath(filepath)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = ACRImageIndex(filepath)
+        return _indexes[key]
@@ -2,11 +2,12 @@ import subprocess
 from typing import Annotated
 
 import semantic_kernel as sk
-from kubernetes import config
 from semantic_kernel.agents import ChatCompletionAgent
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 from semantic_kernel.functions import kernel_function
 
+from clusterDiscovery import get_cluster_discovery
+import manifestApply
 import utilities as util
 
 AGENT_NAME = "KubernetesDeploymentAgent"
@@ -14,10 +15,7 @@ TARGET_MANIFEST_FOLDER = "./TargetManifests/"
 
 class KubernetesDeploymentPlugin:
     def __init__(self):
-        try:
-            config.load_kube_config()
-        except Exception as e:
-            print(f"Error loading Kubernetes config: {e}")
+        pass
 
     def run_kubectl_command(self, command: list) -> str:
         try:
@@ -35,28 +33,28 @@ class KubernetesDeploymentPlugin:
         command = [ "kubectl", "config", "use-context", target_cluster]
         self.run_kubectl_command(command)
 
+        # Existence checks are served from the shared snapshot of the target cluster
+        discovery = get_cluster_discovery(target_cluster)
+
         # Check if namespace exists
-        command = [ "kubectl", "get", "namespace", namespace.lower() ]
-        result = self.run_kubectl_command(command)
-        if result == "Failed":
+        if discovery.get_resource("namespace", namespace.lower()) is None:
             # Create namespace if it does not exist
             command = [ "kubectl", "create", "namespace", namespace.lower() ]
             result = self.run_kubectl_command(command)
             if result != "Failed":
+                discovery.invalidate("namespace")
                 print(f"Namespace {namespace} created successfully.")
             else:
                 return f"Failed to create namespace {namespace}."
         #Check if resource already exists
-        command = [ "kubectl", "get", resource_type.lower(), "-n", namespace.lower() ]  # , "-o yaml >", resource_type + ".yaml"]
-        result = self.run_kubectl_command(command)
-
-        if result == "Failed":
+        if discovery.get_resource(resource_type, resource_name, namespace.lower()) is None:
             # Check if file exists
             output = util.read_file_if_exists(TARGET_MANIFEST_FOLDER + resource_type.lower() + "_" + resource_name.lower() + ".yaml")
             if output["metadata"]["name"] == resource_name:
                 command = [ "kubectl", "create", "-f", TARGET_MANIFEST_FOLDER + resource_type.lower() + "_" + resource_name.lower() + ".yaml" ]
                 result = self.run_kubectl_command(command)
                 if result != "Failed":
+                    discovery.invalidate(resource_type, namespace.lower())
                     return f"Resource {resource_type} with name {resource_name} created successfully in cluster {target_cluster}."
                 # else:
                 #     return f"Failed to create resource {resource_type} with name {resource_name} in cluster {target_cluster}."
@@ -65,13 +63,23 @@ class KubernetesDeploymentPlugin:
         else:
             return f"Resource {resource_type} with name {resource_name} already exists in the cluster {target_cluster}."
 
+    @kernel_function(description="Apply all generated manifests (optionally only one namespace) to the target cluster in dependency order, with optional server-side dry run.")
+    def apply_target_manifests(
+        self, target_cluster: str, namespace: str = None, dry_run: bool = False
+    ) -> Annotated[str, "Returns a table with the result of every applied object."]:
+        results = manifestApply.apply_manifests(
+            target_cluster, TARGET_MANIFEST_FOLDER, namespace.lower() if namespace else None, dry_run
+        )
+        if not dry_run:
+            get_cluster_discovery(target_cluster).invalidate(namespace=namespace.lower() if namespace else None)
+        return manifestApply.format_results(results)
 
 
 def create_kubernetes_deployment_agent(
-    instructions: str, deployment_name: str, endpoint: str, api_key: str
+    instructions: str, deployment_name: str, endpoint: str, api_key: str, service=None
 ) -> ChatCompletionAgent:
     kernel = sk.Kernel()
-    service = AzureChatCompletion(
+    service = service or AzureChatCompletion(
         service_id="default",
         deployment_name=deployment_name,
         endpoint=endpoint,
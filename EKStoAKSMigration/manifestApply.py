@@ -0,0 +1,233 @@
+"""
+Dependency-ordered bulk apply of the generated AKS manifests.
+
+Objects from TargetManifests/ are grouped into tiers (namespaces, CRDs, config, services,
+workloads, ingress). Tiers are applied in order and the objects of a tier concurrently,
+using server-side apply (optionally as a server dry run). Objects a controller creates
+(ReplicaSets of Deployments, Pods, Endpoints, EndpointSlices, ...) are skipped, since the
+controllers recreate them from their owners. Every object gets a row in the result table.
+
+Usage:
+    python manifestApply.py <target cluster context> [--namespace NS] [--dry-run] [--workers N]
+"""
+import argparse
+import copy
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import manifestIO
+
+TARGET_MANIFEST_FOLDER = "./TargetManifests/"
+FIELD_MANAGER = "eks-to-aks-migration"
+MAX_APPLY_WORKERS = 8
+
+# Apply order; kinds not listed here are applied after the workloads
+APPLY_TIERS = [
+    ("namespaces", ["Namespace"]),
+    ("crds", ["CustomResourceDefinition"]),
+    ("config", ["StorageClass", "PriorityClass", "ServiceAccount", "Role", "ClusterRole", "RoleBinding",
+                "ClusterRoleBinding", "ConfigMap", "Secret", "PersistentVolume", "PersistentVolumeClaim",
+                "ResourceQuota", "LimitRange"]),
+    ("services", ["Service"]),
+    ("workloads", ["Deployment", "StatefulSet", "DaemonSet", "ReplicaSet", "Job", "CronJob", "Pod",
+                   "HorizontalPodAutoscaler", "PodDisruptionBudget"]),
+    ("other", []),
+    ("ingress", ["Ingress", "IngressClass"]),
+]
+TIER_BY_KIND = {kind: tier for tier, kinds in APPLY_TIERS for kind in kinds}
+
+# Fields the source cluster's API server populated; a server-side apply to another cluster rejects or conflicts on them
+SERVER_METADATA_FIELDS = ["resourceVersion", "uid", "selfLink", "generation", "creationTimestamp", "managedFields",
+                          "deletionTimestamp", "deletionGracePeriodSeconds"]
+LAST_APPLIED_ANNOTATION = "kubectl.kubernetes.io/last-applied-configuration"
+
+
+class DynamicClientApplier:
+    """ Applies objects with server-side apply through the kubernetes dynamic client. """
+
+    def __init__(self, context=None, field_manager=FIELD_MANAGER):
+        from kubernetes import config, dynamic
+
+        self.client = dynamic.DynamicClient(config.new_client_from_config(context=context))
+        self.field_manager = field_manager
+
+    def apply(self, body, dry_run=False):
+        resource = self.client.resources.get(api_version=body["apiVersion"], kind=body["kind"])
+        kwargs = {"field_manager": self.field_manager, "force_conflicts": True}
+        if dry_run:
+            kwargs["dry_run"] = "All"
+        self.client.server_side_apply(
+            resource,
+            body=body,
+            name=body["metadata"]["name"],
+            namespace=body["metadata"].get("namespace"),
+            **kwargs,
+        )
+
+
+def strip_server_fields(body):
+    """ Returns a copy of an exported object without status and the fields set by the source cluster. """
+    body = copy.deepcopy(body)
+    body.pop("status", None)
+    metadata = body.get("metadata") or {}
+    for field in SERVER_METADATA_FIELDS:
+        metadata.pop(field, None)
+    annotations = metadata.get("annotations")
+    if annotations:
+        annotations.pop(LAST_APPLIED_ANNOTATION, None)
+        if not annotations:
+            del metadata["annotations"]
+    if body.get("kind") == "Service":
+        spec = body.get("spec") or {}
+        # Headless services keep clusterIP: None; allocated IPs belong to the source cluster
+        if spec.get("clusterIP") != "None":
+            spec.pop("clusterIP", None)
+            spec.pop("clusterIPs", None)
+        spec.pop("healthCheckNodePort", None)
+    return body
+
+
+def load_target_manifests(target_dir=TARGET_MANIFEST_FOLDER):
+    """ Returns every object in the YAML files of target_dir as plain dicts (kind: List documents are expanded). """
+    # Timestamps and other YAML types become plain JSON values for the API
+    return [
+        json.loads(json.dumps(obj, default=str))
+        for obj in manifestIO.iter_manifests(target_dir, typ="safe")
+    ]
+
+
+def order_by_tier(objects, namespace=None):
+    """
+    Groups objects into APPLY_TIERS order.
+    With a namespace only that namespace's objects are kept, and its Namespace object is added if missing.
+    """
+    if namespace:
+        objects = [
+            obj for obj in objects
+            if obj.get("metadata", {}).get("namespace") == namespace
+            or (obj.get("kind") == "Namespace" and obj.get("metadata", {}).get("name") == namespace)
+        ]
+        if not any(obj.get("kind") == "Namespace" for obj in objects):
+            objects.append({"apiVersion": "v1", "kind": "Namespace", "metadata": {"name": namespace}})
+
+    tiers = {tier: [] for tier, _ in APPLY_TIERS}
+    for obj in objects:
+        tiers[TIER_BY_KIND.get(obj.get("kind"), "other")].append(obj)
+    return [(tier, tiers[tier]) for tier, _ in APPLY_TIERS if tiers[tier]]
+
+
+def skip_reason(obj, selector_services):
+    """
+    Why an object must not be applied because a controller creates it on the target cluster, or None.
+    selector_services holds the (namespace, name) of the Services with a selector, whose Endpoints
+    the endpoints controller maintains without an ownerReference.
+    """
+    metadata = obj.get("metadata") or {}
+    owner = next((ref for ref in metadata.get("ownerReferences") or [] if ref.get("controller")), None)
+    if owner is not None:
+        return f"Created by its controller {owner.get('kind')}/{owner.get('name')}"
+    if (obj.get("kind") == "Endpoints"
+            and (metadata.get("namespace"), metadata.get("name")) in selector_services):
+        return f"Maintained for Service {metadata.get('name')}"
+    if obj.get("kind") == "EndpointSlice" and (metadata.get("labels") or {}).get(
+            "endpointslice.kubernetes.io/managed-by") == "endpointslice-controller.k8s.io":
+        return "Maintained by the EndpointSlice controller"
+    return None
+
+
+def _skipped_row(tier, body, reason):
+    metadata = body.get("metadata") or {}
+    return {
+        "tier": tier,
+        "kind": body.get("kind", ""),
+        "namespace": metadata.get("namespace", ""),
+        "name": metadata.get("name", ""),
+        "status": "skipped",
+        "message": reason,
+        "seconds": 0,
+    }
+
+
+def _apply_one(applier, tier, body, dry_run=False):
+    metadata = body.get("metadata") or {}
+    row = {
+        "tier": tier,
+        "kind": body.get("kind", ""),
+        "namespace": metadata.get("namespace", ""),
+        "name": metadata.get("name", ""),
+    }
+    start = time.perf_counter()
+    try:
+        applier.apply(strip_server_fields(body), dry_run=dry_run)
+        row["status"] = "dry-run ok" if dry_run else "applied"
+        row["message"] = ""
+    except Exception as e:
+        row["status"] = "failed"
+        row["message"] = str(getattr(e, "reason", "") or e).splitlines()[0]
+    row["seconds"] = round(time.perf_counter() - start, 2)
+    return row
+
+
+def apply_manifests(context=None, target_dir=TARGET_MANIFEST_FOLDER, namespace=None, dry_run=False,
+                    max_workers=MAX_APPLY_WORKERS, applier=None):
+    """
+    Applies the manifests in target_dir tier by tier, each tier concurrently.
+    Returns one result row per object; objects their controllers create are skipped.
+    """
+    applier = applier or DynamicClientApplier(context)
+    objects = load_target_manifests(target_dir)
+    selector_services = {
+        ((obj.get("metadata") or {}).get("namespace"), (obj.get("metadata") or {}).get("name"))
+        for obj in objects
+        if obj.get("kind") == "Service" and (obj.get("spec") or {}).get("selector")
+    }
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for tier, tier_objects in order_by_tier(objects, namespace):
+            to_apply = []
+            for obj in tier_objects:
+                reason = skip_reason(obj, selector_services)
+                if reason:
+                    results.append(_skipped_row(tier, obj, reason))
+                else:
+                    to_apply.append(obj)
+            # Each tier completes before the next one starts
+            results.extend(executor.map(partial(_apply_one, applier, tier, dry_run=dry_run), to_apply))
+    return results
+
+
+def format_results(results):
+    """ Renders the result rows as a Markdown table with a one line summary. """
+    applied = sum(1 for row in results if row["status"] in ("applied", "dry-run ok"))
+    skipped = sum(1 for row in results if row["status"] == "skipped")
+    lines = [
+        f"{applied}/{len(results) - skipped} objects applied successfully, {skipped} controller-created objects skipped.",
+        "",
+        "| Tier | Kind | Namespace | Name | Status | Seconds | Message |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for row in results:
+        lines.append(
+            f"| {row['tier']} | {row['kind']} | {row['namespace']} | {row['name']} | "
+            f"{row['status']} | {row['seconds']} | {row['message']} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply the generated AKS manifests in dependency order")
+    parser.add_argument("context", nargs="?", default=None, help="kubeconfig context of the target cluster")
+    parser.add_argument("--target", default=TARGET_MANIFEST_FOLDER, help="Directory with the AKS manifests")
+    parser.add_argument("--namespace", default=None, help="Only apply the objects of this namespace")
+    parser.add_argument("--dry-run", action="store_true", help="Server-side dry run, nothing is persisted")
+    parser.add_argument("--workers", type=int, default=MAX_APPLY_WORKERS, help="Concurrent applies per tier")
+    args = parser.parse_args()
+
+    results = apply_manifests(args.context, args.target, args.namespace, args.dry_run, args.workers)
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Streaming manifest I/O.
+
+Multi-document YAML files (`---` separated) and `kind: List` dumps from
+`kubectl get -o yaml` are read lazily, one resource at a time: list items are
+split out line by line, so memory stays bounded by the largest single resource
+even for dumps of hundreds of MB. YAML instances are configured once per thread
+and reused, and writers emit documents incrementally.
+"""
+import io
+import os
+import re
+import threading
+
+from ruamel.yaml import YAML
+
+YAML_EXTENSIONS = (".yaml", ".yml")
+DOCUMENT_SEPARATOR = re.compile(r"^---(\s.*)?$")
+ITEMS_KEY = re.compile(r"^items:\s*(#.*)?$")
+ITEM_START = re.compile(r"^(\s*)- ")
+
+_local = threading.local()
+
+
+def get_yaml(typ="rt"):
+    """ Returns this thread's YAML instance of the given type, configured like the rest of the tool. """
+    instances = getattr(_local, "instances", None)
+    if instances is None:
+        instances = _local.instances = {}
+    if typ not in instances:
+        yaml = YAML(typ=typ)
+        yaml.indent(mapping=2, sequence=4, offset=2)
+        instances[typ] = yaml
+    return instances[typ]
+
+
+def _manifest_files(path):
+    if os.path.isdir(path):
+        return sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.lower().endswith(YAML_EXTENSIONS)
+        )
+    return [path]
+
+
+def _iter_file_texts(lines):
+    """
+    Yields the text of every resource in a stream of lines.
+    Documents are split on `---`; a top-level `items:` sequence (kind: List) is split into its items,
+    which are de-indented so each parses as a standalone resource. The List wrapper itself is dropped.
+    """
+    document = []
+    item = None
+    item_indent = None
+    in_items = False
+    in_list = False
+
+    for line in lines:
+        if in_items:
+            stripped = line.strip()
+            match = ITEM_START.match(line)
+            if match and (item_indent is None or len(match.group(1)) == item_indent):
+                item_indent = len(match.group(1))
+                if item:
+                    yield "".join(item)
+                # "- key: value" becomes "key: value"
+                item = [line[item_indent + 2:]]
+                continue
+            indent = len(line) - len(line.lstrip())
+            if item_indent is not None and stripped and indent > item_indent:
+                # Nested lines are copied verbatim (block scalars may contain '#' lines), only de-indented
+                if item is not None:
+                    item.append(line[min(indent, item_indent + 2):])
+                continue
+            if not stripped or stripped.startswith("#"):
+                if item is not None:
+                    item.append("\n")
+                continue
+            # A top-level key or separator ends the items sequence
+            if item:
+                yield "".join(item)
+            item = None
+            item_indent = None
+            in_items = False
+
+        if DOCUMENT_SEPARATOR.match(line):
+            if "".join(document).strip() and not in_list:
+                yield "".join(document)
+            document = []
+            in_list = False
+        elif ITEMS_KEY.match(line):
+            in_items = True
+            in_list = True
+        else:
+            document.append(line)
+
+    if item:
+        yield "".join(item)
+    if "".join(document).strip() and not in_list:
+        yield "".join(document)
+
+
+def iter_manifest_texts(path):
+    """ Yields (file path, resource text) for every resource in a file or in every YAML file of a directory. """
+    for filepath in _manifest_files(path):
+        with open(filepath, "r", encoding="utf-8") as file:
+            for text in _iter_file_texts(file):
+                yield filepath, text
+
+
+def iter_manifests(path, typ="rt"):
+    """ Yields every resource in a file or directory as a parsed document, one at a time. """
+    yaml = get_yaml(typ)
+    for _, text in iter_manifest_texts(path):
+        document = yaml.load(text)
+        if isinstance(document, dict):
+            yield document
+
+
+def read_manifest(filepath):
+    """ Returns the first resource of a manifest file, or None if the file does not exist. """
+    if not os.path.exists(filepath):
+        return None
+    return next(iter_manifests(filepath), None)
+
+
+def dump_yaml(data):
+    stream = io.StringIO()
+    get_yaml().dump(data, stream)
+    return stream.getvalue()
+
+
+class ManifestWriter:
+    """ Writes resources to a multi-document YAML file as they are produced. """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.count = 0
+        self._file = open(filepath, "w", encoding="utf-8")
+
+    def write(self, document):
+        if self.count:
+            self._file.write("---\n")
+        get_yaml().dump(document, self._file)
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_manifests(filepath, documents):
+    """ Streams an iterable of resources into one multi-document file and returns how many were written. """
+    with ManifestWriter(filepath) as writer:
+        for document in documents:
+            writer.write(document)
+        return writer.count
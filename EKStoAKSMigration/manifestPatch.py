@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+# In JSON Pointer (RFC 6901) "~" and "/" inside a key are written as "~0" and "~1"
+
+
+def escape_json_pointer(key) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def unescape_json_pointer(key) -> str:
+    return str(key).replace("~1", "/").replace("~0", "~")
+
+
+def value_hash(value) -> str:
+    """
+    Returns a hash of the canonical JSON form of a manifest value.
+    Values that are not JSON types (e.g. timestamps loaded by ruamel) are compared by their string form.
+    """
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def compile_patch_rules(values_to_update):
+    """
+    Pre-hashes the values_to_update rules into a dict keyed by (key, hash of old_value).
+    Rule keys may be given raw ("kubectl.kubernetes.io/last-applied-configuration") or
+    JSON Pointer escaped ("kubectl.kubernetes.io~1last-applied-configuration").
+    The first rule for a (key, old_value) pair wins.
+    """
+    rules = {}
+    for rule in values_to_update:
+        rule_key = (unescape_json_pointer(rule["key"]), value_hash(rule["old_value"]))
+        rules.setdefault(rule_key, rule)
+    return rules
+
+
+def generate_json_patch(data, rules):
+    """
+    Walks the manifest once and returns the RFC 6902 operations for every key/value that matches a rule.
+    Matched values are not descended into, so a removed or replaced subtree never produces nested operations.
+    """
+    if not rules:
+        return []
+
+    rule_keys = {key for key, _ in rules}
+    patch = []
+    stack = [(data, "")]
+
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, dict):
+            children = []
+            for k, v in node.items():
+                child_path = f"{path}/{escape_json_pointer(k)}"
+                rule = rules.get((k, value_hash(v))) if k in rule_keys else None
+                if rule is not None:
+                    operation = {"op": rule["action"], "path": child_path}
+                    if rule["action"] != "remove":
+                        operation["value"] = rule["new_value"]
+                    patch.append(operation)
+                elif isinstance(v, (dict, list)):
+                    children.append((v, child_path))
+            # Reversed so sibling subtrees are visited in document order
+            stack.extend(reversed(children))
+        elif isinstance(node, list):
+            stack.extend(
+                (item, f"{path}/{idx}")
+                for idx, item in reversed(list(enumerate(node)))
+                if isinstance(item, (dict, list))
+            )
+
+    return patch
+
+
+def compile_manifest_patch(data, values_to_update):
+    """ Returns the JSON patch that applies values_to_update to a single manifest. """
+    return generate_json_patch(data, compile_patch_rules(values_to_update))
@@ -0,0 +1,212 @@
+"""
+Offline bulk transformation of exported EKS manifests into AKS manifests.
+
+Takes a directory of exported manifests (e.g. SourceManifests/) or a multi-document
+`kubectl get -A -o yaml` dump, parses and rewrites the documents in a process pool
+and writes every resource to TargetManifests/ with a migration summary.
+The source is read as a stream of resources and results are written as batches
+complete, so only a bounded number of batches is held in memory.
+
+Usage:
+    python manifestPipeline.py SourceManifests/ [--target TargetManifests/] [--workers N]
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import jsonpatch
+
+import manifestIO
+
+from imageRegistry import get_image_index
+from manifestRules import get_rule_set
+
+SOURCE_MANIFEST_FOLDER = "./SourceManifests/"
+TARGET_MANIFEST_FOLDER = "./TargetManifests/"
+ACR_IMAGES_FILE = "./Data/ACRImages.csv"
+SUMMARY_FILE = "migration_summary.json"
+# Lookup tables set once per worker process by _init_worker
+_acr_images = {}
+_rule_set = None
+
+
+def iter_batches(source_path, batch_size):
+    """ Yields lists of (source file, resource text) pairs, reading the source lazily. """
+    batch = []
+    for entry in manifestIO.iter_manifest_texts(source_path):
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _init_worker(acr_images, rule_set):
+    global _acr_images, _rule_set
+    _acr_images = acr_images
+    _rule_set = rule_set
+
+
+def transform_documents(batch):
+    """
+    Parses and rewrites a batch of (source file, document text) pairs.
+    A `kind: List` document that reaches this point is still expanded into its items.
+    Returns one result dict per resource with the rewritten YAML text.
+    """
+    yaml = manifestIO.get_yaml()
+    results = []
+    for source_file, text in batch:
+        try:
+            document = yaml.load(text)
+        except Exception as e:
+            results.append({"source": source_file, "error": f"Invalid YAML: {e}"})
+            continue
+        if not isinstance(document, dict):
+            continue
+
+        if str(document.get("kind", "")).endswith("List"):
+            resources = document.get("items") or []
+        else:
+            resources = [document]
+        for resource in resources:
+            metadata = resource.get("metadata") or {}
+            result = {
+                "source": source_file,
+                "kind": str(resource.get("kind", "unknown")),
+                "name": str(metadata.get("name", "unnamed")),
+                "namespace": str(metadata.get("namespace", "")),
+            }
+            try:
+                patch = _rule_set.compile_patch(resource, _acr_images.get)
+                if patch:
+                    jsonpatch.apply_patch(resource, patch, in_place=True)
+                result["operations"] = len(patch)
+                result["yaml"] = manifestIO.dump_yaml(resource)
+            except Exception as e:
+                result["error"] = f"Error applying patch: {e}"
+            results.append(result)
+    return results
+
+
+def _target_filename(result, used_names):
+    """
+    kind_name.yaml as read by the deployment agent; the namespace is added only on a name clash.
+    Returns (filename, None), or (None, reason) when the resource would overwrite another target file.
+    """
+    identity = (result["kind"].lower(), result["namespace"].lower(), result["name"].lower())
+    kind, namespace, name = identity
+    for filename in (f"{kind}_{name}.yaml", f"{kind}_{namespace}_{name}.yaml"):
+        owner = used_names.get(filename)
+        if owner is None:
+            used_names[filename] = (identity, result["source"])
+            return filename, None
+        if owner[0] == identity:
+            # The same resource exported twice, e.g. in a dump and in a single file
+            break
+    return None, f"Target name collision: {filename} was already written for the resource from {owner[1]}"
+
+
+def _iter_results(batches, workers, acr_images, rule_set):
+    """
+    Yields the results of each batch as it completes, in source order.
+    At most two batches per worker are queued, so a large dump is never fully in memory.
+    """
+    first = next(batches, None)
+    second = next(batches, None)
+    if second is None:
+        # Not worth starting worker processes for a single batch
+        _init_worker(acr_images, rule_set)
+        if first is not None:
+            yield transform_documents(first)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(acr_images, rule_set)) as executor:
+        pending = deque([executor.submit(transform_documents, first), executor.submit(transform_documents, second)])
+        for batch in batches:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(executor.submit(transform_documents, batch))
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_manifest_pipeline(source_path=SOURCE_MANIFEST_FOLDER, target_dir=TARGET_MANIFEST_FOLDER,
+                          workers=None, batch_size=100):
+    """
+    Transforms every manifest under source_path and writes the results to target_dir.
+    Returns the summary report, which is also written to target_dir/migration_summary.json.
+    """
+    start = time.perf_counter()
+    acr_images = get_image_index(ACR_IMAGES_FILE).snapshot()
+    rule_set = get_rule_set()
+
+    os.makedirs(target_dir, exist_ok=True)
+    used_names = {}
+    summary = {
+        "source": source_path,
+        "target": target_dir,
+        "documents": 0,
+        "resources": 0,
+        "operations": 0,
+        "kinds": {},
+        "files": [],
+        "errors": [],
+    }
+
+    def counted_batches():
+        for batch in iter_batches(source_path, batch_size):
+            summary["documents"] += len(batch)
+            yield batch
+
+    for results in _iter_results(counted_batches(), workers, acr_images, rule_set):
+        for result in results:
+            if "error" in result:
+                summary["errors"].append({k: v for k, v in result.items() if k != "yaml"})
+                continue
+            filename, collision = _target_filename(result, used_names)
+            if collision:
+                result = {k: v for k, v in result.items() if k not in ("yaml", "operations")}
+                result["error"] = collision
+                summary["errors"].append(result)
+                continue
+            filepath = os.path.join(target_dir, filename)
+            with open(filepath, "w", encoding="utf-8") as file:
+                file.write(result["yaml"])
+            summary["resources"] += 1
+            summary["operations"] += result["operations"]
+            summary["kinds"][result["kind"]] = summary["kinds"].get(result["kind"], 0) + 1
+            summary["files"].append(filepath)
+
+    summary["duration_seconds"] = round(time.perf_counter() - start, 2)
+    with open(os.path.join(target_dir, SUMMARY_FILE), "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transform exported EKS manifests into AKS manifests offline")
+    parser.add_argument("source", nargs="?", default=SOURCE_MANIFEST_FOLDER,
+                        help="Directory of exported manifests or a multi-document YAML dump")
+    parser.add_argument("--target", default=TARGET_MANIFEST_FOLDER, help="Directory for the AKS manifests")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    summary = run_manifest_pipeline(args.source, args.target, args.workers)
+    print(f"Transformed {summary['resources']} resources from {summary['documents']} documents "
+          f"with {summary['operations']} patch operations in {summary['duration_seconds']}s")
+    for kind, count in sorted(summary["kinds"].items()):
+        print(f"  {kind}: {count}")
+    for error in summary["errors"]:
+        print(f"  Error in {error['source']}: {error['error']}")
+    print(f"Summary written to {os.path.join(args.target, SUMMARY_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
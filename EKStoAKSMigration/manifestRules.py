@@ -0,0 +1,165 @@
+"""
+Rule engine that rewrites EKS resources for AKS.
+
+Both data files are compiled once into per-kind rewrite tables:
+- Data/configuration_parameters.csv gives, per kind, where keys live (e.g. deployment
+  image -> .spec.template.spec.containers.image). Locations whose key has a handler
+  (annotations, image) get that rewrite.
+- Data/Annotations.csv gives the EKS -> AKS annotation renames; New_Value "same" keeps the value.
+
+A table maps a key path (list indices are not part of the path, matching the CSV notation)
+to a handler, plus the set of path prefixes worth descending into. A resource is rewritten
+in a single traversal that only visits the branches leading to a rule, so adding rows to
+the CSVs needs no code changes and the cost stays linear in the resource size.
+"""
+import csv
+import os
+import threading
+
+from manifestPatch import escape_json_pointer
+
+CONFIGURATION_FILE = os.path.join(".", "Data", "configuration_parameters.csv")
+ANNOTATIONS_FILE = os.path.join(".", "Data", "Annotations.csv")
+
+LAST_APPLIED_ANNOTATION = "kubectl.kubernetes.io/last-applied-configuration"
+
+# Cluster generated fields removed from every kind
+DROPPED_PATHS = [".metadata.creationTimestamp", ".status"]
+
+# configuration_parameters.csv Key -> handler
+LOCATION_HANDLERS = {
+    "annotations": "annotations",
+    "image": "image",
+}
+
+# Used for kinds without rows in configuration_parameters.csv
+DEFAULT_LOCATIONS = {".metadata.annotations": "annotations"}
+
+
+def _path(location):
+    return tuple(part for part in location.strip().split(".") if part)
+
+
+class RuleTable:
+    """ Handlers of one kind keyed by key path, and the prefixes leading to them. """
+
+    def __init__(self, locations):
+        self.handlers = {}
+        self.prefixes = set()
+        for location, handler in locations.items():
+            path = _path(location)
+            self.handlers[path] = handler
+            self.prefixes.update(path[:i] for i in range(1, len(path)))
+
+
+class CompiledRuleSet:
+    def __init__(self, kind_locations, annotation_renames):
+        """
+        kind_locations maps a lower case kind to {location: handler}.
+        annotation_renames maps an EKS annotation to (AKS annotation, new value).
+        """
+        self.tables = {}
+        for kind, locations in kind_locations.items():
+            self.tables[kind] = RuleTable(dict(locations, **{path: "remove" for path in DROPPED_PATHS}))
+        self.default_table = RuleTable(dict(DEFAULT_LOCATIONS, **{path: "remove" for path in DROPPED_PATHS}))
+
+        # Entries without a prefix (e.g. "aws-load-balancer-backend-protocol") match any prefix
+        self.annotation_renames = {}
+        self.annotation_name_renames = {}
+        for eks, rename in annotation_renames.items():
+            if "/" in eks:
+                self.annotation_renames[eks] = rename
+            else:
+                self.annotation_name_renames[eks] = rename
+
+    def table_for(self, kind):
+        return self.tables.get(str(kind).lower(), self.default_table)
+
+    def compile_patch(self, output, acr_lookup):
+        """
+        Returns the RFC 6902 operations that rewrite one resource.
+        acr_lookup takes an image name (e.g. "examples-bookinfo-reviews-v2:1.16.4") and returns the ACR name or None.
+        """
+        table = self.table_for(output.get("kind", ""))
+        patch = []
+        stack = [(output, (), "")]
+        while stack:
+            node, keys, pointer = stack.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    child_keys = keys + (key,)
+                    child_pointer = f"{pointer}/{escape_json_pointer(key)}"
+                    handler = table.handlers.get(child_keys)
+                    if handler is not None:
+                        getattr(self, "_rewrite_" + handler)(value, child_pointer, patch, acr_lookup)
+                    elif child_keys in table.prefixes and isinstance(value, (dict, list)):
+                        stack.append((value, child_keys, child_pointer))
+            elif isinstance(node, list):
+                stack.extend((item, keys, f"{pointer}/{idx}") for idx, item in enumerate(node))
+        return patch
+
+    def _rewrite_remove(self, value, pointer, patch, acr_lookup):
+        patch.append({"op": "remove", "path": pointer})
+
+    def _rewrite_image(self, value, pointer, patch, acr_lookup):
+        if not isinstance(value, str):
+            return
+        source_image = value.split("/")[-1]
+        acr = acr_lookup(source_image)
+        if acr is not None and value != acr + ".azurecr.io/" + source_image:
+            patch.append({"op": "replace", "path": pointer, "value": acr + ".azurecr.io/" + source_image})
+
+    def _annotation_rename(self, key):
+        if key in self.annotation_renames:
+            return self.annotation_renames[key]
+        return self.annotation_name_renames.get(key.split("/")[-1])
+
+    def _rewrite_annotations(self, annotations, pointer, patch, acr_lookup):
+        if not isinstance(annotations, dict):
+            return
+        for key, value in annotations.items():
+            rename = self._annotation_rename(key)
+            if rename is not None:
+                aks_key, new_value = rename
+                if aks_key != key:
+                    patch.append({"op": "remove", "path": f"{pointer}/{escape_json_pointer(key)}"})
+                patch.append({
+                    "op": "add",
+                    "path": f"{pointer}/{escape_json_pointer(aks_key)}",
+                    "value": value if new_value == "same" else new_value
+                })
+            elif 'aws' in key.lower() or key == LAST_APPLIED_ANNOTATION:
+                patch.append({"op": "remove", "path": f"{pointer}/{escape_json_pointer(key)}"})
+
+
+def compile_rule_set(configuration_file=CONFIGURATION_FILE, annotations_file=ANNOTATIONS_FILE):
+    """ Loads both CSVs and compiles them into a CompiledRuleSet. """
+    kind_locations = {}
+    if os.path.exists(configuration_file):
+        with open(configuration_file, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                handler = LOCATION_HANDLERS.get((row.get("Key") or "").strip())
+                if handler and row.get("Location"):
+                    kind_locations.setdefault(row["Item"].strip().lower(), {})[row["Location"]] = handler
+
+    annotation_renames = {}
+    if os.path.exists(annotations_file):
+        with open(annotations_file, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                if row.get("EKS"):
+                    annotation_renames[row["EKS"].strip()] = (row["AKS"].strip(), row["New_Value"].strip())
+
+    return CompiledRuleSet(kind_locations, annotation_renames)
+
+
+_rule_sets = {}
+_rule_sets_lock = threading.Lock()
+
+
+def get_rule_set(configuration_file=CONFIGURATION_FILE, annotations_file=ANNOTATIONS_FILE):
+    """ Returns the rule set compiled once per pair of CSV files. """
+    key = (os.path.abspath(configuration_file), os.path.abspath(annotations_file))
+    with _rule_sets_lock:
+        if key not in _rule_sets:
+            _rule_sets[key] = compile_rule_set(configuration_file, annotations_file)
+        return _rule_sets[key]
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from acrImportScheduler import ACRImportScheduler
+from imageRegistry import ACRImageIndex
+
+
+class FakeRunner:
+    """ Answers `az acr import` with scripted (returncode, stderr) replies per source image. """
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.calls = []
+
+    async def run(self, command):
+        source = command[command.index("--source") + 1]
+        self.calls.append(source)
+        replies = self.replies.get(source) or [(0, "")]
+        returncode, stderr = replies.pop(0) if len(replies) > 1 else replies[0]
+        return returncode, "", stderr
+
+
+def _run(scheduler, images):
+    return asyncio.run(scheduler.import_images(images, progress=None))
+
+
+def test_imports_are_deduplicated_skipped_and_retried(tmp_path):
+    index_path = tmp_path / "ACRImages.csv"
+    index_path.write_text("ACR,Image\nmyacr,ratings:1\n", encoding="utf-8")
+    runner = FakeRunner({
+        "a.ecr/x/app:1": [(1, "503 Service Unavailable"), (0, "")],
+        "a.ecr/x/bad:1": [(1, "MANIFEST_UNKNOWN: manifest unknown")],
+    })
+    scheduler = ACRImportScheduler("myacr", "az", runner=runner, backoff_seconds=0,
+                                   image_index=ACRImageIndex(str(index_path)))
+
+    results = _run(scheduler, [
+        "a.ecr/x/app:1", "a.ecr/x/app:1", "b.ecr/y/app:1", "a.ecr/x/ratings:1", "a.ecr/x/bad:1",
+    ])
+
+    by_source = {(result["source"], result["status"]): result for result in results}
+    assert sorted(by_source) == [
+        ("a.ecr/x/app:1", "imported"), ("a.ecr/x/bad:1", "failed"), ("a.ecr/x/ratings:1", "skipped"),
+        ("b.ecr/y/app:1", "conflict"),
+    ]
+    # A transient error is retried, a permanent one is not
+    assert by_source[("a.ecr/x/app:1", "imported")]["attempts"] == 2
+    assert by_source[("a.ecr/x/bad:1", "failed")]["attempts"] == 1
+    assert "a.ecr/x/app:1" in by_source[("b.ecr/y/app:1", "conflict")]["message"]
+    assert sorted(runner.calls) == ["a.ecr/x/app:1", "a.ecr/x/app:1", "a.ecr/x/bad:1"]
+    assert ACRImageIndex(str(index_path)).contains("app:1", "myacr")
+
+
+def test_transient_errors_stop_after_max_retries(tmp_path):
+    runner = FakeRunner({"a.ecr/x/app:1": [(1, "toomanyrequests: rate limit")]})
+    scheduler = ACRImportScheduler("myacr", "az", runner=runner, max_retries=2, backoff_seconds=0,
+                                   image_index=ACRImageIndex(str(tmp_path / "ACRImages.csv")))
+
+    (result,) = _run(scheduler, ["a.ecr/x/app:1"])
+
+    assert result["status"] == "failed" and result["attempts"] == 3
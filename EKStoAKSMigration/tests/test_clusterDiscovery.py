@@ -0,0 +1,108 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import manifestIO
+from clusterDiscovery import ALL_NAMESPACES, ClusterDiscovery, FixtureLister, RecordingLister, normalize_kind
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "cluster")
+
+
+class CountingLister(FixtureLister):
+    def __init__(self):
+        super().__init__(FIXTURE_DIR)
+        self.calls = []
+
+    def list_page(self, kind, namespace, limit, continue_token=None):
+        self.calls.append((kind, namespace, continue_token))
+        return super().list_page(kind, namespace, limit, continue_token)
+
+
+def test_pages_are_joined_and_filled_in(tmp_path):
+    discovery = ClusterDiscovery(lister=CountingLister(), snapshot_dir=str(tmp_path))
+
+    items = discovery.list_resources("deploy")
+
+    assert [item["metadata"]["name"] for item in items] == ["productpage", "reviews", "web"]
+    assert all(item["kind"] == "Deployment" and item["apiVersion"] == "apps/v1" for item in items)
+    assert "managedFields" not in items[2]["metadata"]
+
+
+def test_snapshot_is_reused_within_ttl(tmp_path):
+    lister = CountingLister()
+    discovery = ClusterDiscovery(lister=lister, snapshot_dir=str(tmp_path))
+
+    discovery.list_resources("deployments")
+    assert discovery.get_resource("Deployment", "reviews", "bookinfo")["spec"]["replicas"] == 2
+    assert len(lister.calls) == 2  # two pages, listed once
+
+    # A new session reads the persisted snapshot instead of listing again
+    lister = CountingLister()
+    ClusterDiscovery(lister=lister, snapshot_dir=str(tmp_path)).list_resources("deployment")
+    assert lister.calls == []
+
+
+def test_expired_snapshot_is_listed_again(tmp_path):
+    lister = CountingLister()
+    discovery = ClusterDiscovery(lister=lister, snapshot_dir=str(tmp_path), ttl_seconds=0)
+
+    discovery.list_resources("namespace")
+    discovery.list_resources("namespace")
+
+    assert len(lister.calls) == 2
+
+
+def test_secret_values_are_not_written_to_disk(tmp_path):
+    discovery = ClusterDiscovery(lister=CountingLister(), snapshot_dir=str(tmp_path))
+
+    discovery.get_resource("secret", "db-password")
+
+    with open(tmp_path / "fixture" / "secret_all.json", "r", encoding="utf-8") as file:
+        assert "c2VjcmV0" not in file.read()
+    # The file cannot serve the values, so a new session lists Secrets again
+    lister = CountingLister()
+    ClusterDiscovery(lister=lister, snapshot_dir=str(tmp_path)).list_resources("secret")
+    assert len(lister.calls) == 1
+
+
+def test_exported_secret_keeps_its_data(tmp_path):
+    discovery = ClusterDiscovery(lister=CountingLister(), snapshot_dir=str(tmp_path / "snapshots"))
+    path = tmp_path / "secret.yaml"
+
+    manifestIO.write_manifests(str(path), discovery.list_resources("secret"))
+
+    exported = next(manifestIO.iter_manifests(str(path), typ="safe"))
+    assert exported["data"] == {"password": "c2VjcmV0"}
+    assert exported["kind"] == "Secret"
+
+
+def test_recorded_fixtures_have_no_secret_values(tmp_path):
+    recorder = RecordingLister(CountingLister(), str(tmp_path))
+
+    page = recorder.list_page("secret", ALL_NAMESPACES, 10)
+
+    assert page["items"][0]["data"] == {"password": "c2VjcmV0"}
+    with open(tmp_path / "secret_all.json", "r", encoding="utf-8") as file:
+        assert "c2VjcmV0" not in file.read()
+
+
+def test_kinds_outside_the_typed_clients():
+    assert normalize_kind("ClusterRoles") == "clusterrole"
+    assert normalize_kind("netpol") == "networkpolicy"
+    assert normalize_kind("certificates.cert-manager.io") == "certificates.cert-manager.io"
+
+
+def test_custom_resources_are_listed(tmp_path):
+    discovery = ClusterDiscovery(lister=CountingLister(), snapshot_dir=str(tmp_path))
+
+    assert discovery.get_resource("clusterrole", "view") is not None
+    certificate = discovery.get_resource("certificates.cert-manager.io", "bookinfo-tls")
+    assert certificate["kind"] == "Certificate"
+
+
+def test_fixture_files_are_valid():
+    for name in os.listdir(FIXTURE_DIR):
+        with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8") as file:
+            json.load(file)
@@ -0,0 +1,26 @@
+import csv
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from imageRegistry import ACRImageIndex
+
+
+def test_image_held_by_two_acrs_keeps_both_rows(tmp_path):
+    path = tmp_path / "ACRImages.csv"
+    path.write_text("ACR,Image\nacr-one,reviews:1.16.4\n", encoding="utf-8")
+    index = ACRImageIndex(str(path))
+
+    assert index.add_images([("acr-two", "reviews:1.16.4"), ("acr-one", "ratings:1.16.4")]) == 2
+    assert index.add_images([("acr-two", "reviews:1.16.4")]) == 0
+
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = [(row["ACR"], row["Image"]) for row in csv.DictReader(file)]
+    assert rows == [("acr-one", "reviews:1.16.4"), ("acr-two", "reviews:1.16.4"), ("acr-one", "ratings:1.16.4")]
+
+    reloaded = ACRImageIndex(str(path))
+    assert reloaded.lookup("reviews:1.16.4") == "acr-one"
+    assert reloaded.contains("reviews:1.16.4", "acr-two")
+    assert not reloaded.contains("ratings:1.16.4", "acr-two")
+    assert reloaded.snapshot() == {"reviews:1.16.4": "acr-one", "ratings:1.16.4": "acr-one"}
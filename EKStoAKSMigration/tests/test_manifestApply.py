@@ -0,0 +1,142 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifestApply import apply_manifests, strip_server_fields
+
+EXPORTED_SERVICE = """\
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+  namespace: shop
+  uid: 6f1c9b0e-0000-4000-8000-000000000000
+  resourceVersion: "48213"
+  creationTimestamp: "2024-05-01T10:00:00Z"
+  generation: 3
+  managedFields:
+  - manager: kubectl
+  annotations:
+    kubectl.kubernetes.io/last-applied-configuration: '{"kind":"Service"}'
+    team: storefront
+spec:
+  clusterIP: 10.100.12.7
+  clusterIPs:
+  - 10.100.12.7
+  ports:
+  - port: 80
+status:
+  loadBalancer: {}
+"""
+
+
+class RecordingApplier:
+    def __init__(self):
+        self.bodies = []
+
+    def apply(self, body, dry_run=False):
+        self.bodies.append(body)
+
+
+def test_server_fields_are_stripped_before_apply(tmp_path):
+    (tmp_path / "service.yaml").write_text(EXPORTED_SERVICE, encoding="utf-8")
+    applier = RecordingApplier()
+
+    results = apply_manifests(target_dir=str(tmp_path), applier=applier)
+
+    assert [row["status"] for row in results] == ["applied"]
+    body = applier.bodies[0]
+    assert body["metadata"] == {"name": "web", "namespace": "shop", "annotations": {"team": "storefront"}}
+    assert body["spec"] == {"ports": [{"port": 80}]}
+    assert "status" not in body
+
+
+def test_headless_service_keeps_cluster_ip_none():
+    body = {"apiVersion": "v1", "kind": "Service", "metadata": {"name": "db"}, "spec": {"clusterIP": "None"}}
+
+    assert strip_server_fields(body)["spec"] == {"clusterIP": "None"}
+    assert body["spec"] == {"clusterIP": "None"}
+
+
+CONTROLLER_OWNED = """\
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: web
+  namespace: shop
+spec:
+  replicas: 2
+---
+apiVersion: apps/v1
+kind: ReplicaSet
+metadata:
+  name: web-5d9c
+  namespace: shop
+  ownerReferences:
+  - apiVersion: apps/v1
+    kind: Deployment
+    name: web
+    controller: true
+---
+apiVersion: v1
+kind: Pod
+metadata:
+  name: web-5d9c-x2k8
+  namespace: shop
+  ownerReferences:
+  - apiVersion: apps/v1
+    kind: ReplicaSet
+    name: web-5d9c
+    controller: true
+---
+apiVersion: v1
+kind: Pod
+metadata:
+  name: debug
+  namespace: shop
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: web
+  namespace: shop
+spec:
+  selector:
+    app: web
+---
+apiVersion: v1
+kind: Endpoints
+metadata:
+  name: web
+  namespace: shop
+---
+apiVersion: discovery.k8s.io/v1
+kind: EndpointSlice
+metadata:
+  name: web-abcde
+  namespace: shop
+  labels:
+    endpointslice.kubernetes.io/managed-by: endpointslice-controller.k8s.io
+"""
+
+
+def test_controller_created_objects_are_skipped(tmp_path):
+    (tmp_path / "dump.yaml").write_text(CONTROLLER_OWNED, encoding="utf-8")
+    applier = RecordingApplier()
+
+    results = apply_manifests(target_dir=str(tmp_path), applier=applier)
+
+    assert sorted((body["kind"], body["metadata"]["name"]) for body in applier.bodies) == [
+        ("Deployment", "web"), ("Pod", "debug"), ("Service", "web")
+    ]
+    skipped = sorted((row["kind"], row["name"]) for row in results if row["status"] == "skipped")
+    assert skipped == [("EndpointSlice", "web-abcde"), ("Endpoints", "web"), ("Pod", "web-5d9c-x2k8"),
+                       ("ReplicaSet", "web-5d9c")]
+
+
+def test_owner_references_are_kept():
+    owner = [{"apiVersion": "v1", "kind": "ConfigMap", "name": "parent", "uid": "1"}]
+    body = {"apiVersion": "v1", "kind": "ConfigMap", "metadata": {"name": "child", "ownerReferences": owner}}
+
+    assert strip_server_fields(body)["metadata"]["ownerReferences"] == owner
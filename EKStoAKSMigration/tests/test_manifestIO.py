@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifestIO import iter_manifests
+
+LIST_DUMP = """\
+apiVersion: v1
+kind: List
+items:
+# first item
+- apiVersion: v1
+  kind: ConfigMap
+  metadata:
+    name: scripts
+  data:
+    run.sh: |
+      #!/bin/bash
+      # install dependencies
+
+      set -e
+      echo "# not a comment"
+- apiVersion: v1
+  kind: Service
+  metadata:
+    name: web  # trailing comment
+metadata:
+  resourceVersion: ""
+"""
+
+
+def test_list_items_keep_hash_lines_in_block_scalars(tmp_path):
+    path = tmp_path / "dump.yaml"
+    path.write_text(LIST_DUMP, encoding="utf-8")
+
+    resources = list(iter_manifests(str(path), typ="safe"))
+
+    assert [resource["kind"] for resource in resources] == ["ConfigMap", "Service"]
+    assert resources[0]["data"]["run.sh"] == (
+        '#!/bin/bash\n# install dependencies\n\nset -e\necho "# not a comment"\n'
+    )
+    assert resources[1]["metadata"]["name"] == "web"
+
+
+def test_multi_document_file(tmp_path):
+    path = tmp_path / "docs.yaml"
+    path.write_text("kind: A\n---\n# comment\nkind: B\n", encoding="utf-8")
+
+    assert [resource["kind"] for resource in iter_manifests(str(path), typ="safe")] == ["A", "B"]
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import jsonpatch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifestPatch import compile_patch_rules, escape_json_pointer, generate_json_patch, unescape_json_pointer, value_hash
+
+LAST_APPLIED = "kubectl.kubernetes.io/last-applied-configuration"
+
+
+def _manifest():
+    return {
+        "kind": "Service",
+        "metadata": {
+            "name": "reviews",
+            "annotations": {
+                LAST_APPLIED: "{}",
+                "example.com/a~b": "internal",
+            },
+        },
+        "spec": {
+            "type": "LoadBalancer",
+            "ports": [{"port": 80, "protocol": "TCP"}, {"port": 443, "protocol": "TCP"}],
+        },
+    }
+
+
+def test_keys_with_tilde_and_slash_are_escaped():
+    assert escape_json_pointer("example.com/a~b") == "example.com~1a~0b"
+    assert unescape_json_pointer("example.com~1a~0b") == "example.com/a~b"
+    # "~01" must come back as "~1", not "/"
+    assert unescape_json_pointer(escape_json_pointer("~1")) == "~1"
+
+    rules = compile_patch_rules([
+        {"key": LAST_APPLIED, "old_value": "{}", "action": "remove"},
+        {"key": "example.com~1a~0b", "old_value": "internal", "action": "replace", "new_value": "external"},
+    ])
+    patch = generate_json_patch(_manifest(), rules)
+
+    assert patch == [
+        {"op": "remove", "path": "/metadata/annotations/kubectl.kubernetes.io~1last-applied-configuration"},
+        {"op": "replace", "path": "/metadata/annotations/example.com~1a~0b", "value": "external"},
+    ]
+    patched = jsonpatch.apply_patch(_manifest(), patch)
+    assert patched["metadata"]["annotations"] == {"example.com/a~b": "external"}
+
+
+def test_remove_replace_and_add_operations():
+    manifest = _manifest()
+    rules = compile_patch_rules([
+        {"key": "type", "old_value": "LoadBalancer", "action": "replace", "new_value": "ClusterIP"},
+        {"key": "protocol", "old_value": "TCP", "action": "add", "new_value": "UDP"},
+        {"key": "annotations", "old_value": manifest["metadata"]["annotations"], "action": "remove"},
+    ])
+    patch = generate_json_patch(manifest, rules)
+
+    assert patch == [
+        {"op": "remove", "path": "/metadata/annotations"},
+        {"op": "replace", "path": "/spec/type", "value": "ClusterIP"},
+        {"op": "add", "path": "/spec/ports/0/protocol", "value": "UDP"},
+        {"op": "add", "path": "/spec/ports/1/protocol", "value": "UDP"},
+    ]
+    patched = jsonpatch.apply_patch(manifest, patch)
+    assert "annotations" not in patched["metadata"]
+    assert patched["spec"] == {"type": "ClusterIP", "ports": [{"port": 80, "protocol": "UDP"}, {"port": 443, "protocol": "UDP"}]}
+
+
+def test_rules_are_keyed_by_value_hash():
+    first = {"key": "selector", "old_value": {"app": "reviews", "tier": "web"}, "action": "replace", "new_value": {"app": "reviews"}}
+    second = {"key": "selector", "old_value": {"tier": "web", "app": "reviews"}, "action": "remove"}
+    rules = compile_patch_rules([first, second])
+
+    # Equal values hash the same regardless of key order, so the first rule wins
+    assert value_hash(first["old_value"]) == value_hash(second["old_value"])
+    assert rules == {("selector", value_hash(first["old_value"])): first}
+
+    manifest = {"spec": {"selector": {"tier": "web", "app": "reviews"}}, "status": {"selector": {"app": "ratings"}}}
+    assert generate_json_patch(manifest, rules) == [{"op": "replace", "path": "/spec/selector", "value": {"app": "reviews"}}]
+    assert generate_json_patch(manifest, compile_patch_rules([])) == []
@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifestPipeline import SUMMARY_FILE, run_manifest_pipeline
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DUMP = """\
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: settings
+  namespace: shop
+data:
+  mode: a
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: settings
+  namespace: billing
+data:
+  mode: b
+---
+apiVersion: v1
+kind: ConfigMap
+metadata:
+  name: settings
+  namespace: shop
+data:
+  mode: c
+"""
+
+
+def test_target_name_collisions_are_failures(tmp_path, monkeypatch):
+    # The rule and image CSVs are read from Data/ relative to the project
+    monkeypatch.chdir(PROJECT_DIR)
+    source = tmp_path / "dump.yaml"
+    source.write_text(DUMP, encoding="utf-8")
+    target = tmp_path / "target"
+
+    summary = run_manifest_pipeline(str(source), str(target), workers=1)
+
+    assert sorted(os.path.basename(path) for path in summary["files"]) == [
+        "configmap_billing_settings.yaml", "configmap_settings.yaml"
+    ]
+    assert summary["resources"] == 2
+    assert [(error["namespace"], error["error"].split(":")[0]) for error in summary["errors"]] == [
+        ("shop", "Target name collision")
+    ]
+    assert "mode: a" in (target / "configmap_settings.yaml").read_text(encoding="utf-8")
+    with open(target / SUMMARY_FILE, "r", encoding="utf-8") as file:
+        assert len(json.load(file)["errors"]) == 1
@@ -0,0 +1,105 @@
+import os
+import sys
+
+import jsonpatch
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manifestRules import DROPPED_PATHS, LAST_APPLIED_ANNOTATION, compile_rule_set
+
+CONFIGURATION = """Item,Key,Location,Retrieval Type,Plural
+deployment,name,.metadata.name,Parent,deployments
+deployment,image,.spec.template.spec.containers.image, Child,deployments
+deployment,annotations,.metadata.annotations,Parent,deployments
+"""
+
+ANNOTATIONS = """EKS,AKS,New_Value
+service.beta.kubernetes.io/aws-load-balancer-internal,service.beta.kubernetes.io/azure-load-balancer-internal,same
+aws-load-balancer-backend-protocol,appgw.ingress.kubernetes.io/backend-protocol,https
+"""
+
+ACR_IMAGES = {"reviews:1.16.4": "aksacr"}
+
+
+def _rule_set(tmp_path):
+    configuration = tmp_path / "configuration_parameters.csv"
+    configuration.write_text(CONFIGURATION, encoding="utf-8")
+    annotations = tmp_path / "Annotations.csv"
+    annotations.write_text(ANNOTATIONS, encoding="utf-8")
+    return compile_rule_set(str(configuration), str(annotations))
+
+
+def _deployment():
+    return {
+        "kind": "Deployment",
+        "metadata": {
+            "name": "reviews",
+            "creationTimestamp": "2024-01-01T00:00:00Z",
+            "annotations": {
+                LAST_APPLIED_ANNOTATION: "{}",
+                "service.beta.kubernetes.io/aws-load-balancer-internal": "true",
+                "alb.ingress.kubernetes.io/aws-load-balancer-backend-protocol": "http",
+                "team": "bookinfo",
+            },
+        },
+        "spec": {
+            "template": {
+                "spec": {
+                    "containers": [
+                        {"name": "reviews", "image": "123456789012.dkr.ecr.us-east-1.amazonaws.com/reviews:1.16.4"},
+                        {"name": "sidecar", "image": "proxy:1.0"},
+                        {"name": "migrated", "image": "aksacr.azurecr.io/reviews:1.16.4"},
+                    ]
+                }
+            }
+        },
+        "status": {"replicas": 1},
+    }
+
+
+def test_deployment_patch_covers_every_handler(tmp_path):
+    patch = _rule_set(tmp_path).compile_patch(_deployment(), ACR_IMAGES.get)
+
+    annotations = "/metadata/annotations"
+    assert patch == [
+        {"op": "remove", "path": "/status"},
+        {"op": "replace", "path": "/spec/template/spec/containers/0/image",
+         "value": "aksacr.azurecr.io/reviews:1.16.4"},
+        {"op": "remove", "path": "/metadata/creationTimestamp"},
+        {"op": "remove", "path": f"{annotations}/kubectl.kubernetes.io~1last-applied-configuration"},
+        {"op": "remove", "path": f"{annotations}/service.beta.kubernetes.io~1aws-load-balancer-internal"},
+        {"op": "add", "path": f"{annotations}/service.beta.kubernetes.io~1azure-load-balancer-internal",
+         "value": "true"},
+        {"op": "remove", "path": f"{annotations}/alb.ingress.kubernetes.io~1aws-load-balancer-backend-protocol"},
+        {"op": "add", "path": f"{annotations}/appgw.ingress.kubernetes.io~1backend-protocol", "value": "https"},
+    ]
+
+    patched = jsonpatch.apply_patch(_deployment(), patch)
+    assert patched["metadata"] == {
+        "name": "reviews",
+        "annotations": {
+            "team": "bookinfo",
+            "service.beta.kubernetes.io/azure-load-balancer-internal": "true",
+            "appgw.ingress.kubernetes.io/backend-protocol": "https",
+        },
+    }
+    assert "status" not in patched
+    assert [c["image"] for c in patched["spec"]["template"]["spec"]["containers"]] == [
+        "aksacr.azurecr.io/reviews:1.16.4", "proxy:1.0", "aksacr.azurecr.io/reviews:1.16.4"]
+
+
+def test_kinds_without_rows_use_the_default_table(tmp_path):
+    rule_set = _rule_set(tmp_path)
+    assert set(rule_set.table_for("ConfigMap").handlers) == {
+        ("metadata", "annotations"), *(tuple(path.strip(".").split(".")) for path in DROPPED_PATHS)}
+
+    config_map = {
+        "kind": "ConfigMap",
+        "metadata": {"name": "settings", "creationTimestamp": "2024-01-01T00:00:00Z",
+                     "annotations": {"eks.amazonaws.com/role-arn": "arn"}},
+        "data": {"image": "reviews:1.16.4"},
+    }
+    assert rule_set.compile_patch(config_map, ACR_IMAGES.get) == [
+        {"op": "remove", "path": "/metadata/creationTimestamp"},
+        {"op": "remove", "path": "/metadata/annotations/eks.amazonaws.com~1role-arn"},
+    ]
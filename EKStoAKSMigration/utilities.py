@@ -5,9 +5,11 @@ import subprocess
 import pandas as pd
 from azure.identity import DefaultAzureCredential
 from azure.keyvault.secrets import SecretClient
-from ruamel.yaml import YAML
 import jsonpatch
 
+import manifestIO
+from manifestPatch import compile_manifest_patch
+
 KUBERNETES_CONFIGURATION_FILE = ".\\Data\\configuration_parameters.csv"
 
 def write_to_file_md(path: str, content: str):
@@ -38,69 +40,12 @@ def get_kv_secret_value(credential, secret_names):
         print(f"Error retrieving secret: {e.stderr}")
         raise
 
-def get_dict_by_criteria(dict_list, criteria):
-    """
-    Returns the first dictionary from dict_list that matches all key-value pairs in criteria.
-    """
-    if not dict_list or not criteria:
-        return None
-    
-    # Iterate through each dictionary in the list
-    for d in dict_list:
-        if all(d.get(k) == v for k, v in criteria.items()):
-            return d
-    return None
-
-def extract_jsonpaths(data, values_to_update, keys, old_values, path="", patch=None):
-    paths = []
-    if isinstance(data, dict):
-        for k, v in data.items():
-            k = k.replace("/", "~1") # Needed for JSON Patch compliance
-            # if k == "creationTimestamp":
-            #     print("Found it!")
-            #     print(old_values)
-            #     print(v == old_values)
-            #     print(type(old_values[0]).__name__)
-            #     print(k in keys, v in old_values)
-            # print(f"Processing key: {k}, value: {v}")
-            # print("Value Type:", type(k).__name__, type(v).__name__)
-              
-            new_path = f"{path}/{k}" if path else f"/{k}"
-            paths.append(new_path)
-            if k in keys and v in old_values:
-                updated_value = get_dict_by_criteria(values_to_update, {"key": k, "old_value": v})
-                # print(f"Updated value found: {updated_value}")
-                patch_dict = {
-                    "op": updated_value["action"],
-                    "path": new_path,
-                    "value": updated_value["new_value"]
-                }
-                patch.append(patch_dict)
-            # print(f"New path added: {new_path}")
-            # print("Extrating paths from value:", v)
-            paths.extend(extract_jsonpaths(v, values_to_update, keys, old_values, new_path, patch)) 
-
-    elif isinstance(data, list):
-        for idx, item in enumerate(data):
-            new_path = f"{path}/{idx}"
-            paths.append(new_path)
-            paths.extend(extract_jsonpaths(item, values_to_update, keys, old_values, new_path, patch))
-
-    return paths, patch
-
 def update_yaml_key(resource_type, data, values_to_update, destination_path):
-    keys = [item["key"] for item in values_to_update]
-    old_values = [item["old_value"] for item in values_to_update]
-    # print("keys:", keys)
-    # print("old values:", old_values)
     print("")
+    return apply_yaml_patch(data, compile_manifest_patch(data, values_to_update), destination_path)
+
+def apply_yaml_patch(data, patch_operations, destination_path):
     try:
-        paths = []
-        patch_operations = []
-        paths, patch_operations = extract_jsonpaths(data, values_to_update, keys, old_values, paths, patch_operations)
-        print("************************END OF FUNCTION **********************")
-        print("")
-        print("Patch operations:", patch_operations)
         if not patch_operations:
             print("No patch operations generated")
             write_to_file(destination_path, data)
@@ -123,31 +68,25 @@ def update_yaml_key(resource_type, data, values_to_update, destination_path):
         return data
 
 def read_file_if_exists(filepath):
-    yaml = YAML()
     if os.path.exists(filepath):
-        with open(filepath, "r", encoding="utf-8") as file:
-            print(f"File {filepath} exists.")
-            data = yaml.load(file)
-            print(f"YAML content loaded from {filepath}.")
+        print(f"File {filepath} exists.")
+        data = manifestIO.read_manifest(filepath)
+        print(f"YAML content loaded from {filepath}.")
         return data
     else:
         return None
     
 def write_to_file(filepath, data):
     if isinstance(data, dict):
-        yaml = YAML()
-        yaml.indent(mapping=2, sequence=4, offset=2)
-        with open(filepath, "w") as file:
-            yaml.dump(data, file)
+        with manifestIO.ManifestWriter(filepath) as writer:
+            writer.write(data)
     else:
         with open(filepath, "w") as file:
             file.write(data)
     return filepath
-    # yaml = YAML()
-    # with open(filepath, "w") as file:
-    #     yaml.dump(data, file)
-    #     print(f"Data written to {filepath} successfully.")
-    # return filepath
+
+def to_yaml_string(data):
+    return manifestIO.dump_yaml(data)
 
 def write_to_csv(filepath, data):
     """ Appends data to a CSV file at the specified filepath."""
@@ -0,0 +1,161 @@
+"""
+Runs the migration group chat against fake agents and compares turn counts and
+latency of the workflow routing (ChatRouter) with the previous routing, which
+asked the QUERY_ORCHESTRATOR for the next agent after every turn and only let the
+orchestrator end the chat.
+
+Each fake agent answers with canned text after a delay proportional to the
+history it has to read, so the latency reflects the extra orchestrator turns.
+No Azure or Semantic Kernel packages are needed.
+
+Usage:
+    python benchmarks/group_chat_turns.py [--turn-delay 0.05] [--max-iterations 10]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.util.ChatRouting import ChatRouter, COMPLETION_MARKER, HANDOFF_ISSUE_MARKER, is_handoff_problem
+
+ORCHESTRATOR = "QUERY_ORCHESTRATOR"
+WORKFLOW = ["Analyst", "Planner", "Azure_Developer"]
+
+REPLIES = {
+    "Analyst": "Runtime java11, handler S3Handler::handleRequest, uses S3 GetObject. ANALYSIS COMPLETE - READY FOR MIGRATION PLANNING",
+    "Planner": "Map S3 trigger to a Blob trigger, S3 client to BlobServiceClient. MIGRATION PLAN COMPLETE - READY FOR AZ_DEVELOPER",
+    "Azure_Developer": f"Wrote function.json, host.json and the Java function. {COMPLETION_MARKER}",
+}
+
+
+@dataclass
+class Message:
+    name: Optional[str]
+    content: str
+
+
+class FakeAgents:
+    def __init__(self, turn_delay: float, blocked: Optional[str] = None):
+        self.turn_delay = turn_delay
+        self.blocked = blocked
+        self.turns = 0
+
+    async def invoke(self, name: str, history: List[Message]) -> Message:
+        self.turns += 1
+        # Latency grows with the conversation the agent has to read
+        await asyncio.sleep(self.turn_delay * (1 + len(history) / 4))
+        if name == ORCHESTRATOR:
+            return Message(name, self._orchestrate(history))
+        if name == self.blocked:
+            self.blocked = None
+            return Message(name, f"The analysis does not name the event source. {HANDOFF_ISSUE_MARKER}")
+        return Message(name, REPLIES[name])
+
+    def _orchestrate(self, history: List[Message]) -> str:
+        last = next((m for m in reversed(history) if m.name in WORKFLOW), None)
+        if last is None:
+            return WORKFLOW[0]
+        if is_handoff_problem(last):
+            return WORKFLOW[max(WORKFLOW.index(last.name) - 1, 0)]
+        index = WORKFLOW.index(last.name) + 1
+        # The previous orchestrator instructions ended the chat with this word
+        return WORKFLOW[index] if index < len(WORKFLOW) else "PERFECTUS"
+
+
+async def run_chat(select: Callable, terminate: Callable, agents: FakeAgents, max_iterations: int):
+    """ Mirrors AgentGroupChat.invoke: select, invoke, check termination, up to max_iterations. """
+    history = [Message(None, "Analyze the Lambda zip, plan the migration and generate the Azure Function code.")]
+    start = time.perf_counter()
+    for _ in range(max_iterations):
+        name = select(history)
+        if name is None:
+            break
+        message = await agents.invoke(name, history)
+        history.append(message)
+        if terminate(message, history):
+            break
+    return history[1:], time.perf_counter() - start
+
+
+def legacy_select(history: List[Message]) -> Optional[str]:
+    if history[-1].name == ORCHESTRATOR:
+        name = history[-1].content.strip()
+        # An unknown name (e.g. the completion word) sent the turn back to the orchestrator
+        return name if name in WORKFLOW else ORCHESTRATOR
+    return ORCHESTRATOR
+
+
+def legacy_terminate(message: Message, history: List[Message]) -> bool:
+    # 'PERFECTUS' never occurs in lowercased text, so only max_iterations ended the chat
+    return message.name == ORCHESTRATOR and "PERFECTUS" in message.content.lower()
+
+
+def legacy_terminate_fixed(message: Message, history: List[Message]) -> bool:
+    return message.name == ORCHESTRATOR and "PERFECTUS" in message.content.upper()
+
+
+async def compare(scenario: str, blocked: Optional[str], turn_delay: float, max_iterations: int):
+    router = ChatRouter(WORKFLOW, ORCHESTRATOR)
+    runs = [
+        ("previous routing", legacy_select, legacy_terminate),
+        ("previous routing, termination fixed", legacy_select, legacy_terminate_fixed),
+        ("workflow routing", router.next_agent_name, lambda message, history: router.is_complete(history)),
+    ]
+    print(f"\nScenario: {scenario}")
+    results = {}
+    for label, select, terminate in runs:
+        agents = FakeAgents(turn_delay, blocked)
+        transcript, elapsed = await run_chat(select, terminate, agents, max_iterations)
+        speakers = [m.name for m in transcript]
+        results[label] = (agents.turns, elapsed, speakers)
+        print(f"  {label:<38} {agents.turns:>2} turns {elapsed:6.2f}s  {' > '.join(speakers)}")
+
+    turns, elapsed, speakers = results["workflow routing"]
+    baseline_turns, baseline_elapsed, _ = results["previous routing, termination fixed"]
+    assert speakers[-1] == WORKFLOW[-1], "workflow routing must finish with the last agent"
+    assert [name for name in speakers if name != ORCHESTRATOR][-len(WORKFLOW):] == WORKFLOW
+    assert turns <= 0.6 * baseline_turns, f"expected about half the turns, got {turns} vs {baseline_turns}"
+    assert elapsed <= 0.6 * baseline_elapsed, f"expected about half the latency, got {elapsed:.2f}s vs {baseline_elapsed:.2f}s"
+
+
+def check_routing_edge_cases():
+    """ Routing decisions the scenarios above do not reach. """
+    router = ChatRouter(WORKFLOW, ORCHESTRATOR)
+    blocked = [
+        Message(None, "Migrate the Lambda."),
+        Message("Analyst", REPLIES["Analyst"]),
+        Message("Planner", REPLIES["Planner"]),
+        Message("Azure_Developer", f"The plan names no storage account. {HANDOFF_ISSUE_MARKER}"),
+    ]
+    assert router.next_agent_name(blocked) == ORCHESTRATOR
+    # An orchestrator answering in prose must not get the turn again
+    prose = blocked + [Message(ORCHESTRATOR, "Use the storage account from the analysis and continue.")]
+    assert router.next_agent_name(prose) == "Azure_Developer"
+    assert not router.is_complete(prose)
+    finished = prose + [Message("Azure_Developer", f"Wrote the function. {COMPLETION_MARKER}")]
+    assert router.is_complete(finished) and router.next_agent_name(finished) is None
+    # Only the marker outside code blocks reports a problem
+    fenced = Message("Planner", f"```java\n// {HANDOFF_ISSUE_MARKER} is handled upstream\n```\nPlan complete.")
+    assert not is_handoff_problem(fenced)
+    assert not is_handoff_problem(Message("Planner", "If the bucket is missing the function cannot proceed; plan complete."))
+    print("\nRouting edge cases passed.")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turn-delay", type=float, default=0.05, help="Seconds per fake agent turn")
+    parser.add_argument("--max-iterations", type=int, default=10)
+    args = parser.parse_args()
+    await compare("every agent succeeds", None, args.turn_delay, args.max_iterations)
+    await compare("Planner reports a handoff problem once", "Planner", args.turn_delay, args.max_iterations)
+    check_routing_edge_cases()
+    print("\nWorkflow routing used at most 60% of the turns and latency of the previous routing.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""
+Runs UploadManager against a fake Azure AI Agents client and checks that each
+file content is uploaded once, reused by a later run through the manifest, and
+uploaded again when the remote file is gone or was never processed.
+
+The fake client counts uploads and can delay them, so the script also reports
+how long a second run takes when every file is reused. No Azure or Semantic
+Kernel packages are needed.
+
+Usage:
+    python benchmarks/upload_manager_check.py [--files 8] [--upload-delay 0.05]
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.util.UploadManager import UploadManager
+
+PURPOSE = "assistants"
+
+
+@dataclass
+class RemoteFile:
+    id: str
+    status: Optional[str]
+
+
+class FakeAgents:
+    def __init__(self, upload_delay: float):
+        self.upload_delay = upload_delay
+        self.files: Dict[str, RemoteFile] = {}
+        self.uploads = 0
+        self._ids = itertools.count(1)
+
+    async def upload_file_and_poll(self, file_path: str, purpose: str) -> RemoteFile:
+        assert purpose == PURPOSE
+        self.uploads += 1
+        await asyncio.sleep(self.upload_delay)
+        remote = RemoteFile(f"assistant-{next(self._ids)}", "processed")
+        self.files[remote.id] = remote
+        return remote
+
+    async def get_file(self, file_id: str) -> RemoteFile:
+        if file_id not in self.files:
+            raise LookupError(f"No file with id {file_id}")
+        return self.files[file_id]
+
+
+class FakeClient:
+    def __init__(self, upload_delay: float):
+        self.agents = FakeAgents(upload_delay)
+
+
+async def run(file_count: int, upload_delay: float):
+    client = FakeClient(upload_delay)
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for i in range(file_count):
+            path = os.path.join(folder, f"handler_{i}.py")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"def handler_{i}(event, context):\n    return {i}\n")
+            paths.append(path)
+        # Same content as the first file under another name
+        duplicate = os.path.join(folder, "copy_of_handler_0.py")
+        with open(paths[0], "r", encoding="utf-8") as source, open(duplicate, "w", encoding="utf-8") as f:
+            f.write(source.read())
+        manifest_path = os.path.join(folder, ".upload_manifest.json")
+
+        start = time.perf_counter()
+        first_ids = await UploadManager(client, manifest_path, PURPOSE).upload_all(paths + [duplicate])
+        first_elapsed = time.perf_counter() - start
+        assert client.agents.uploads == file_count, f"expected {file_count} uploads, got {client.agents.uploads}"
+        assert first_ids[-1] == first_ids[0], "equal contents must share one upload"
+
+        start = time.perf_counter()
+        manager = UploadManager(client, manifest_path, PURPOSE)
+        second_ids = await manager.upload_all(paths)
+        second_elapsed = time.perf_counter() - start
+        assert second_ids == first_ids[:-1] and manager.uploaded == 0 and manager.reused == file_count
+
+        # A deleted file and a file that never finished processing are both uploaded again
+        del client.agents.files[first_ids[0]]
+        client.agents.files[first_ids[1]].status = "error"
+        client.agents.files[first_ids[2]].status = None
+        manager = UploadManager(client, manifest_path, PURPOSE)
+        third_ids = await manager.upload_all(paths[:4])
+        assert manager.uploaded == 3 and third_ids[3] == first_ids[3]
+        assert all(client.agents.files[file_id].status == "processed" for file_id in third_ids)
+
+    print(f"First run:  {file_count} uploads in {first_elapsed:.2f}s")
+    print(f"Second run: 0 uploads, {file_count} reused in {second_elapsed:.2f}s")
+    print("Deleted or unprocessed files were uploaded again.")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=8, help="Number of distinct files to upload (at least 4)")
+    parser.add_argument("--upload-delay", type=float, default=0.05, help="Seconds per fake upload")
+    args = parser.parse_args()
+    asyncio.run(run(max(args.files, 4), args.upload_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,11 @@ import asyncio
 from dotenv import load_dotenv
 from src.util.ConfigLoader import ConfigLoader
 from src.util.AgentFactory import AgentFactory
+from src.util.UploadManager import UploadManager
+from src.util.LambdaAnalyzer import prepare_seed
 from semantic_kernel.agents import AzureAIAgent, AgentGroupChat
 from azure.identity.aio import DefaultAzureCredential
-from src.util.gc_strat import ChatSelectionStrategy, ApprovalTerminationStrategy,generate_query_orchestrator_config 
+from src.util.gc_strat import ChatSelectionStrategy, ApprovalTerminationStrategy,generate_query_orchestrator_config,apply_workflow_protocol
 from semantic_kernel.contents import ChatMessageContent
 from semantic_kernel.contents.utils.author_role import AuthorRole
 from azure.ai.projects.models import FilePurpose
@@ -18,8 +20,19 @@ async def main():
     folder_name = input("Enter the folder name for the configuration (default: 'input'): ") or 'input'
     config_path = os.path.join(cwd, folder_name, 'config.json')
     config_loader = ConfigLoader(config_path)
-    agent_configs = config_loader.get_agent_configs()
+    # Agents hand off to each other in the order they are listed in config.json
+    agent_configs = apply_workflow_protocol(config_loader.get_agent_configs())
     print("Configuration loaded successfully.")
+
+    task = config_loader.get_task()
+    files_path = os.path.join(cwd,folder_name, 'files')
+    file_paths = [os.path.join(root, file) for root, dirs, files in os.walk(files_path) for file in files]
+    archives = [file_path for file_path in file_paths if file_path.lower().endswith('.zip')]
+    if config_loader.can_pre_analyze() and archives:
+        # Lambda archives are analyzed locally; the agents get the digest and the files to change instead of the zip
+        task, digest = prepare_seed(task, archives, os.path.join(cwd, folder_name, 'lambda_digest.json'))
+        file_paths = [file_path for file_path in file_paths if file_path not in archives]
+        print(f"Pre-analyzed {len(digest['functions'])} Lambda functions from {len(archives)} archives.")
     
     print("Client Initialization...")
     async with (
@@ -29,44 +42,47 @@ async def main():
         ) as client,
     ):
         
-        uploaded_files = []
-        if config_loader.can_upload():
-            files_path = os.path.join(cwd,folder_name, 'files')
-            for root , dirs, files in os.walk(files_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    _file = await client.agents.upload_file_and_poll(file_path=file_path, purpose=FilePurpose.AGENTS)
-                    uploaded_files.append(_file)
-            print(f"Uploaded {len(uploaded_files)} files to the Azure AI Agent service.")
+        uploaded_file_ids = []
+        if config_loader.can_upload() and file_paths:
+            # Files uploaded by an earlier run with the same contents are reused
+            upload_manager = UploadManager(client, os.path.join(cwd, folder_name, '.upload_manifest.json'), FilePurpose.AGENTS)
+            uploaded_file_ids = await upload_manager.upload_all(file_paths)
+            print(f"Uploaded {upload_manager.uploaded} files to the Azure AI Agent service, reused {upload_manager.reused}.")
         
-        code_interpreter = CodeInterpreterTool(file_ids=[file.id for file in uploaded_files])
+        code_interpreter = CodeInterpreterTool(file_ids=uploaded_file_ids)
 
         print("Client initialized successfully.")
-        agent_factory = AgentFactory(client, code_interpreter)
+        # Unchanged agent definitions from earlier runs are reused; this run's files are attached per thread
+        agent_factory = AgentFactory(
+            client,
+            code_interpreter,
+            registry_path=os.path.join(cwd, folder_name, '.agent_registry.json'),
+            delete_agents=config_loader.can_delete_agents(),
+        )
         print("Building Agents...")
-        agents = await agent_factory.create_agents(agent_configs)
-        if len(agents) == 0:
+        query_orch_config = generate_query_orchestrator_config(
+            {config.name: config for config in agent_configs}, config_loader.get_base_model()
+        )
+        agents = await agent_factory.create_agents(agent_configs + [query_orch_config])
+        query_orch_agent = agents.pop(query_orch_config.name, None)
+        if len(agents) == 0 or query_orch_agent is None:
             print("No agents were created. Please check your configuration.")
             return
-        
-        query_orch_config   = generate_query_orchestrator_config(agents, config_loader.get_base_model())
-        query_orch_agent    = await agent_factory.create_agent(query_orch_config)
+        print(f"Agents ready: {agent_factory.created} created, {agent_factory.updated} updated, {agent_factory.reused} reused.")
+        workflow = [config.name for config in agent_configs if config.name in agents]
         
         try:
             chat = AgentGroupChat(
                 agents = list(agents.values())+ [query_orch_agent],
-                selection_strategy=ChatSelectionStrategy(
-                    agents=list(agents.values()),
-                    initial_agent=query_orch_agent,
-                ),
+                selection_strategy=ChatSelectionStrategy(workflow),
                 termination_strategy=ApprovalTerminationStrategy(
-                    agents=[query_orch_agent],
+                    workflow,
                     maximum_iterations=10
                 ),
             )
             print("Starting group chat...")
             await chat.add_chat_message(ChatMessageContent(
-                content=config_loader.get_task(),
+                content=task,
                 role=AuthorRole.USER
             ))
             try:
@@ -83,7 +99,8 @@ async def main():
         
         #Group Chat Goes Here
         await agent_factory.cleanup()
-        print("All agents cleaned up.")
+        if agent_factory.delete_agents:
+            print("All agents cleaned up.")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,5 +1,9 @@
-from semantic_kernel.agents import AzureAIAgent
-from typing import Dict, List
+import asyncio
+import hashlib
+import json
+import os
+from semantic_kernel.agents import AzureAIAgent, AzureAIAgentThread
+from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from datetime import timedelta
 from semantic_kernel import Kernel
@@ -14,54 +18,150 @@ class AgentConfig:
     code_interpreter: bool = False
     description: str = ""
 
-class AgentFactory: 
-    
-    def __init__(self, client, code_interpreter):
+class ThreadResourceAgent(AzureAIAgent):
+    """An AzureAIAgent whose chat threads are created with run-specific tool resources.
+
+    The agent definition only holds the tool definitions, so it can be reused across
+    runs; the files of the current run are attached to each thread the agent joins.
+    """
+    thread_tool_resources: Optional[Any] = None
+
+    async def create_channel(self, chat_history=None, thread_id=None):
+        if thread_id is None and self.thread_tool_resources is not None:
+            thread = AzureAIAgentThread(client=self.client, tool_resources=self.thread_tool_resources)
+            await thread.create()
+            thread_id = thread.id
+        return await super().create_channel(chat_history, thread_id)
+
+def definition_hash(config: AgentConfig, tools: List[Any]) -> str:
+    """Hash of the parts of an agent definition that do not change between runs.
+
+    Args:
+        config (AgentConfig): The agent configuration.
+        tools (List[Any]): The tool definitions of the agent.
+    Returns:
+        str: SHA-256 of the name, model, instructions, description and tools.
+    """
+    definition = {
+        "name": config.name,
+        "model": config.model,
+        "instructions": config.instructions,
+        "description": config.description,
+        "tools": [tool.as_dict() if hasattr(tool, "as_dict") else tool for tool in tools],
+    }
+    text = json.dumps(definition, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class AgentFactory:
+
+    def __init__(self, client, code_interpreter, registry_path: Optional[str] = None, delete_agents: bool = False):
+        """
+        Args:
+            client: The Azure AI project client.
+            code_interpreter: CodeInterpreterTool holding this run's files, attached per thread.
+            registry_path (Optional[str]): JSON file mapping agent names to reusable definitions.
+                Without it every agent is created anew.
+            delete_agents (bool): Whether cleanup deletes the agents instead of keeping them for the next run.
+        """
         self.client = client
         self.code_interpreter = code_interpreter
+        self.registry_path = registry_path
+        self.delete_agents = delete_agents
+        self.registry: Dict[str, Dict[str, str]] = self._load_registry()
         self.agents: Dict[str, AzureAIAgent] = {}
-    
+        self.created = 0
+        self.updated = 0
+        self.reused = 0
+
+    def _load_registry(self) -> Dict[str, Dict[str, str]]:
+        if not self.registry_path or not os.path.exists(self.registry_path):
+            return {}
+        try:
+            with open(self.registry_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Ignoring unreadable agent registry {self.registry_path}: {e}")
+            return {}
+
+    def _save_registry(self) -> None:
+        if not self.registry_path:
+            return
+        temp_path = self.registry_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.registry, file, indent=1)
+        os.replace(temp_path, self.registry_path)
+
+    async def _get_definition(self, config: AgentConfig, tools: List[Any]):
+        digest = definition_hash(config, tools)
+        entry = self.registry.get(config.name)
+        if entry:
+            try:
+                definition = await self.client.agents.get_agent(entry["agent_id"])
+            except Exception:
+                definition = None
+            if definition is not None and entry["hash"] == digest:
+                self.reused += 1
+                return definition
+            if definition is not None:
+                definition = await self.client.agents.update_agent(
+                    entry["agent_id"],
+                    name=config.name,
+                    model=config.model,
+                    instructions=config.instructions,
+                    description=config.description,
+                    tools=tools,
+                )
+                self.updated += 1
+                self.registry[config.name] = {"agent_id": definition.id, "hash": digest}
+                return definition
+        definition = await self.client.agents.create_agent(
+            name=config.name,
+            model=config.model,
+            instructions=config.instructions,
+            description=config.description,
+            tools=tools,
+        )
+        self.created += 1
+        self.registry[config.name] = {"agent_id": definition.id, "hash": digest}
+        return definition
+
     async def create_agent(self, config: AgentConfig) -> AzureAIAgent | None:
-        """Create a single agent from configuration"""
+        """Create a single agent from configuration, reusing an unchanged definition from the registry"""
         try:
-            agent_definition = await self.client.agents.create_agent(
-                name=config.name,
-                model=config.model,
-                instructions=config.instructions,
-                description=config.description,
-                tools=self.code_interpreter.definitions,
-                tool_resources=self.code_interpreter.resources
-            )
-            agent = AzureAIAgent(client=self.client, definition=agent_definition, kernel=self._file_writer_kernel(config))
+            agent_definition = await self._get_definition(config, self.code_interpreter.definitions)
+            agent = ThreadResourceAgent(client=self.client, definition=agent_definition, kernel=self._file_writer_kernel(config))
+            agent.thread_tool_resources = self.code_interpreter.resources
             agent.polling_options.run_polling_timeout = timedelta(minutes=30)
             self.agents[config.name] = agent
             return agent
         except Exception as e:
             print(f"Error creating agent {config.name}: {e}")
-            return None    
+            return None
     async def create_agents(self, configs: List[AgentConfig]) -> Dict[str, AzureAIAgent]:
-        """Create multiple agents from configurations"""
-        agents = {}
-        for config in configs:
-           temp = await self.create_agent(config)
-           if temp is not None:
-               agents[config.name] = temp
-        return agents
-    
+        """Create multiple agents from configurations concurrently, in configuration order"""
+        results = await asyncio.gather(*(self.create_agent(config) for config in configs))
+        self._save_registry()
+        return {config.name: agent for config, agent in zip(configs, results) if agent is not None}
+
     async def cleanup(self) -> None:
-        """Clean up all created agents"""
+        """Delete the created agents if deletion was requested, otherwise keep them for the next run"""
+        if not self.delete_agents:
+            self.agents.clear()
+            return
         for agent_name, agent in self.agents.items():
             try:
                 await self.client.agents.delete_agent(agent.id)
+                self.registry.pop(agent_name, None)
                 print(f"Deleted agent: {agent_name}")
             except Exception as e:
                 print(f"Error deleting agent {agent_name}: {e}")
         self.agents.clear()
-        
+        self._save_registry()
+
     def _file_writer_kernel(self, config: AgentConfig)->Kernel|None:
         if config.file_writer:
             file_writer_plugin = FileWriter()
             kernel =  Kernel()
             kernel.add_plugin(file_writer_plugin)
             return kernel
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,112 @@
+import re
+from typing import Any, List, Optional, Sequence
+
+COMPLETION_MARKER = "[MIGRATION_COMPLETE]"
+HANDOFF_ISSUE_MARKER = "[HANDOFF_ISSUE]"
+# Completion word used by earlier versions of the orchestrator instructions
+LEGACY_COMPLETION_MARKERS = ("PERFECTUS",)
+
+# Code blocks may quote the marker (e.g. in generated comments), so they are ignored
+CODE_FENCE = re.compile(r"```.*?(?:```|$)", re.DOTALL)
+
+
+def _content(message: Any) -> str:
+    return str(getattr(message, "content", "") or "")
+
+
+def is_completion(message: Any) -> bool:
+    """Whether a message carries the completion marker (or a legacy completion word), in any case."""
+    content = _content(message).upper()
+    return any(marker in content for marker in (COMPLETION_MARKER,) + LEGACY_COMPLETION_MARKERS)
+
+
+def is_handoff_problem(message: Any) -> bool:
+    """Whether an agent reported that it could not complete its part, with the marker outside code blocks."""
+    content = CODE_FENCE.sub("", _content(message))
+    return HANDOFF_ISSUE_MARKER.lower() in content.lower()
+
+
+class ChatRouter:
+    """Decides the next speaker of a group chat from a fixed workflow order.
+
+    Agents speak in workflow order. The orchestrator is only asked to pick the next
+    agent when the last agent reports a handoff problem; if it names no known agent,
+    the agent that reported the problem tries again. The chat is complete once the
+    last agent of the workflow finishes without a problem or any agent emits the
+    completion marker. Messages only need `name` and `content`, so the router runs
+    the same against Semantic Kernel history and local fakes.
+    """
+
+    def __init__(self, workflow: Sequence[str], orchestrator_name: str):
+        if not workflow:
+            raise ValueError("Workflow must contain at least one agent")
+        self.workflow: List[str] = list(workflow)
+        self.orchestrator_name = orchestrator_name
+
+    def _last_agent_message(self, history: Sequence[Any]) -> Optional[Any]:
+        for message in reversed(history):
+            if getattr(message, "name", None) in self.workflow or getattr(message, "name", None) == self.orchestrator_name:
+                return message
+        return None
+
+    def _orchestrator_choice(self, message: Any) -> Optional[str]:
+        choice = _content(message).strip().strip("`'\".").strip()
+        return choice if choice in self.workflow else None
+
+    def next_agent_name(self, history: Sequence[Any]) -> Optional[str]:
+        """Name of the agent that should speak next.
+
+        Args:
+            history (Sequence[Any]): The chat history, oldest message first.
+        Returns:
+            Optional[str]: The next agent name, or None when the workflow is complete.
+        """
+        if history and is_completion(history[-1]):
+            return None
+        last = self._last_agent_message(history)
+        if last is None:
+            return self.workflow[0]
+        if last.name == self.orchestrator_name:
+            choice = self._orchestrator_choice(last)
+            if choice is not None:
+                return choice
+            print(f"Orchestrator named no known agent, continuing the workflow: {_content(last)[:80]}")
+            speaker = self._last_workflow_speaker(history)
+            if speaker is None:
+                return self.workflow[0]
+            # Asking the orchestrator again would repeat the same answer
+            return speaker if self._reported_problem(history, speaker) else self._after(speaker)
+        if is_handoff_problem(last):
+            return self.orchestrator_name
+        return self._after(last.name)
+
+    def _last_workflow_speaker(self, history: Sequence[Any]) -> Optional[str]:
+        for message in reversed(history):
+            if getattr(message, "name", None) in self.workflow:
+                return message.name
+        return None
+
+    def _reported_problem(self, history: Sequence[Any], agent_name: str) -> bool:
+        message = next(message for message in reversed(history) if getattr(message, "name", None) == agent_name)
+        return is_handoff_problem(message)
+
+    def _after(self, agent_name: str) -> Optional[str]:
+        index = self.workflow.index(agent_name) + 1
+        return self.workflow[index] if index < len(self.workflow) else None
+
+    def is_complete(self, history: Sequence[Any]) -> bool:
+        """Whether the chat should end after the last message.
+
+        Args:
+            history (Sequence[Any]): The chat history, oldest message first.
+        Returns:
+            bool: True if the last message carries the completion marker, or it was sent
+                by an agent and no agent is left to speak.
+        """
+        if not history:
+            return False
+        last = history[-1]
+        if is_completion(last):
+            return True
+        name = getattr(last, "name", None)
+        return (name in self.workflow or name == self.orchestrator_name) and self.next_agent_name(history) is None
@@ -170,6 +170,30 @@ class ConfigLoader:
             return False
         
         return uploads
+
+    def can_pre_analyze(self) -> bool:
+        """Get the pre_analysis setting from the configuration with validation."""
+        if self.config is None:
+            return False
+        
+        pre_analysis = self.config.get('pre_analysis', False)
+        if not isinstance(pre_analysis, bool):
+            logging.warning("Invalid pre_analysis setting in configuration, defaulting to False")
+            return False
+        
+        return pre_analysis
+
+    def can_delete_agents(self) -> bool:
+        """Get the delete_agents setting from the configuration with validation."""
+        if self.config is None:
+            return False
+        
+        delete_agents = self.config.get('delete_agents', False)
+        if not isinstance(delete_agents, bool):
+            logging.warning("Invalid delete_agents setting in configuration, defaulting to False")
+            return False
+        
+        return delete_agents
     
     def _read_instruction_file(self, file_name: str) -> str:
         """Read instruction file with enhanced error handling and validation."""
@@ -0,0 +1,394 @@
+import io
+import json
+import os
+import posixpath
+import re
+import xml.etree.ElementTree as ET
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+MANIFEST_FILES = ("pom.xml", "build.gradle", "build.gradle.kts", "package.json", "requirements.txt")
+TEMPLATE_FILES = ("template.yml", "template.yaml", "serverless.yml", "serverless.yaml")
+SOURCE_LANGUAGES = {
+    ".java": "java", ".kt": "java",
+    ".py": "python",
+    ".js": "nodejs", ".mjs": "nodejs", ".cjs": "nodejs", ".ts": "nodejs",
+    ".cs": "dotnet",
+    ".go": "go",
+}
+TEST_PATH = re.compile(r"(^|/)(src/test|tests?|__tests__)/|(^|/)test_[^/]*\.py$|\.(test|spec)\.[jt]s$")
+MAX_SOURCE_BYTES = 1024 * 1024
+MAX_SEED_FILE_CHARS = 20000
+
+# Template (SAM / CloudFormation / Serverless) properties
+TEMPLATE_RUNTIME = re.compile(r"^\s*[Rr]untime:\s*['\"]?([\w.]+)", re.MULTILINE)
+TEMPLATE_HANDLER = re.compile(r"^\s*[Hh]andler:\s*['\"]?([\w.:/$-]+)", re.MULTILINE)
+TEMPLATE_RESOURCE_TYPE = re.compile(r"^\s*Type:\s*['\"]?(AWS::[\w:]+)", re.MULTILINE)
+TEMPLATE_EVENT_TYPE = re.compile(
+    r"^\s*Type:\s*['\"]?(S3|SQS|SNS|Api|HttpApi|Schedule|ScheduleV2|DynamoDB|Kinesis|EventBridgeRule|"
+    r"CloudWatchEvent|CloudWatchLogs|Cognito|IoTRule|MSK|MQ|SelfManagedKafka|DocumentDB)\b",
+    re.MULTILINE,
+)
+TEMPLATE_S3_EVENT = re.compile(r"Events:\s*['\"]?(s3:[\w:*]+)")
+
+# Dependency manifests
+GRADLE_DEPENDENCY = re.compile(r"['\"](software\.amazon[\w.]*|com\.amazonaws):([\w.-]+)(?::([\w.-]+))?['\"]")
+REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9_.-]+)\s*(?:\[[^\]]*\])?\s*([<>=!~].*)?$")
+AWS_JAVA_GROUPS = ("software.amazon", "com.amazonaws")
+AWS_NODE_PACKAGES = ("aws-sdk", "@aws-sdk/", "@aws-lambda-powertools/", "aws-lambda", "@types/aws-lambda", "aws-xray-sdk")
+AWS_PYTHON_PACKAGES = ("boto3", "botocore", "aioboto3", "awswrangler", "aws-lambda-powertools", "aws-xray-sdk", "moto")
+
+# Source code
+JAVA_PACKAGE = re.compile(r"^\s*package\s+([\w.]+)\s*;", re.MULTILINE)
+JAVA_HANDLER_CLASS = re.compile(r"class\s+(\w+)\s+implements\s+[^{]*\b(RequestHandler|RequestStreamHandler)\b")
+JAVA_AWS_SERVICE_IMPORT = re.compile(
+    r"^\s*import\s+(?:software\.amazon\.awssdk\.services|com\.amazonaws\.services)\.(?!lambda\.runtime\.)(\w+)\.", re.MULTILINE
+)
+JAVA_EVENT_IMPORT = re.compile(r"^\s*import\s+com\.amazonaws\.services\.lambda\.runtime\.events\.(\w+)\s*;", re.MULTILINE)
+JAVA_CLIENT_VARIABLE = re.compile(r"\b(\w+?)(?:Async)?Client\s+(\w+)\s*[=;,)]")
+PYTHON_HANDLER = re.compile(r"^def\s+(\w*handler\w*)\s*\(\s*event\s*,\s*context", re.MULTILINE)
+PYTHON_CLIENT_VARIABLE = re.compile(r"\b(\w+)\s*=\s*(?:boto3|session|aioboto3\.Session\(\))\.(?:client|resource)\(\s*['\"]([\w-]+)['\"]")
+PYTHON_EVENT_TYPE = re.compile(r"\bfrom\s+aws_lambda_powertools\.utilities\.data_classes\s+import\s+([\w, ]+)")
+NODE_HANDLER = re.compile(r"(?:exports\.(\w*handler\w*)\s*=|export\s+(?:const|let|async\s+function|function)\s+(\w*handler\w*)\b)")
+NODE_V3_SERVICE_IMPORT = re.compile(r"['\"]@aws-sdk/client-([\w-]+)['\"]")
+NODE_V3_COMMAND = re.compile(r"\bnew\s+(\w+)Command\s*\(")
+NODE_V2_IMPORT = re.compile(r"(?:require\(\s*|from\s+)['\"]aws-sdk['\"]")
+NODE_V2_CLIENT_VARIABLE = re.compile(r"\b(\w+)\s*=\s*new\s+(?:AWS\.)?(\w+)\s*\(")
+NODE_EVENT_TYPE = re.compile(r"\b(\w+(?:Event|Result))\b[^;]*from\s+['\"]aws-lambda['\"]")
+ENVIRONMENT_VARIABLE = re.compile(
+    r"System\.getenv\(\s*\"(\w+)\"|os\.environ(?:\.get)?\s*[\[(]\s*['\"](\w+)['\"]|os\.getenv\(\s*['\"](\w+)['\"]|process\.env\.(\w+)"
+)
+MEMBER_CALL = r"\b{}\s*\.\s*(\w+)\s*\("
+
+
+def _read_text(archive: zipfile.ZipFile, name: str) -> Optional[str]:
+    info = archive.getinfo(name)
+    if info.file_size > MAX_SOURCE_BYTES:
+        return None
+    try:
+        return archive.read(name).decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def _line_number(text: str, position: int) -> int:
+    return text.count("\n", 0, position) + 1
+
+
+def find_function_roots(names: List[str]) -> List[str]:
+    """Find the folders of an archive that hold one Lambda function each.
+
+    A function root is the shallowest folder containing a dependency manifest or a
+    deployment template; an archive with neither is a single function at its root.
+
+    Args:
+        names (List[str]): The member names of the archive.
+    Returns:
+        List[str]: The function root folders ('' for the archive root).
+    """
+    candidates = sorted({
+        posixpath.dirname(name) for name in names
+        if posixpath.basename(name) in MANIFEST_FILES + TEMPLATE_FILES and not TEST_PATH.search(name)
+    }, key=lambda folder: (folder.count("/"), folder))
+    roots = []
+    for folder in candidates:
+        if not any(folder == root or folder.startswith(root + "/") or root == "" for root in roots):
+            roots.append(folder)
+    return roots or [""]
+
+
+def parse_dependencies(file_name: str, text: str) -> List[str]:
+    """Extract the AWS SDK and Lambda runtime dependencies of a manifest.
+
+    Args:
+        file_name (str): The manifest file name (pom.xml, build.gradle, package.json or requirements.txt).
+        text (str): The manifest contents.
+    Returns:
+        List[str]: Dependencies as 'group:artifact[:version]' (Java) or 'name[@version]'.
+    """
+    dependencies = []
+    if file_name == "pom.xml":
+        try:
+            root = ET.fromstring(text)
+        except ET.ParseError:
+            return dependencies
+        namespace = root.tag[:root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+        for dependency in root.iter(f"{namespace}dependency"):
+            group = dependency.findtext(f"{namespace}groupId", "")
+            artifact = dependency.findtext(f"{namespace}artifactId", "")
+            version = dependency.findtext(f"{namespace}version")
+            scope = dependency.findtext(f"{namespace}scope")
+            if group.startswith(AWS_JAVA_GROUPS) and scope != "test":
+                dependencies.append(":".join(part for part in (group, artifact, version) if part))
+    elif file_name.startswith("build.gradle"):
+        for match in GRADLE_DEPENDENCY.finditer(text):
+            dependencies.append(":".join(part for part in match.groups() if part))
+    elif file_name == "package.json":
+        try:
+            package = json.loads(text)
+        except json.JSONDecodeError:
+            return dependencies
+        for section in ("dependencies", "devDependencies"):
+            for name, version in (package.get(section) or {}).items():
+                if name.startswith(AWS_NODE_PACKAGES):
+                    dependencies.append(f"{name}@{version}")
+    elif file_name == "requirements.txt":
+        for line in text.splitlines():
+            match = REQUIREMENT_NAME.match(line.split("#")[0])
+            if match and match.group(1).lower().startswith(AWS_PYTHON_PACKAGES):
+                dependencies.append(match.group(1) + (match.group(2) or "").strip())
+    return sorted(set(dependencies))
+
+
+def _infer_runtime(manifests: Dict[str, str], languages: List[str]) -> Optional[str]:
+    pom = manifests.get("pom.xml")
+    if pom:
+        match = re.search(r"<(?:maven\.compiler\.(?:release|source)|release)>(\d+)<", pom)
+        return f"java{match.group(1)}" if match else "java"
+    if "package.json" in manifests:
+        try:
+            engine = (json.loads(manifests["package.json"]).get("engines") or {}).get("node", "")
+        except json.JSONDecodeError:
+            engine = ""
+        major = re.search(r"\d+", engine)
+        return f"nodejs{major.group(0)}.x" if major else "nodejs"
+    if any(name.startswith("build.gradle") for name in manifests):
+        return "java"
+    if "requirements.txt" in manifests:
+        return "python"
+    return languages[0] if languages else None
+
+
+def _scan_source(path: str, text: str, language: str) -> Dict[str, Any]:
+    """Index the AWS service usage, call sites, event types and handlers of one source file."""
+    services = set()
+    clients = {}
+    event_types = set()
+    handlers = []
+    calls = []
+    if language == "java":
+        services.update(service.lower() for service in JAVA_AWS_SERVICE_IMPORT.findall(text))
+        event_types.update(JAVA_EVENT_IMPORT.findall(text))
+        clients = {variable: service.lower() for service, variable in JAVA_CLIENT_VARIABLE.findall(text) if service}
+        handler = JAVA_HANDLER_CLASS.search(text)
+        if handler:
+            package = JAVA_PACKAGE.search(text)
+            class_name = f"{package.group(1)}.{handler.group(1)}" if package else handler.group(1)
+            handlers.append(f"{class_name}::handleRequest")
+    elif language == "python":
+        clients = {variable: service for variable, service in PYTHON_CLIENT_VARIABLE.findall(text)}
+        services.update(clients.values())
+        for names in PYTHON_EVENT_TYPE.findall(text):
+            event_types.update(name.strip() for name in names.split(",") if name.strip())
+        module = posixpath.splitext(path)[0].replace("/", ".")
+        handlers.extend(f"{module}.{name}" for name in PYTHON_HANDLER.findall(text))
+    elif language == "nodejs":
+        services.update(NODE_V3_SERVICE_IMPORT.findall(text))
+        event_types.update(NODE_EVENT_TYPE.findall(text))
+        for match in NODE_V3_COMMAND.finditer(text):
+            calls.append({"line": _line_number(text, match.start()), "call": match.group(1)})
+        if NODE_V2_IMPORT.search(text):
+            clients = {variable: service.lower() for variable, service in NODE_V2_CLIENT_VARIABLE.findall(text)
+                       if service[:1].isupper()}
+            services.update(clients.values())
+        module = posixpath.splitext(path)[0]
+        handlers.extend(f"{module}.{a or b}" for a, b in NODE_HANDLER.findall(text))
+    for variable, service in clients.items():
+        for match in re.finditer(MEMBER_CALL.format(re.escape(variable)), text):
+            calls.append({"line": _line_number(text, match.start()), "call": f"{service}.{match.group(1)}"})
+    environment = sorted({next(group for group in match if group) for match in ENVIRONMENT_VARIABLE.findall(text)})
+    return {
+        "services": sorted(services),
+        "event_types": sorted(event_types),
+        "handlers": handlers,
+        "calls": sorted(calls, key=lambda call: call["line"]),
+        "environment": environment,
+    }
+
+
+def _open_unit(zip_path: str, nested: Optional[str]) -> zipfile.ZipFile:
+    archive = zipfile.ZipFile(zip_path)
+    if nested is None:
+        return archive
+    with archive:
+        return zipfile.ZipFile(io.BytesIO(archive.read(nested)))
+
+
+def analyze_function(zip_path: str, nested: Optional[str], root: str) -> Dict[str, Any]:
+    """Analyze one Lambda function of an archive without extracting it to disk.
+
+    Args:
+        zip_path (str): Path of the archive.
+        nested (Optional[str]): Member name of a nested deployment package, if the function lives in one.
+        root (str): The function root folder inside the (nested) archive.
+    Returns:
+        Dict[str, Any]: The function digest.
+    """
+    prefix = root + "/" if root else ""
+    with _open_unit(zip_path, nested) as archive:
+        names = [name for name in archive.namelist() if name.startswith(prefix) and not name.endswith("/")]
+        manifests = {}
+        template = None
+        dependencies = set()
+        sources = []
+        source_bytes = 0
+        for name in names:
+            relative = name[len(prefix):]
+            base = posixpath.basename(relative)
+            if relative in MANIFEST_FILES:
+                text = _read_text(archive, name)
+                if text is not None:
+                    manifests[base] = text
+                    dependencies.update(parse_dependencies(base, text))
+            elif relative in TEMPLATE_FILES and template is None:
+                template = _read_text(archive, name)
+            language = SOURCE_LANGUAGES.get(posixpath.splitext(base)[1])
+            if language and not TEST_PATH.search(relative):
+                text = _read_text(archive, name)
+                if text is not None:
+                    source_bytes += len(text)
+                    sources.append((relative, language, _scan_source(relative, text, language)))
+
+    languages = sorted({language for _, language, _ in sources})
+    digest = {
+        "archive": os.path.basename(zip_path) + (f"!{nested}" if nested else ""),
+        "root": root,
+        "runtime": None,
+        "handler": None,
+        "aws_dependencies": sorted(dependencies),
+        "services": sorted({service for _, _, scan in sources for service in scan["services"]}),
+        "event_types": sorted({event for _, _, scan in sources for event in scan["event_types"]}),
+        "event_sources": [],
+        "resources": [],
+        "environment": sorted({variable for _, _, scan in sources for variable in scan["environment"]}),
+        "files": [],
+        "source_bytes": source_bytes,
+    }
+    if template:
+        runtime = TEMPLATE_RUNTIME.search(template)
+        handler = TEMPLATE_HANDLER.search(template)
+        digest["runtime"] = runtime.group(1) if runtime else None
+        digest["handler"] = handler.group(1) if handler else None
+        digest["resources"] = sorted(set(TEMPLATE_RESOURCE_TYPE.findall(template)))
+        digest["event_sources"] = sorted(set(TEMPLATE_EVENT_TYPE.findall(template)) | set(TEMPLATE_S3_EVENT.findall(template)))
+    digest["runtime"] = digest["runtime"] or _infer_runtime(manifests, languages)
+    detected_handlers = [handler for _, _, scan in sources for handler in scan["handlers"]]
+    digest["handler"] = digest["handler"] or (detected_handlers[0] if detected_handlers else None)
+
+    # Files that must be rewritten for Azure: sources using AWS APIs or Lambda types, and AWS dependency manifests
+    for relative, language, scan in sources:
+        if scan["services"] or scan["event_types"] or scan["handlers"] or scan["calls"]:
+            digest["files"].append({
+                "path": relative,
+                "language": language,
+                "services": scan["services"],
+                "event_types": scan["event_types"],
+                "calls": scan["calls"],
+            })
+    for base, text in manifests.items():
+        if parse_dependencies(base, text):
+            digest["files"].append({"path": base, "language": "manifest"})
+    return digest
+
+
+def _function_units(zip_path: str) -> List[Tuple[str, Optional[str], str]]:
+    units = []
+    with zipfile.ZipFile(zip_path) as archive:
+        names = archive.namelist()
+        nested = [name for name in names if name.lower().endswith(".zip")]
+        for name in nested:
+            with zipfile.ZipFile(io.BytesIO(archive.read(name))) as inner:
+                units.extend((zip_path, name, root) for root in find_function_roots(inner.namelist()))
+        outer = [name for name in names if not name.lower().endswith(".zip")]
+        if outer and (not nested or any(SOURCE_LANGUAGES.get(posixpath.splitext(name)[1]) for name in outer)):
+            units.extend((zip_path, None, root) for root in find_function_roots(outer))
+    return units
+
+
+def analyze_archives(zip_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """Analyze the Lambda functions of one or more archives.
+
+    Each function (a project folder or nested deployment package) is analyzed
+    independently, across a process pool when there is more than one.
+
+    Args:
+        zip_paths (List[str]): Paths of the archives.
+        max_workers (Optional[int]): Size of the process pool. Defaults to the CPU count.
+    Returns:
+        Dict[str, Any]: The digest, with one entry per function.
+    """
+    units = [unit for zip_path in zip_paths for unit in _function_units(zip_path)]
+    if len(units) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(units), max_workers or os.cpu_count() or 1)) as executor:
+            functions = list(executor.map(analyze_function, *zip(*units)))
+    else:
+        functions = [analyze_function(*unit) for unit in units]
+    return {"functions": functions}
+
+
+def _member_name(function: Dict[str, Any], path: str) -> str:
+    return f"{function['root']}/{path}" if function["root"] else path
+
+
+def read_changed_files(zip_path: str, function: Dict[str, Any]) -> Dict[str, str]:
+    """Read the contents of the files of a function that need changing.
+
+    Args:
+        zip_path (str): Path of the archive the function was found in.
+        function (Dict[str, Any]): The function digest.
+    Returns:
+        Dict[str, str]: Contents keyed by the path inside the archive.
+    """
+    nested = function["archive"].split("!", 1)[1] if "!" in function["archive"] else None
+    with _open_unit(zip_path, nested) as archive:
+        return {
+            _member_name(function, file["path"]): _read_text(archive, _member_name(function, file["path"])) or ""
+            for file in function["files"]
+        }
+
+
+def build_seed_message(task: str, digest: Dict[str, Any], changed_files: Dict[str, str]) -> str:
+    """Combine the task, the digest and the files that need changing into the first chat message.
+
+    Args:
+        task (str): The configured initial message.
+        digest (Dict[str, Any]): The digest from analyze_archives.
+        changed_files (Dict[str, str]): File contents keyed by path.
+    Returns:
+        str: The message text.
+    """
+    parts = [
+        task,
+        "The archive has already been analyzed locally. Use this digest (runtime, handler, AWS dependencies, "
+        "services, API call sites, event types) instead of unpacking it; only the files listed below need to change.",
+        "```json\n" + json.dumps(digest, separators=(",", ":")) + "\n```",
+    ]
+    for path, text in changed_files.items():
+        if len(text) > MAX_SEED_FILE_CHARS:
+            text = text[:MAX_SEED_FILE_CHARS] + "\n... (truncated)"
+        parts.append(f"File: {path}\n```\n{text}\n```")
+    return "\n\n".join(parts)
+
+
+def prepare_seed(task: str, zip_paths: List[str], digest_path: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """Analyze the archives and build the seed message for the agents.
+
+    Args:
+        task (str): The configured initial message.
+        zip_paths (List[str]): Paths of the Lambda archives.
+        digest_path (Optional[str]): Where to also write the digest as JSON.
+    Returns:
+        Tuple[str, Dict[str, Any]]: The seed message and the digest.
+    """
+    digest = analyze_archives(zip_paths)
+    archives = {os.path.basename(path): path for path in zip_paths}
+    changed_files = {}
+    for function in digest["functions"]:
+        zip_path = archives[function["archive"].split("!", 1)[0]]
+        for path, text in read_changed_files(zip_path, function).items():
+            changed_files[f"{function['archive']}/{path}"] = text
+    if digest_path:
+        with open(digest_path, 'w', encoding='utf-8') as file:
+            json.dump(digest, file, indent=1)
+    return build_seed_message(task, digest, changed_files), digest
@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List
+
+MAX_CONCURRENT_UPLOADS = 4
+# Only fully processed files can be attached to an agent; a missing status is not proof of that
+VALID_STATUSES = ("processed",)
+
+
+def content_hash(file_path: str) -> str:
+    """SHA-256 of a file's contents."""
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class UploadManager:
+    """Uploads input files once per content hash and reuses their remote ids on later runs.
+
+    A local JSON manifest maps each content hash to the id returned by the Azure AI
+    Agent service. Before an id is reused the service is asked whether the file still
+    exists and is processed; only other files are uploaded, concurrently up to
+    max_concurrency. The
+    client only needs `agents.upload_file_and_poll` and `agents.get_file`, so a local
+    fake can be used for testing.
+    """
+
+    def __init__(self, client, manifest_path: str, purpose: Any,
+                 max_concurrency: int = MAX_CONCURRENT_UPLOADS, validate: bool = True):
+        self.client = client
+        self.manifest_path = manifest_path
+        self.purpose = purpose
+        self.validate = validate
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.manifest: Dict[str, Dict[str, Any]] = self._load_manifest()
+        self.uploaded = 0
+        self.reused = 0
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Ignoring unreadable upload manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.manifest, file, indent=1)
+        os.replace(temp_path, self.manifest_path)
+
+    async def _is_valid(self, file_id: str) -> bool:
+        try:
+            remote = await self.client.agents.get_file(file_id)
+        except Exception:
+            return False
+        return getattr(remote, "status", None) in VALID_STATUSES
+
+    async def upload(self, file_path: str) -> str:
+        """Upload a file unless a valid upload with the same contents exists.
+
+        Args:
+            file_path (str): Path of the local file.
+        Returns:
+            str: The remote file id.
+        """
+        digest = content_hash(file_path)
+        lock = self._locks.setdefault(digest, asyncio.Lock())
+        async with lock, self._semaphore:
+            entry = self.manifest.get(digest)
+            if entry and (not self.validate or await self._is_valid(entry["file_id"])):
+                self.reused += 1
+                return entry["file_id"]
+            remote = await self.client.agents.upload_file_and_poll(file_path=file_path, purpose=self.purpose)
+            self.manifest[digest] = {
+                "file_id": remote.id,
+                "filename": os.path.basename(file_path),
+                "size": os.path.getsize(file_path),
+                "uploaded_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.uploaded += 1
+            self._save_manifest()
+            return remote.id
+
+    async def upload_all(self, file_paths: List[str]) -> List[str]:
+        """Upload files concurrently.
+
+        Args:
+            file_paths (List[str]): Paths of the local files.
+        Returns:
+            List[str]: The remote file ids, in the same order as file_paths.
+        """
+        return list(await asyncio.gather(*(self.upload(file_path) for file_path in file_paths)))
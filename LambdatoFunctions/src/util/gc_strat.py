@@ -1,21 +1,22 @@
-from typing import Dict
-from semantic_kernel.agents import AzureAIAgent
+from typing import Any, Dict, List
+from pydantic import PrivateAttr
 from semantic_kernel.agents.strategies import SequentialSelectionStrategy, TerminationStrategy
 from src.util.AgentFactory import AgentConfig
+from src.util.ChatRouting import ChatRouter, COMPLETION_MARKER, HANDOFF_ISSUE_MARKER
 
 QUERY_ORCHESTRATOR_NAME="QUERY_ORCHESTRATOR"
 QUERY_ORCHESTRATOR_DESCRIPTION="This Agent is responsible for orchestrating queries to other agents. It can handle complex queries by breaking them down into simpler tasks and delegating them to specialized agents. It ensures that the overall query is answered efficiently and accurately."
 
-def __generate_query_orchestrator_instructions(agents: Dict[str, AzureAIAgent]) -> str:
+def __generate_query_orchestrator_instructions(agents: Dict[str, Any]) -> str:
     agent_list = []
     for agent_name, agent in agents.items():
-        description = getattr(agent.description, 'description', 'No description available')
+        description = getattr(agent, 'description', None) or 'No description available'
         agent_list.append(f"- {agent_name} : {description}")
     
     agents_text = "\n    ".join(agent_list)
     
     return f"""
-    You are a query orchestrator agent. Your role is to analyze the conversation history and determine which specialized agent should handle the next part of the task based on the current context and progress.
+    You are a query orchestrator agent. The specialized agents normally hand off to each other in a fixed order; you are only asked when an agent has reported that it could not complete its part. Your role is to analyze the conversation history and determine which specialized agent should handle the next part of the task based on the current context and progress.
 
     INSTRUCTIONS:
     1. Examine the ENTIRE conversation history, including the most recent responses from agents
@@ -30,7 +31,7 @@ def __generate_query_orchestrator_instructions(agents: Dict[str, AzureAIAgent])
     - Don't select the same agent consecutively unless they explicitly indicate more work is needed
     - Match the next required action to the agent whose description best fits that need
     - Consider dependencies between agents (some agents may build upon others' work)
-    - If you see that all requirements have been satisfied, respond with "PERFECTUS" to end the conversation
+    - If you see that all requirements have been satisfied, respond with "{COMPLETION_MARKER}" to end the conversation
     - If an agent indicates they cannot complete a task or need input from another agent, select the appropriate next agent
 
     WORKFLOW ANALYSIS:
@@ -45,7 +46,7 @@ def __generate_query_orchestrator_instructions(agents: Dict[str, AzureAIAgent])
     Remember: Your decision should be based on the CURRENT state of the conversation and what the last agent just did. Don't repeat the same agent unless there's a clear reason.
     """
     
-def generate_query_orchestrator_config(agents: Dict[str, AzureAIAgent], model: str) -> AgentConfig:
+def generate_query_orchestrator_config(agents: Dict[str, Any], model: str) -> AgentConfig:
     instructions = __generate_query_orchestrator_instructions(agents)
     
     return AgentConfig(
@@ -55,19 +56,49 @@ def generate_query_orchestrator_config(agents: Dict[str, AzureAIAgent], model: s
         model=model,
     )
 
+def apply_workflow_protocol(configs: List[AgentConfig]) -> List[AgentConfig]:
+    """Append the handoff and completion markers to the instructions of the workflow agents.
+
+    Args:
+        configs (List[AgentConfig]): Agent configurations, in workflow order.
+    Returns:
+        List[AgentConfig]: The same configurations, with updated instructions.
+    """
+    for i, config in enumerate(configs):
+        protocol = (
+            f"\n\nIf you cannot complete your part with the information provided, "
+            f"explain what is missing and end your response with {HANDOFF_ISSUE_MARKER}."
+        )
+        if i == len(configs) - 1:
+            protocol += f" When the whole task is complete, end your response with {COMPLETION_MARKER}."
+        if protocol not in config.instructions:
+            config.instructions += protocol
+    return configs
+
 class ChatSelectionStrategy(SequentialSelectionStrategy):
-    """A strategy for determining which agent should take the next turn in the group chat."""
+    """Selects agents in workflow order, asking the orchestrator only after a reported handoff problem."""
+    _router: ChatRouter = PrivateAttr()
+
+    def __init__(self, workflow: List[str], **kwargs):
+        super().__init__(**kwargs)
+        self._router = ChatRouter(workflow, QUERY_ORCHESTRATOR_NAME)
+
     async def select_agent(self, agents, history):
-        agent_name = QUERY_ORCHESTRATOR_NAME
-        if(history[-1].name==QUERY_ORCHESTRATOR_NAME):
-            agent_name=history[-1].content.strip()
+        agent_name = self._router.next_agent_name(history) or QUERY_ORCHESTRATOR_NAME
+        if agent_name == QUERY_ORCHESTRATOR_NAME:
+            print("Handoff problem reported, asking the orchestrator for the next agent")
+        elif history and history[-1].name == QUERY_ORCHESTRATOR_NAME:
             print(f"Agent selected by orchestrator: {agent_name}")
-            return next((agent for agent in agents if agent.name == agent_name), None)
-        return next((agent for agent in agents if agent.name == agent_name), None) 
+        return next((agent for agent in agents if agent.name == agent_name), None)
 
 class ApprovalTerminationStrategy(TerminationStrategy):
-    """A strategy for determining when the group chat should end."""
-    
+    """Ends the group chat on the completion marker or when the last workflow agent has finished."""
+    _router: ChatRouter = PrivateAttr()
+
+    def __init__(self, workflow: List[str], **kwargs):
+        super().__init__(**kwargs)
+        self._router = ChatRouter(workflow, QUERY_ORCHESTRATOR_NAME)
+
     async def should_agent_terminate(self, agent, history):
         """Check if the agent should terminate based on the history."""
-        return 'PERFECTUS' in history[-1].content.lower() if history else False
+        return self._router.is_complete(history)